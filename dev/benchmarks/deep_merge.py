@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark overlay merging against the starter bundle catalog.
+
+Replays the merges `load_catalog_store`, `ToolOverridesStore` and
+`ProxyTemplate.snapshot` perform (embedded defaults + starter bundle overrides
+and aggregations, followed by a defensive copy of the result) with the current
+copy-free engine and with the previous JSON round-trip implementation, which is
+reproduced below for reference. Reports median wall time and peak traced
+allocation for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stelae_lib.catalog_defaults import DEFAULT_CATALOG_FRAGMENT  # noqa: E402
+from stelae_lib.config_overlays import deep_merge  # noqa: E402
+from stelae_lib.integrator.tool_aggregations import merge_aggregation_payload  # noqa: E402
+
+STARTER_CATALOG = ROOT / "bundles" / "starter" / "catalog.json"
+
+
+def _legacy_deep_merge(dest: Any, src: Any) -> Any:
+    if isinstance(dest, dict) and isinstance(src, Mapping):
+        result = {key: json.loads(json.dumps(value, ensure_ascii=False)) for key, value in dest.items()}
+        for key, value in src.items():
+            if key in result:
+                result[key] = _legacy_deep_merge(result[key], value)
+            else:
+                result[key] = json.loads(json.dumps(value, ensure_ascii=False)) if isinstance(value, (dict, list)) else value
+        return result
+    if isinstance(dest, list) and isinstance(src, list):
+        return list(dest) + list(src)
+    return json.loads(json.dumps(src, ensure_ascii=False))
+
+
+def _legacy_merge_named_list(base_list: list[Any], overlay_list: list[Any], key_fn: Callable[[Any], Any]) -> list[Any]:
+    merged: dict[str, Any] = {}
+    order: list[str] = []
+    for item in list(base_list) + list(overlay_list):
+        key = key_fn(item)
+        if not key:
+            continue
+        if key not in merged:
+            order.append(key)
+        merged[key] = json.loads(json.dumps(item, ensure_ascii=False))
+    return [merged[key] for key in order]
+
+
+def _legacy_merge_aggregations(base: Any, overlay: Any) -> Any:
+    result = json.loads(json.dumps(base, ensure_ascii=False))
+    for key, value in overlay.items():
+        existing = result.get(key)
+        if key == "aggregations" and isinstance(value, list):
+            key_fn = lambda item: str(item.get("name") or "").strip()  # noqa: E731
+            result[key] = _legacy_merge_named_list(existing if isinstance(existing, list) else [], value, key_fn)
+        elif key == "hiddenTools" and isinstance(value, list):
+            key_fn = lambda item: f"{item.get('server')}::{item.get('tool')}" if item.get("server") and item.get("tool") else None  # noqa: E731
+            result[key] = _legacy_merge_named_list(existing if isinstance(existing, list) else [], value, key_fn)
+        elif isinstance(value, dict) and isinstance(existing, dict):
+            result[key] = _legacy_deep_merge(existing, value)
+        else:
+            result[key] = json.loads(json.dumps(value, ensure_ascii=False))
+    return result
+
+
+def _legacy(layers: list[Mapping[str, Any]]) -> tuple[Any, Any]:
+    overrides = json.loads(json.dumps(DEFAULT_CATALOG_FRAGMENT["tool_overrides"], ensure_ascii=False))
+    aggregations = json.loads(json.dumps(DEFAULT_CATALOG_FRAGMENT["tool_aggregations"], ensure_ascii=False))
+    for layer in layers:
+        overrides = _legacy_deep_merge(overrides, layer["toolOverrides"])
+        aggregations = _legacy_merge_aggregations(aggregations, layer["toolAggregations"])
+    overrides = json.loads(json.dumps(overrides, ensure_ascii=False))
+    return overrides, aggregations
+
+
+def _current(layers: list[Mapping[str, Any]]) -> tuple[Any, Any]:
+    overrides = DEFAULT_CATALOG_FRAGMENT["tool_overrides"]
+    aggregations = DEFAULT_CATALOG_FRAGMENT["tool_aggregations"]
+    for layer in layers:
+        overrides = deep_merge(overrides, layer["toolOverrides"])
+        aggregations = merge_aggregation_payload(aggregations, layer["toolAggregations"])
+    return overrides, aggregations
+
+
+def _measure(func: Callable[[list[Mapping[str, Any]]], Any], layers: list[Mapping[str, Any]], repeat: int) -> tuple[float, float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(layers)
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func(layers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog", type=Path, default=STARTER_CATALOG)
+    parser.add_argument("--layers", type=int, nargs="+", default=[1, 4, 16], help="copies of the catalog to stack")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    catalog = json.loads(args.catalog.read_text(encoding="utf-8"))
+    print(f"{'layers':>6}  {'legacy ms':>10}  {'current ms':>10}  {'legacy KiB':>10}  {'current KiB':>11}")
+    for count in args.layers:
+        layers = [catalog] * count
+        legacy_result = _legacy(layers)
+        assert legacy_result == _current(layers)
+        legacy_ms, legacy_kib = _measure(_legacy, layers, args.repeat)
+        current_ms, current_kib = _measure(_current, layers, args.repeat)
+        print(f"{count:>6}  {legacy_ms:>10.2f}  {current_ms:>10.2f}  {legacy_kib:>10.0f}  {current_kib:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark aggregation response mapping on multi-megabyte payloads.
+
+Compares the compiled rule engine in `stelae_lib.integrator.tool_aggregations`
+against the previous per-call implementation (split the dotted path on every
+lookup and deep-copy each value twice), which is reproduced below for reference.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, MutableMapping
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stelae_lib.integrator.tool_aggregations import MappingRule, _evaluate_rules  # noqa: E402
+
+RULES = (
+    MappingRule.from_data({"target": "result.text", "from": "structuredContent.result.text"}),
+    MappingRule.from_data({"target": "result.entries", "from": "structuredContent.result.entries"}),
+    MappingRule.from_data({"target": "result.path", "from": "structuredContent.result.path"}),
+    MappingRule.from_data({"target": "result.encoding", "value": "utf-8"}),
+)
+
+
+def _legacy_lookup(data: Mapping[str, Any], path: str) -> Any:
+    parts = [part for part in path.split(".") if part]
+    current: Any = data
+    for part in parts:
+        if isinstance(current, Mapping) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def _legacy_assign(dest: MutableMapping[str, Any], path: str, value: Any) -> None:
+    parts = [part for part in path.split(".") if part]
+    cursor: MutableMapping[str, Any] = dest
+    for part in parts[:-1]:
+        next_value = cursor.get(part)
+        if not isinstance(next_value, MutableMapping):
+            next_value = {}
+            cursor[part] = next_value
+        cursor = next_value
+    cursor[parts[-1]] = copy.deepcopy(value)
+
+
+def _legacy_evaluate(data: Mapping[str, Any]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for rule in RULES:
+        if rule.literal is not None:
+            value = rule.literal
+        else:
+            value = _legacy_lookup(data, rule.source or "")
+        _legacy_assign(result, rule.target, copy.deepcopy(value))
+    return result
+
+
+def _compiled_evaluate(data: Mapping[str, Any]) -> Dict[str, Any]:
+    return _evaluate_rules(RULES, data, label="bench")
+
+
+def _payload(megabytes: float) -> Dict[str, Any]:
+    line = "x" * 120
+    line_count = max(1, int(megabytes * 1024 * 1024 / (len(line) + 1)))
+    entries = [{"name": f"file_{idx}.txt", "size": idx, "type": "file"} for idx in range(line_count // 10)]
+    return {
+        "content": [{"type": "text", "text": "…"}],
+        "structuredContent": {
+            "result": {
+                "path": "/workspace/big.txt",
+                "text": "\n".join(line for _ in range(line_count)),
+                "entries": entries,
+            }
+        },
+    }
+
+
+def _time(func: Callable[[Mapping[str, Any]], Any], payload: Mapping[str, Any], repeat: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(payload)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1.0, 4.0, 16.0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'legacy ms':>10}  {'compiled ms':>12}  {'speedup':>8}")
+    for size in args.megabytes:
+        payload = _payload(size)
+        assert _legacy_evaluate(payload) == _compiled_evaluate(payload)
+        legacy = statistics.median(_time(_legacy_evaluate, payload, args.repeat)) * 1000
+        compiled = statistics.median(_time(_compiled_evaluate, payload, args.repeat)) * 1000
+        speedup = legacy / compiled if compiled else float("inf")
+        print(f"{size:>6.1f}MB  {legacy:>10.2f}  {compiled:>12.4f}  {speedup:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,28 @@
 
 Each tool is defined in ${STELAE_CONFIG_HOME}/custom_tools.json (override via
 STELAE_CUSTOM_TOOLS_CONFIG). Every entry specifies the command to run plus
-optional args, cwd, env, and timeout. Tool arguments are forwarded as JSON via
-stdin (and mirrored in STELAE_TOOL_ARGS) so scripts can inspect them easily.
+optional args, cwd, env, timeout, maxConcurrency, and maxOutputBytes. Tool
+arguments are forwarded as JSON via stdin (and mirrored in STELAE_TOOL_ARGS) so
+scripts can inspect them easily. Commands run as asyncio subprocesses, so slow
+tools never block the server or each other.
+
+With inputMode "worker" the command is started once and kept alive: each call is
+one JSON line on the worker's stdin and the reply is one JSON line on its stdout,
+so interpreter startup is paid per worker rather than per call. Workers run in their
+own sessions, so the server kills them itself when it exits.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import os
-import subprocess
-from dataclasses import dataclass
+import signal
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 from mcp.server import FastMCP
 
@@ -23,7 +33,17 @@ from stelae_lib.config_overlays import config_home, require_home_path, write_jso
 DEFAULT_FILENAME = "custom_tools.json"
 LEGACY_OVERLAY = "custom_tools.local.json"
 
-DEFAULT_INPUT_MODE = "json"  # json (stdin+env) or none
+DEFAULT_INPUT_MODE = "json"  # json (stdin+env), none, or worker (long-lived JSON-lines process)
+INPUT_MODES = ("json", "none", "worker")
+DEFAULT_WORKER_MAX_REQUESTS = 1000
+DEFAULT_WORKER_IDLE_SECONDS = 300.0
+# Idle workers are pinged before reuse once they have sat unused this long.
+WORKER_PING_AFTER = float(os.getenv("STELAE_CUSTOM_TOOLS_WORKER_PING_AFTER", "30"))
+WORKER_PING_TIMEOUT = 5.0
+DEFAULT_MAX_OUTPUT_BYTES = max(
+    1024, int(os.getenv("STELAE_CUSTOM_TOOLS_MAX_OUTPUT_BYTES", str(4 * 1024 * 1024)))
+)
+_READ_CHUNK = 64 * 1024
 
 app = FastMCP(
     name="stelae-custom",
@@ -31,6 +51,249 @@ app = FastMCP(
 )
 
 
+@dataclass
+class _CappedOutput:
+    """Bytes read from one pipe, keeping at most `limit` and counting the rest."""
+
+    limit: int
+    chunks: List[bytes] = field(default_factory=list)
+    kept: int = 0
+    dropped: int = 0
+
+    def feed(self, chunk: bytes) -> None:
+        room = self.limit - self.kept
+        if room > 0:
+            self.chunks.append(chunk[:room])
+            self.kept += min(room, len(chunk))
+        self.dropped += max(0, len(chunk) - max(room, 0))
+
+    def text(self) -> str:
+        body = b"".join(self.chunks).decode("utf-8", errors="replace")
+        if self.dropped:
+            body += f"\n[truncated {self.dropped} bytes]"
+        return body
+
+
+async def _drain(stream: asyncio.StreamReader | None, sink: _CappedOutput) -> None:
+    # Keep reading past the cap so a chatty tool never blocks on a full pipe.
+    if stream is None:
+        return
+    while chunk := await stream.read(_READ_CHUNK):
+        sink.feed(chunk)
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+_SLOTS: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+_POOLS: Dict[str, "_WorkerPool"] = {}
+
+
+class WorkerError(RuntimeError):
+    """A worker process died, hung, or broke the JSON-lines protocol."""
+
+
+@dataclass
+class _Worker:
+    proc: asyncio.subprocess.Process
+    served: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    next_id: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def request(self, message: Dict[str, Any], timeout: float | None) -> Dict[str, Any]:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.next_id += 1
+        request_id = self.next_id
+        line = json.dumps({"id": request_id, **message}, ensure_ascii=False) + "\n"
+        stdout = self.proc.stdout
+
+        async def _exchange() -> Dict[str, Any]:
+            self.proc.stdin.write(line.encode("utf-8"))
+            await self.proc.stdin.drain()
+            while True:
+                try:
+                    raw = await stdout.readline()
+                except ValueError:
+                    raise WorkerError("reply exceeded maxOutputBytes") from None
+                if not raw:
+                    raise WorkerError(f"worker exited with {await self.proc.wait()}")
+                try:
+                    reply = json.loads(raw)
+                except ValueError:
+                    continue  # stray print() output; replies are always JSON objects
+                if isinstance(reply, dict) and reply.get("id") == request_id:
+                    return reply
+
+        try:
+            return await asyncio.wait_for(_exchange(), timeout=timeout)
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise WorkerError(f"worker stdin closed: {exc}") from None
+
+
+class _WorkerPool:
+    """Long-lived worker processes for one tool, bound to the loop that started them.
+
+    Idle workers are reused most-recently-used first so the coldest ones age out
+    under the idle reaper. A worker is pinged before reuse after sitting idle for
+    `WORKER_PING_AFTER`, retired once it has served `worker_max_requests` calls,
+    and killed on any timeout or protocol error.
+    """
+
+    def __init__(self, spec: "ToolSpec") -> None:
+        self.spec = spec
+        self.loop = asyncio.get_running_loop()
+        self._idle: List[_Worker] = []
+        self._live: List[_Worker] = []
+        self._slots = asyncio.Semaphore(spec.workers)
+        self._reaper: asyncio.Task[None] | None = None
+        # Retired workers still exiting, keyed by the task that waits for them; held
+        # here so the tasks are not garbage-collected and kill_all can finish them.
+        self._retiring: Dict[asyncio.Task[None], _Worker] = {}
+        self.spawned = 0
+
+    async def call(self, arguments: Dict[str, Any]) -> str:
+        spec = self.spec
+        async with self._slots:
+            worker = await self._checkout()
+            try:
+                reply = await worker.request({"method": "call", "arguments": arguments}, spec.timeout)
+            except asyncio.TimeoutError:
+                self._discard(worker)
+                raise RuntimeError(f"{spec.name} timed out after {spec.timeout:g}s") from None
+            except WorkerError as exc:
+                self._discard(worker)
+                raise RuntimeError(f"{spec.name} worker failed: {exc}") from None
+            except BaseException:
+                self._discard(worker)
+                raise
+            self._checkin(worker)
+        if reply.get("error") is not None:
+            raise RuntimeError(f"{spec.name} failed: {reply['error']}")
+        result = reply.get("result")
+        if isinstance(result, str):
+            return result.strip()
+        return json.dumps(result, ensure_ascii=False)
+
+    async def _spawn(self) -> _Worker:
+        spec = self.spec
+        env = dict(spec.base_env or os.environ)
+        env["STELAE_TOOL_WORKER"] = "1"
+        proc = await asyncio.create_subprocess_exec(
+            spec.command,
+            *spec.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            cwd=spec.cwd,
+            env=env,
+            start_new_session=True,
+            limit=spec.max_output_bytes + _READ_CHUNK,
+        )
+        worker = _Worker(proc)
+        self._live.append(worker)
+        self.spawned += 1
+        if spec.worker_idle_seconds > 0 and self._reaper is None:
+            self._reaper = self.loop.create_task(self._reap_idle())
+        return worker
+
+    async def _healthy(self, worker: _Worker) -> bool:
+        if not worker.alive:
+            return False
+        if time.monotonic() - worker.last_used < WORKER_PING_AFTER:
+            return True
+        try:
+            await worker.request({"method": "ping"}, WORKER_PING_TIMEOUT)
+        except (asyncio.TimeoutError, WorkerError):
+            return False
+        return True
+
+    async def _checkout(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if await self._healthy(worker):
+                return worker
+            self._discard(worker)
+        return await self._spawn()
+
+    def _checkin(self, worker: _Worker) -> None:
+        worker.served += 1
+        worker.last_used = time.monotonic()
+        if not worker.alive:
+            self._discard(worker)
+        elif worker.served >= self.spec.worker_max_requests:
+            self._retire(worker)
+        else:
+            self._idle.append(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        if worker in self._live:
+            self._live.remove(worker)
+        if worker in self._idle:
+            self._idle.remove(worker)
+        _kill(worker.proc)
+
+    def _retire(self, worker: _Worker) -> None:
+        """Close stdin so the worker exits on EOF; kill it if it lingers."""
+
+        if worker in self._live:
+            self._live.remove(worker)
+        if worker in self._idle:
+            self._idle.remove(worker)
+        if worker.proc.stdin is not None:
+            worker.proc.stdin.close()
+
+        async def _reap() -> None:
+            try:
+                await asyncio.wait_for(worker.proc.wait(), timeout=WORKER_PING_TIMEOUT)
+            except asyncio.TimeoutError:
+                _kill(worker.proc)
+
+        task = self.loop.create_task(_reap())
+        self._retiring[task] = worker
+        task.add_done_callback(self._retiring.pop)
+
+    async def _reap_idle(self) -> None:
+        idle_seconds = self.spec.worker_idle_seconds
+        try:
+            while self._live:
+                await asyncio.sleep(min(idle_seconds, 30.0) / 2)
+                cutoff = time.monotonic() - idle_seconds
+                for worker in [worker for worker in self._idle if worker.last_used <= cutoff]:
+                    self._retire(worker)
+        finally:
+            self._reaper = None
+
+    def kill_all(self) -> None:
+        for worker in list(self._live):
+            self._discard(worker)
+        for task, worker in list(self._retiring.items()):
+            _kill(worker.proc)
+            if not self.loop.is_closed():
+                task.cancel()
+        if self._reaper is not None and not self.loop.is_closed():
+            self._reaper.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "live": len(self._live),
+            "idle": len(self._idle),
+            "spawned": self.spawned,
+            "pids": [worker.proc.pid for worker in self._live],
+        }
+
+
 @dataclass(frozen=True)
 class ToolSpec:
     name: str
@@ -41,6 +304,12 @@ class ToolSpec:
     env: Dict[str, str]
     timeout: float | None
     input_mode: str
+    max_concurrency: int | None = None
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES
+    workers: int = 1
+    worker_max_requests: int = DEFAULT_WORKER_MAX_REQUESTS
+    worker_idle_seconds: float = DEFAULT_WORKER_IDLE_SECONDS
+    base_env: Mapping[str, str] = field(default_factory=dict, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ToolSpec":
@@ -55,37 +324,122 @@ class ToolSpec:
         if timeout is not None:
             timeout = float(timeout)
         input_mode = str(data.get("inputMode") or DEFAULT_INPUT_MODE).lower()
-        if input_mode not in ("json", "none"):
+        if input_mode not in INPUT_MODES:
             raise ValueError(f"Unsupported inputMode '{input_mode}' for tool {name}")
+        max_concurrency = data.get("maxConcurrency")
+        if max_concurrency is not None:
+            max_concurrency = int(max_concurrency)
+            if max_concurrency < 1:
+                raise ValueError(f"maxConcurrency for tool {name} must be at least 1")
+        max_output_bytes = int(data.get("maxOutputBytes") or DEFAULT_MAX_OUTPUT_BYTES)
+        workers = int(data.get("workers") or max_concurrency or 1)
+        worker_max_requests = int(data.get("workerMaxRequests") or DEFAULT_WORKER_MAX_REQUESTS)
+        if workers < 1 or worker_max_requests < 1:
+            raise ValueError(f"workers and workerMaxRequests for tool {name} must be at least 1")
+        worker_idle_seconds = data.get("workerIdleSeconds")
+        worker_idle_seconds = (
+            DEFAULT_WORKER_IDLE_SECONDS if worker_idle_seconds is None else max(0.0, float(worker_idle_seconds))
+        )
         if not name:
             raise ValueError("Tool name cannot be empty")
         if not command:
             raise ValueError(f"Tool {name} is missing a command")
-        return cls(name, description, command, args, cwd, env, timeout, input_mode)
+        # Built once per tool; each call only adds STELAE_TOOL_ARGS.
+        base_env = {**os.environ, **env}
+        return cls(
+            name,
+            description,
+            command,
+            args,
+            cwd,
+            env,
+            timeout,
+            input_mode,
+            max_concurrency,
+            max_output_bytes,
+            workers,
+            worker_max_requests,
+            worker_idle_seconds,
+            base_env,
+        )
 
-    def run(self, arguments: Dict[str, Any]) -> str:
+    def _slot(self) -> asyncio.Semaphore | None:
+        if self.max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        entry = _SLOTS.get(self.name)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Semaphore(self.max_concurrency))
+            _SLOTS[self.name] = entry
+        return entry[1]
+
+    def _pool(self) -> _WorkerPool:
+        loop = asyncio.get_running_loop()
+        pool = _POOLS.get(self.name)
+        if pool is None or pool.loop is not loop:
+            if pool is not None:
+                pool.kill_all()
+            pool = _WorkerPool(self)
+            _POOLS[self.name] = pool
+        return pool
+
+    async def arun(self, arguments: Dict[str, Any]) -> str:
+        slot = self._slot()
+        if slot is None:
+            return await self._execute(arguments)
+        async with slot:
+            return await self._execute(arguments)
+
+    async def _execute(self, arguments: Dict[str, Any]) -> str:
+        if self.input_mode == "worker":
+            return await self._pool().call(arguments or {})
         payload = json.dumps(arguments or {}, ensure_ascii=False)
-        env = os.environ.copy()
-        env.update(self.env)
+        env = dict(self.base_env or os.environ)
         env["STELAE_TOOL_ARGS"] = payload
-        stdin_data = payload if self.input_mode == "json" else None
-        proc = subprocess.run(
-            [self.command, *self.args],
-            input=stdin_data,
-            text=True,
-            capture_output=True,
+        feed_stdin = self.input_mode == "json"
+        proc = await asyncio.create_subprocess_exec(
+            self.command,
+            *self.args,
+            stdin=asyncio.subprocess.PIPE if feed_stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=self.cwd,
             env=env,
-            timeout=self.timeout,
-            check=False,
+            start_new_session=True,
         )
-        if proc.returncode != 0:
-            snippet = proc.stderr.strip() or proc.stdout.strip()
+        stdout = _CappedOutput(self.max_output_bytes)
+        stderr = _CappedOutput(self.max_output_bytes)
+
+        async def _communicate() -> int:
+            if feed_stdin and proc.stdin is not None:
+                try:
+                    proc.stdin.write(payload.encode("utf-8"))
+                    await proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    proc.stdin.close()
+            await asyncio.gather(_drain(proc.stdout, stdout), _drain(proc.stderr, stderr))
+            return await proc.wait()
+
+        try:
+            returncode = await asyncio.wait_for(_communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            _kill(proc)
+            await proc.wait()
+            raise RuntimeError(f"{self.name} timed out after {self.timeout:g}s") from None
+        except BaseException:
+            _kill(proc)
+            raise
+        if returncode != 0:
+            snippet = stderr.text().strip() or stdout.text().strip()
             raise RuntimeError(
-                f"{self.name} exited with {proc.returncode}: {snippet or 'no output'}"
+                f"{self.name} exited with {returncode}: {snippet or 'no output'}"
             )
-        output = proc.stdout.strip()
-        return output or ""
+        return stdout.text().strip()
+
+    def run(self, arguments: Dict[str, Any]) -> str:
+        return asyncio.run(self.arun(arguments))
 
 
 def _load_specs() -> Tuple[Path, List[ToolSpec]]:
@@ -112,11 +466,29 @@ def _register_tools(specs: Iterable[ToolSpec]) -> None:
 
 def _make_runner(spec: ToolSpec):
     async def _runner(**arguments: Any) -> str:
-        return spec.run(arguments)
+        return await spec.arun(arguments)
 
     return _runner
 
 
+def shutdown_workers() -> None:
+    """Kill every resident worker process."""
+
+    for pool in list(_POOLS.values()):
+        pool.kill_all()
+    _POOLS.clear()
+
+
+atexit.register(shutdown_workers)
+
+
+def _terminate(signum: int, frame: Any) -> None:
+    # atexit hooks do not run on SIGTERM; kill the workers, then die as usual.
+    shutdown_workers()
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
 def main() -> None:
     config_path, specs = _load_specs()
     if not specs:
@@ -124,7 +496,11 @@ def main() -> None:
             "No custom tools configured; edit %s to register commands", config_path
         )
     _register_tools(specs)
-    app.run()
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        app.run()
+    finally:
+        shutdown_workers()
 
 
 def _config_path() -> Path:
@@ -56,6 +56,9 @@ def _build_payload() -> dict[str, object]:
         payload["min_score"] = min_score
     payload["append"] = _as_bool(os.environ.get("DISCOVER_APPEND"), True)
     payload["dry_run"] = _as_bool(os.environ.get("DISCOVER_DRY_RUN"), False)
+    source = os.environ.get("DISCOVER_SOURCE", "").strip()
+    if source:
+        payload["source"] = source
     return payload
 
 
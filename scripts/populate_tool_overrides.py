@@ -5,9 +5,12 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import hashlib
 import json
 import os
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping, Sequence
 
@@ -15,12 +18,17 @@ import httpx
 from mcp import types
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
+from stelae_lib.fileio import atomic_write
 from stelae_lib.integrator.tool_overrides import ToolOverridesStore
 from stelae_lib.config_overlays import config_home, require_home_path, runtime_path
 
 DEFAULT_PROXY_PATH = runtime_path("proxy.json")
 DEFAULT_OVERRIDES_PATH = config_home() / "tool_overrides.json"
 DEFAULT_PROXY_TIMEOUT = 15.0
+DEFAULT_LIST_TOOLS_CACHE_PATH = runtime_path("list_tools_cache.json")
+DEFAULT_STDIO_CONCURRENCY = int(os.getenv("STELAE_POPULATE_CONCURRENCY", "4"))
+DEFAULT_SERVER_TIMEOUT = float(os.getenv("STELAE_POPULATE_SERVER_TIMEOUT", "60"))
+DEFAULT_CACHE_TTL = float(os.getenv("STELAE_POPULATE_CACHE_TTL", str(24 * 3600)))
 
 
 async def fetch_tools(command: str, args: Iterable[str], env: Dict[str, str] | None) -> list[types.Tool]:
@@ -51,6 +59,100 @@ async def fetch_tools_via_proxy(proxy_url: str, timeout: float) -> list[Mapping[
     return normalized
 
 
+class ListToolsCache:
+    """`tools/list` results of stdio servers, keyed by a hash of how they are launched.
+
+    A server whose command, args and env are unchanged (and whose entry is younger
+    than `ttl` seconds) is not spawned again; its cached tool payloads are reused.
+    """
+
+    def __init__(self, path: Path, *, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Any] = {}
+        self._dirty = False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        entries = data.get("servers") if isinstance(data, dict) else None
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    @staticmethod
+    def key_for(entry: Mapping[str, Any]) -> str:
+        identity = {"command": entry.get("command"), "args": list(entry.get("args") or []), "env": entry.get("env") or {}}
+        text = json.dumps(identity, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list[Dict[str, Any]] | None:
+        cached = self._entries.get(key)
+        if not isinstance(cached, dict) or not isinstance(cached.get("tools"), list):
+            return None
+        fetched_at = cached.get("fetchedAt")
+        if not isinstance(fetched_at, (int, float)) or time.time() - fetched_at > self.ttl:
+            return None
+        return cached["tools"]
+
+    def put(self, key: str, name: str, tools: list[Dict[str, Any]]) -> None:
+        self._entries[key] = {"server": name, "fetchedAt": time.time(), "tools": tools}
+        self._dirty = True
+
+    def write(self) -> None:
+        if not self._dirty:
+            return
+        payload = {"schemaVersion": 1, "servers": self._entries}
+        atomic_write(self.path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+        self._dirty = False
+
+
+@dataclass
+class ServerTools:
+    name: str
+    tools: list[Dict[str, Any]] = field(default_factory=list)
+    cached: bool = False
+    error: str | None = None
+
+
+async def collect_stdio_tools(
+    servers: Sequence[tuple[str, Dict[str, Any]]],
+    *,
+    concurrency: int = DEFAULT_STDIO_CONCURRENCY,
+    timeout: float | None = DEFAULT_SERVER_TIMEOUT,
+    cache: ListToolsCache | None = None,
+) -> list[ServerTools]:
+    """Fetch tool payloads for each server, at most `concurrency` spawns at a time.
+
+    Results are returned in the order of `servers` regardless of completion order.
+    Failures and timeouts are reported per server instead of aborting the batch.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _collect(name: str, entry: Dict[str, Any]) -> ServerTools:
+        key = ListToolsCache.key_for(entry)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return ServerTools(name=name, tools=cached, cached=True)
+        async with semaphore:
+            try:
+                tools = await asyncio.wait_for(
+                    fetch_tools(entry["command"], entry.get("args", []), entry.get("env")),
+                    timeout=timeout if timeout and timeout > 0 else None,
+                )
+            except asyncio.TimeoutError:
+                return ServerTools(name=name, error=f"timed out after {timeout:g}s")
+            except Exception as exc:  # pragma: no cover - relies on external binaries
+                return ServerTools(name=name, error=str(exc) or type(exc).__name__)
+        payloads = [tool.model_dump(mode="json") for tool in tools]
+        if cache is not None:
+            cache.put(key, name, payloads)
+        return ServerTools(name=name, tools=payloads)
+
+    return list(await asyncio.gather(*(_collect(name, entry) for name, entry in servers)))
+
+
 def load_proxy_config(path: Path) -> Dict[str, Any]:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
@@ -110,24 +212,29 @@ async def populate_from_stdio(
     target_servers: set[str],
     keys: Sequence[str],
     quiet: bool,
+    *,
+    concurrency: int = DEFAULT_STDIO_CONCURRENCY,
+    timeout: float | None = DEFAULT_SERVER_TIMEOUT,
+    cache: ListToolsCache | None = None,
 ) -> int:
+    servers = [
+        (name, entry)
+        for name, entry in iter_stdio_servers(config)
+        if not target_servers or name in target_servers
+    ]
+    results = await collect_stdio_tools(servers, concurrency=concurrency, timeout=timeout, cache=cache)
     total_updates = 0
-    for name, entry in iter_stdio_servers(config):
-        if target_servers and name not in target_servers:
-            continue
-        command = entry["command"]
-        server_args = entry.get("args", [])
-        try:
-            tools = await fetch_tools(command, server_args, entry.get("env"))
-        except Exception as exc:  # pragma: no cover - relies on external binaries
-            print(f"[warn] Failed to load tools for {name}: {exc}", file=sys.stderr)
+    for result in results:
+        if result.error is not None:
+            print(f"[warn] Failed to load tools for {result.name}: {result.error}", file=sys.stderr)
             continue
-        for tool in tools:
-            payload = tool.model_dump(mode="json")
-            if record_tool(overrides, (name,), payload, keys):
+        for payload in result.tools:
+            if record_tool(overrides, (result.name,), payload, keys):
                 total_updates += 1
                 if not quiet:
-                    print(f"[update] {name}.{tool.name} - recorded schema")
+                    print(f"[update] {result.name}.{payload.get('name')} - recorded schema")
+    if cache is not None:
+        cache.write()
     return total_updates
 
 
@@ -165,6 +272,25 @@ async def main() -> None:
     parser.add_argument("--overrides", default=str(DEFAULT_OVERRIDES_PATH), help="Path to tool_overrides.json under config home")
     parser.add_argument("--output", help="Merged overrides destination (defaults to ${TOOL_OVERRIDES_PATH} or ~/.config/stelae/.state/tool_overrides.json)")
     parser.add_argument("--servers", nargs="*", help="Optional subset of server names to scan")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_STDIO_CONCURRENCY,
+        help="Maximum stdio servers launched at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--server-timeout",
+        type=float,
+        default=DEFAULT_SERVER_TIMEOUT,
+        help="Seconds allowed per stdio server for initialize + tools/list (0 disables)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=str(DEFAULT_LIST_TOOLS_CACHE_PATH),
+        help="tools/list cache for stdio servers (defaults to ~/.config/stelae/.state/list_tools_cache.json)",
+    )
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Seconds before a cached tools/list result is refreshed")
+    parser.add_argument("--no-cache", action="store_true", help="Spawn every stdio server even when a cached result exists")
     parser.add_argument("--dry-run", action="store_true", help="Show planned changes without writing")
     parser.add_argument("--quiet", action="store_true", help="Suppress per-tool update logs; still prints the final summary")
     args = parser.parse_args()
@@ -198,7 +324,17 @@ async def main() -> None:
     else:
         config = load_proxy_config(Path(args.proxy))
         target_servers = set(args.servers or [])
-        total_updates = await populate_from_stdio(config, overrides, target_servers, keys, args.quiet)
+        cache = None if args.no_cache else ListToolsCache(Path(args.cache), ttl=args.cache_ttl)
+        total_updates = await populate_from_stdio(
+            config,
+            overrides,
+            target_servers,
+            keys,
+            args.quiet,
+            concurrency=args.concurrency,
+            timeout=args.server_timeout,
+            cache=cache,
+        )
 
     if total_updates == 0:
         print("No schema updates required")
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import sys
@@ -75,7 +76,8 @@ def _execute(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
 
 @app.tool(name="manage_stelae", description="Install/remove MCP servers discovered by 1mcp or manual JSON blobs.")
 async def manage_stelae(operation: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    return _execute(operation, params or {})
+    # install/remove run the render + restart pipeline; keep the event loop free meanwhile.
+    return await asyncio.to_thread(_execute, operation, params or {})
 
 
 def main() -> None:
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Build, inspect, or vacuum the persistent trigram search index."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stelae_lib.search.trigram import TrigramIndex
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the trigram index used by stelae search")
+    parser.add_argument(
+        "command",
+        choices=("build", "inspect", "vacuum"),
+        help="build: refresh incrementally (or from scratch with --rebuild); inspect: print stats; "
+        "vacuum: drop vanished files and compact the database",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(os.getenv("STELAE_SEARCH_ROOT", ".")),
+        help="Workspace to index (defaults to ${STELAE_SEARCH_ROOT} or the current directory)",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        help="Index database path (defaults to the one the search servers read under ${STELAE_STATE_HOME}/search-index/)",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Discard existing entries before building")
+    parser.add_argument(
+        "--respect-ignore",
+        action="store_true",
+        help="Skip files excluded by .gitignore/.ignore (the search servers index them, like rg --no-ignore)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        index = TrigramIndex(args.root, args.index, respect_ignore=args.respect_ignore)
+    except ValueError as exc:
+        raise SystemExit(f"[search-index] {exc}") from exc
+    try:
+        if args.command == "build":
+            stats = index.rebuild() if args.rebuild else index.refresh()
+            payload = {**stats.to_data(), **index.inspect()}
+        elif args.command == "vacuum":
+            payload = index.vacuum()
+        else:
+            payload = index.inspect()
+    finally:
+        index.close()
+    print(json.dumps(payload, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
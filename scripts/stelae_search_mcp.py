@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 """Minimal FastMCP server exposing canonical  tool."""
 
+import asyncio
 import json
 import logging
 import os
-import re
-import subprocess
+import sys
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 
 from mcp import types
 from mcp.server import FastMCP
 
+STELAE_DIR = Path(__file__).resolve().parents[1]
+if str(STELAE_DIR) not in sys.path:
+    sys.path.insert(0, str(STELAE_DIR))
+
+from stelae_lib.search import fallback, trigram  # noqa: E402
 
 
 def _is_truthy(value: str) -> bool:
@@ -52,6 +57,13 @@ ROOT = Path(os.getenv("STELAE_SEARCH_ROOT", ".")).resolve()
 MAX_RESULTS = int(os.getenv("STELAE_SEARCH_MAX_RESULTS", "200"))
 RG_BIN = os.getenv("STELAE_RG_BIN", "rg")
 FETCH_MAX_BYTES = int(os.getenv("STELAE_FETCH_MAX_BYTES", "1048576"))
+SEARCH_TIMEOUT = float(os.getenv("STELAE_SEARCH_TIMEOUT", "10"))
+# Answer literal queries from the persistent trigram index instead of rescanning; the
+# index covers ignored and hidden files and matches case-sensitively, like the rg path.
+INDEX_ENABLED = _is_truthy(os.getenv("STELAE_SEARCH_INDEX", ""))
+# Matched lines longer than this are previewed by rg instead of printed whole.
+RG_MAX_COLUMNS = 4096
+_RG_CHUNK = 64 * 1024
 
 
 
@@ -93,66 +105,36 @@ async def search(query: str, globs: Optional[List[str]] = None, max_results: int
     )
     search_start = time.perf_counter()
 
-    use_rg = _rg_available()
-    LOGGER.debug("ripgrep available=%s bin=%s", use_rg, RG_BIN)
-
-    if use_rg:
-        cmd = [RG_BIN, "--vimgrep", "--no-ignore", "--hidden", "--max-count", "1", query, str(ROOT)]
-        for pattern in globs:
-            cmd.extend(["-g", pattern])
-        LOGGER.debug("executing ripgrep command=%s", " ".join(cmd))
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.stderr:
-            LOGGER.debug("ripgrep stderr=%s", result.stderr.strip())
-        LOGGER.debug("ripgrep returncode=%s", result.returncode)
-        for line in result.stdout.splitlines():
-            parts = line.split(":", 3)
-            if len(parts) != 4:
-                continue
-            path_s, line_s, col_s, snippet = parts
-            matches.append(
-                {
-                    "path": _safe_rel(Path(path_s)),
-                    "line": int(line_s),
-                    "col": int(col_s),
-                    "text": snippet.strip(),
-                }
-            )
-            if len(matches) >= max_results:
-                truncated = True
-                LOGGER.debug("max_results reached via ripgrep; stopping collection")
-                break
+    # rg treats the query as a regex; only literal queries mean the same thing to the index.
+    use_index = INDEX_ENABLED and trigram.is_literal(query)
+    use_rg = not use_index and _rg_available()
+    LOGGER.debug("index used=%s ripgrep available=%s bin=%s", use_index, use_rg, RG_BIN)
+
+    if use_index:
+        found, truncated = await asyncio.to_thread(
+            trigram.shared_index(ROOT, respect_ignore=False).search,
+            query,
+            globs=globs,
+            max_results=max_results,
+            deadline=search_start + SEARCH_TIMEOUT,
+            ignore_case=False,
+        )
+        matches = [{"path": item.path, "line": item.line, "col": item.col, "text": item.text} for item in found]
+    elif use_rg:
+        matches, truncated = await _search_rg(query, globs, max_results, search_start + SEARCH_TIMEOUT)
     else:
         LOGGER.debug("ripgrep not available; using Python fallback")
-        pattern = re.compile(re.escape(query), re.IGNORECASE)
-        for root, _, files in os.walk(ROOT):
-            for name in files:
-                path = Path(root) / name
-                if globs and not any(path.match(g) for g in globs):
-                    continue
-                try:
-                    with path.open("r", errors="ignore") as fh:
-                        for lineno, line_text in enumerate(fh, start=1):
-                            match = pattern.search(line_text)
-                            if match:
-                                matches.append(
-                                    {
-                                        "path": _safe_rel(path),
-                                        "line": lineno,
-                                        "col": match.start() + 1,
-                                        "text": line_text.strip(),
-                                    }
-                                )
-                                break
-                except Exception as exc:  # pragma: no cover - defensive logging
-                    LOGGER.debug("skipping file=%s error=%s", path, exc)
-                    continue
-                if len(matches) >= max_results:
-                    truncated = True
-                    LOGGER.debug("max_results reached via fallback; stopping collection")
-                    break
-            if truncated:
-                break
+        found, truncated = await asyncio.to_thread(
+            fallback.search,
+            ROOT,
+            query,
+            globs=globs,
+            max_results=max_results,
+            deadline=search_start + SEARCH_TIMEOUT,
+        )
+        matches = [{"path": item.path, "line": item.line, "col": item.col, "text": item.text} for item in found]
+        if truncated:
+            LOGGER.debug("fallback stopped early with %d matches", len(matches))
 
     duration_ms = (time.perf_counter() - search_start) * 1000
     LOGGER.debug(
@@ -177,10 +159,111 @@ async def search(query: str, globs: Optional[List[str]] = None, max_results: int
         if len(results) >= max_results:
             break
 
-    payload = json.dumps({"results": results}, ensure_ascii=False)
+    payload = json.dumps({"results": results, "truncated": truncated}, ensure_ascii=False)
     return types.CallToolResult(content=[types.TextContent(type="text", text=payload)])
 
 
+def _parse_vimgrep(line: str) -> Optional[dict]:
+    parts = line.split(":", 3)
+    if len(parts) != 4:
+        return None
+    path_s, line_s, col_s, snippet = parts
+    try:
+        return {"path": _safe_rel(Path(path_s)), "line": int(line_s), "col": int(col_s), "text": snippet.strip()}
+    except ValueError:
+        return None
+
+
+async def _iter_lines(stream: asyncio.StreamReader, max_line: int) -> AsyncIterator[bytes]:
+    """Yield newline-delimited lines, dropping any line longer than `max_line` bytes."""
+
+    pending = b""
+    overlong = False
+    while chunk := await stream.read(_RG_CHUNK):
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if overlong:
+                overlong = False
+                continue
+            yield line
+        if len(pending) > max_line:
+            pending = b""
+            overlong = True
+    if pending and not overlong:
+        yield pending
+
+
+async def _search_rg(query: str, globs: List[str], max_results: int, deadline: float) -> Tuple[List[dict], bool]:
+    """Stream `rg --vimgrep` output, stopping rg once `max_results` matches or the deadline is hit.
+
+    Returns the matches collected so far and whether the search stopped early.
+    """
+
+    cmd = [
+        RG_BIN,
+        "--vimgrep",
+        "--no-ignore",
+        "--hidden",
+        "--max-count",
+        "1",
+        "--max-columns",
+        str(RG_MAX_COLUMNS),
+        "--max-columns-preview",
+        query,
+        str(ROOT),
+    ]
+    for pattern in globs:
+        cmd.extend(["-g", pattern])
+    LOGGER.debug("executing ripgrep command=%s", " ".join(cmd))
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    matches: List[dict] = []
+    truncated = False
+
+    async def _collect() -> None:
+        nonlocal truncated
+        assert proc.stdout is not None
+        async for raw in _iter_lines(proc.stdout, RG_MAX_COLUMNS * 4):
+            match = _parse_vimgrep(raw.decode("utf-8", errors="replace"))
+            if match is None:
+                continue
+            matches.append(match)
+            if len(matches) >= max_results:
+                truncated = True
+                LOGGER.debug("max_results reached via ripgrep; stopping rg")
+                return
+
+    async def _stderr() -> bytes:
+        assert proc.stderr is not None
+        kept = b""
+        while chunk := await proc.stderr.read(_RG_CHUNK):
+            kept = (kept + chunk)[-_RG_CHUNK:]
+        return kept
+
+    stderr_task = asyncio.ensure_future(_stderr())
+    try:
+        await asyncio.wait_for(_collect(), timeout=max(0.0, deadline - time.perf_counter()))
+    except asyncio.TimeoutError:
+        truncated = True
+        LOGGER.debug("ripgrep exceeded %.1fs budget; returning %d partial matches", SEARCH_TIMEOUT, len(matches))
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        returncode = await proc.wait()
+        stderr = await stderr_task
+    if stderr:
+        LOGGER.debug("ripgrep stderr=%s", stderr.decode("utf-8", errors="replace").strip())
+    LOGGER.debug("ripgrep returncode=%s", returncode)
+    return matches, truncated
+
 
 @app.tool(name="fetch", description="Connector-compliant fetch for search results.")
 async def fetch(result_id: str) -> types.CallToolResult:
@@ -4,25 +4,34 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import importlib.util
 import itertools
 import json
 import logging
 import os
 import sys
+import time
+import weakref
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from types import MethodType
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Sequence
 
+import anyio
 import httpx
 from mcp import types
 from mcp.client.sse import sse_client
 from mcp.client.session import ClientSession
 from mcp.server import FastMCP
+from mcp.server.lowlevel.server import NotificationOptions, Server
+from mcp.server.session import ServerSession
+from mcp.shared.exceptions import McpError
 
-from stelae_lib.config_overlays import config_home, load_layered_env
+from stelae_lib.config_overlays import config_home, load_layered_env, state_home
 from stelae_lib.integrator.core import StelaeIntegratorService
+from stelae_lib.search import trigram
 
 DEFAULT_PROXY_BASE = "http://localhost:9090"
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -75,10 +84,41 @@ SSE_READ_TIMEOUT = float(
     os.getenv("STELAE_STREAMABLE_SSE_READ_TIMEOUT", str(DEFAULT_SSE_READ_TIMEOUT))
 )
 STATIC_SEARCH_ENABLED = os.getenv("STELAE_STREAMABLE_STATIC_SEARCH", "1") != "0"
+# Serve literal queries over SEARCH_ROOT from the persistent trigram index instead of grep.
+SEARCH_INDEX_ENABLED = os.getenv("STELAE_STREAMABLE_SEARCH_INDEX", "0") == "1"
 PROXY_SYNC_TIMEOUT = float(os.getenv("STELAE_STREAMABLE_SYNC_TIMEOUT", "10.0"))
 PROXY_CALL_TIMEOUT = float(
     os.getenv("STELAE_STREAMABLE_PROXY_CALL_TIMEOUT", str(SSE_READ_TIMEOUT))
 )
+PROXY_MAX_CONNECTIONS = max(
+    1, int(os.getenv("STELAE_STREAMABLE_PROXY_MAX_CONNECTIONS", "100"))
+)
+PROXY_MAX_KEEPALIVE = max(
+    0, int(os.getenv("STELAE_STREAMABLE_PROXY_MAX_KEEPALIVE", "20"))
+)
+PROXY_KEEPALIVE_EXPIRY = float(
+    os.getenv("STELAE_STREAMABLE_PROXY_KEEPALIVE_EXPIRY", "30.0")
+)
+PROXY_HTTP2 = os.getenv("STELAE_STREAMABLE_PROXY_HTTP2", "1") != "0"
+PROXY_COALESCE = os.getenv("STELAE_STREAMABLE_COALESCE", "1") != "0"
+PROXY_STREAM_RESPONSES = os.getenv("STELAE_STREAMABLE_STREAM_RESPONSES", "1") != "0"
+PROXY_MAX_RESPONSE_BYTES = max(
+    1024, int(os.getenv("STELAE_STREAMABLE_MAX_RESPONSE_BYTES", str(64 * 1024 * 1024)))
+)
+SSE_POOL_ENABLED = os.getenv("STELAE_STREAMABLE_SSE_POOL", "1") != "0"
+SSE_POOL_STREAM_TIMEOUT = float(
+    os.getenv("STELAE_STREAMABLE_SSE_POOL_STREAM_TIMEOUT", "900.0")
+)
+SSE_POOL_MAX_CONCURRENCY = max(
+    1, int(os.getenv("STELAE_STREAMABLE_SSE_POOL_MAX_CONCURRENCY", "8"))
+)
+SSE_POOL_BACKOFF = float(os.getenv("STELAE_STREAMABLE_SSE_POOL_BACKOFF", "0.5"))
+SSE_POOL_MAX_BACKOFF = float(
+    os.getenv("STELAE_STREAMABLE_SSE_POOL_MAX_BACKOFF", "30.0")
+)
+CATALOG_CACHE_TTL = max(
+    0.0, float(os.getenv("STELAE_STREAMABLE_CATALOG_TTL", "30.0"))
+)
 
 DEFAULT_SEARCH_PATHS: Sequence[str] = tuple(
     part.strip() for part in SEARCH_PATHS_ENV.split(",") if part.strip()
@@ -145,7 +185,7 @@ MANAGE_TOOL_DESCRIPTOR: Dict[str, Any] = {
         "properties": {
             "operation": {
                 "type": "string",
-                "description": "Operation enum such as discover_servers, install_server, remove_server, run_reconciler.",
+                "description": "Operation enum such as discover_servers, install_server, remove_server, run_reconciler, batch.",
             },
             "params": {
                 "type": "object",
@@ -297,13 +337,189 @@ class CallResult:
         return cls(content=text_content, structured_content=result.structuredContent)
 
 
-async def _call_upstream_tool(
+_STREAM_CLOSED_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+class UpstreamSession:
+    """Initialized SSE session to one proxy server, kept warm between calls.
+
+    The SSE transport and ClientSession context managers must be entered and
+    exited by the same task, so a background task owns them and callers share
+    the initialized session. A dead stream is replaced on the next call, with
+    exponential backoff between failed connection attempts.
+    """
+
+    def __init__(self, server_name: str) -> None:
+        self.server_name = server_name
+        self.endpoint = f"{PROXY_BASE}/{server_name}/sse"
+        self._session: ClientSession | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stop: asyncio.Event | None = None
+        self._connect_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(SSE_POOL_MAX_CONCURRENCY)
+        self._failures = 0
+        self._retry_at = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self._session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def _serve(self, ready: asyncio.Future[ClientSession], stop: asyncio.Event) -> None:
+        try:
+            async with sse_client(
+                self.endpoint,
+                timeout=SSE_TIMEOUT,
+                sse_read_timeout=SSE_POOL_STREAM_TIMEOUT,
+            ) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    self._session = session
+                    ready.set_result(session)
+                    await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as exc:
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                LOGGER.info("Upstream SSE session for %s closed: %s", self.server_name, exc)
+        finally:
+            self._session = None
+
+    async def _acquire(self) -> ClientSession:
+        if self.connected:
+            return self._session  # type: ignore[return-value]
+        async with self._connect_lock:
+            if self.connected:
+                return self._session  # type: ignore[return-value]
+            delay = self._retry_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            loop = asyncio.get_running_loop()
+            ready: asyncio.Future[ClientSession] = loop.create_future()
+            self._stop = asyncio.Event()
+            self._task = loop.create_task(self._serve(ready, self._stop))
+            try:
+                session = await ready
+            except Exception:
+                self._failures += 1
+                backoff = SSE_POOL_BACKOFF * (2 ** (self._failures - 1))
+                self._retry_at = time.monotonic() + min(backoff, SSE_POOL_MAX_BACKOFF)
+                raise
+            self._failures = 0
+            self._retry_at = 0.0
+            return session
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        *,
+        read_timeout: float,
+        idempotent: bool = False,
+    ) -> types.CallToolResult:
+        """Call `tool_name` on the pooled session, reconnecting once if it died.
+
+        A stream that was already closed never received the request, so that call
+        is always retried. A connection that closes mid-call may have run the tool,
+        so that retry is limited to `idempotent` calls.
+        """
+
+        timeout = timedelta(seconds=read_timeout)
+        async with self._slots:
+            session = await self._acquire()
+            try:
+                return await session.call_tool(tool_name, arguments, read_timeout_seconds=timeout)
+            except _STREAM_CLOSED_ERRORS:
+                pass
+            except McpError as exc:
+                if exc.error.code != types.CONNECTION_CLOSED:
+                    raise
+                if not idempotent:
+                    await self._discard(session)
+                    raise
+            await self._discard(session)
+            session = await self._acquire()
+            return await session.call_tool(tool_name, arguments, read_timeout_seconds=timeout)
+
+    async def _discard(self, failed: ClientSession) -> None:
+        """Reset after `failed` died, unless another caller already replaced it."""
+
+        async with self._connect_lock:
+            if self._session is failed or not self.connected:
+                await self.reset()
+
+    async def reset(self) -> None:
+        task, stop = self._task, self._stop
+        self._task = None
+        self._stop = None
+        self._session = None
+        if stop is not None:
+            stop.set()
+        if task is not None and not task.done():
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):  # pragma: no cover - teardown noise
+                pass
+
+
+_UPSTREAM_SESSIONS: Dict[str, UpstreamSession] = {}
+_UPSTREAM_SESSIONS_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def _upstream_session(server_name: str) -> UpstreamSession:
+    global _UPSTREAM_SESSIONS_LOOP
+    loop = _current_loop()
+    if _UPSTREAM_SESSIONS_LOOP is not loop:
+        _discard_upstream_sessions(list(_UPSTREAM_SESSIONS.values()), _UPSTREAM_SESSIONS_LOOP)
+        _UPSTREAM_SESSIONS.clear()
+        _UPSTREAM_SESSIONS_LOOP = loop
+    pooled = _UPSTREAM_SESSIONS.get(server_name)
+    if pooled is None:
+        pooled = UpstreamSession(server_name)
+        _UPSTREAM_SESSIONS[server_name] = pooled
+    return pooled
+
+
+def _discard_upstream_sessions(
+    sessions: Sequence[UpstreamSession], loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Reset sessions left behind by another loop, on the loop that owns their tasks."""
+
+    if not sessions:
+        return
+    if loop is not None and not loop.is_closed():
+        for pooled in sessions:
+            asyncio.run_coroutine_threadsafe(pooled.reset(), loop)
+        return
+    # As with the proxy client: the loop took the streams and tasks down with it.
+    LOGGER.debug("Dropping %d upstream sessions whose event loop has closed", len(sessions))
+
+
+async def _close_upstream_sessions() -> None:
+    sessions = list(_UPSTREAM_SESSIONS.values())
+    _UPSTREAM_SESSIONS.clear()
+    for pooled in sessions:
+        await pooled.reset()
+
+
+async def _call_upstream_tool_once(
     server_name: str,
     tool_name: str,
     arguments: Dict[str, Any],
     *,
-    read_timeout: float = SSE_READ_TIMEOUT,
-) -> CallResult:
+    read_timeout: float,
+) -> types.CallToolResult:
     endpoint = f"{PROXY_BASE}/{server_name}/sse"
     async with sse_client(
         endpoint, timeout=SSE_TIMEOUT, sse_read_timeout=read_timeout
@@ -313,10 +529,30 @@ async def _call_upstream_tool(
     ):
         async with ClientSession(read_stream, write_stream) as session:
             await session.initialize()
-            result = await session.call_tool(tool_name, arguments)
-            if result.isError:
-                raise RuntimeError(f"{server_name}.{tool_name} returned an error")
-            return CallResult.from_call_tool_result(result)
+            return await session.call_tool(tool_name, arguments)
+
+
+async def _call_upstream_tool(
+    server_name: str,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    *,
+    read_timeout: float = SSE_READ_TIMEOUT,
+    idempotent: bool = False,
+) -> CallResult:
+    """Call a proxied tool; pass `idempotent=True` only for calls safe to repeat."""
+
+    if SSE_POOL_ENABLED:
+        result = await _upstream_session(server_name).call_tool(
+            tool_name, arguments, read_timeout=read_timeout, idempotent=idempotent
+        )
+    else:
+        result = await _call_upstream_tool_once(
+            server_name, tool_name, arguments, read_timeout=read_timeout
+        )
+    if result.isError:
+        raise RuntimeError(f"{server_name}.{tool_name} returned an error")
+    return CallResult.from_call_tool_result(result)
 
 
 def _coerce_paths(
@@ -347,6 +583,8 @@ def _relative_repo_path(file_path: str) -> str:
 _RPC_COUNTER = itertools.count(1)
 _PROMPT_DESCRIPTIONS: dict[str, str | None] = {}
 PROXY_MODE = False
+_PROXY_CLIENT: httpx.AsyncClient | None = None
+_PROXY_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
 
 
 def _next_rpc_id(method: str) -> str:
@@ -414,11 +652,151 @@ def _proxy_jsonrpc_sync(
         raise RuntimeError(f"Proxy {method} request failed: {exc}") from exc
 
 
+def _http2_available() -> bool:
+    return PROXY_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def _build_proxy_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=PROXY_MAX_CONNECTIONS,
+        max_keepalive_connections=PROXY_MAX_KEEPALIVE,
+        keepalive_expiry=PROXY_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=_build_timeout(),
+        limits=limits,
+        http2=_http2_available(),
+        follow_redirects=True,
+    )
+
+
+def _current_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _get_proxy_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled proxy client, rebuilding it per event loop."""
+
+    global _PROXY_CLIENT, _PROXY_CLIENT_LOOP
+    loop = _current_loop()
+    if _PROXY_CLIENT is None or _PROXY_CLIENT.is_closed or _PROXY_CLIENT_LOOP is not loop:
+        # Pooled connections are bound to the loop that opened them, so a new loop
+        # (tests, transport restarts) gets a fresh pool instead of a broken one.
+        if _PROXY_CLIENT is not None and not _PROXY_CLIENT.is_closed:
+            _discard_proxy_client(_PROXY_CLIENT, _PROXY_CLIENT_LOOP)
+        _PROXY_CLIENT = _build_proxy_client()
+        _PROXY_CLIENT_LOOP = loop
+    return _PROXY_CLIENT
+
+
+def _discard_proxy_client(
+    client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Close a client left behind by another loop, on the loop that owns it."""
+
+    if loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    # Its loop is gone and took the connections' transports with it; nothing can
+    # await aclose() any more, so just drop the reference.
+    LOGGER.debug("Dropping proxy client whose event loop has closed")
+
+
+async def _close_proxy_client() -> None:
+    global _PROXY_CLIENT, _PROXY_CLIENT_LOOP
+    client = _PROXY_CLIENT
+    _PROXY_CLIENT = None
+    _PROXY_CLIENT_LOOP = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+NotificationHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _decode_rpc_body(method: str, body: bytes | str) -> Dict[str, Any]:
+    try:
+        decoded = json.loads(body)
+    except ValueError as exc:
+        preview = _debug_snapshot(
+            body.decode("utf-8", errors="replace") if isinstance(body, bytes) else body,
+            limit=DEBUG_RPC_PREVIEW,
+        )
+        LOGGER.error(
+            "Proxy %s returned non-JSON payload (%s). Preview: %s",
+            method,
+            exc,
+            preview,
+        )
+        raise RuntimeError(f"Proxy {method} returned invalid JSON: {exc}") from exc
+    if not isinstance(decoded, dict):
+        raise RuntimeError(f"Proxy {method} returned unexpected payload shape")
+    return decoded
+
+
+async def _read_json_response(method: str, response: httpx.Response) -> Dict[str, Any]:
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body.extend(chunk)
+        if len(body) > PROXY_MAX_RESPONSE_BYTES:
+            raise RuntimeError(
+                f"Proxy {method} response exceeded {PROXY_MAX_RESPONSE_BYTES} bytes"
+            )
+    return _decode_rpc_body(method, bytes(body))
+
+
+async def _read_sse_response(
+    method: str,
+    request_id: str,
+    response: httpx.Response,
+    on_notification: NotificationHandler | None,
+) -> Dict[str, Any]:
+    """Consume an SSE JSON-RPC response, forwarding notifications as they arrive.
+
+    Only the event being assembled is held in memory; notifications are handed
+    to `on_notification` and dropped, and the stream stops at the matching response.
+    """
+
+    data_lines: list[str] = []
+    size = 0
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            chunk = line[5:].lstrip(" ")
+            size += len(chunk)
+            if size > PROXY_MAX_RESPONSE_BYTES:
+                raise RuntimeError(
+                    f"Proxy {method} event exceeded {PROXY_MAX_RESPONSE_BYTES} bytes"
+                )
+            data_lines.append(chunk)
+            continue
+        if line or not data_lines:
+            continue
+        message = _decode_rpc_body(method, "\n".join(data_lines))
+        data_lines = []
+        size = 0
+        if message.get("id") == request_id and ("result" in message or "error" in message):
+            return message
+        if "method" in message and on_notification is not None:
+            try:
+                await on_notification(message)
+            except Exception as exc:  # pragma: no cover - client went away
+                LOGGER.warning("Failed to forward %s notification: %s", message.get("method"), exc)
+    if data_lines:
+        message = _decode_rpc_body(method, "\n".join(data_lines))
+        if message.get("id") == request_id:
+            return message
+    raise RuntimeError(f"Proxy {method} stream ended without a response")
+
+
 async def _proxy_jsonrpc(
     method: str,
     params: Dict[str, Any] | None = None,
     *,
     read_timeout: float | None = None,
+    on_notification: NotificationHandler | None = None,
 ) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "jsonrpc": "2.0",
@@ -428,28 +806,91 @@ async def _proxy_jsonrpc(
     if params:
         payload["params"] = params
     timeout = _build_timeout(read_timeout)
+    client = _get_proxy_client()
+    headers = {"Accept": "application/json, text/event-stream"} if PROXY_STREAM_RESPONSES else None
     try:
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            response = await client.post(f"{PROXY_BASE}/mcp", json=payload)
+        async with client.stream(
+            "POST", f"{PROXY_BASE}/mcp", json=payload, timeout=timeout, headers=headers
+        ) as response:
             response.raise_for_status()
-            try:
-                decoded = response.json()
-            except ValueError as exc:
-                preview = _debug_snapshot(response.text, limit=DEBUG_RPC_PREVIEW)
-                LOGGER.error(
-                    "Proxy %s returned non-JSON payload (%s). Preview: %s",
-                    method,
-                    exc,
-                    preview,
-                )
-                raise RuntimeError(
-                    f"Proxy {method} returned invalid JSON: {exc}"
-                ) from exc
-            return _extract_result(method, decoded)
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                decoded = await _read_sse_response(method, payload["id"], response, on_notification)
+            else:
+                decoded = await _read_json_response(method, response)
+        return _extract_result(method, decoded)
     except httpx.HTTPError as exc:
         raise RuntimeError(f"Proxy {method} request failed: {exc}") from exc
 
 
+@dataclass
+class _Flight:
+    """One in-flight upstream request that identical callers wait on."""
+
+    done: anyio.Event
+    result: Dict[str, Any] | None = None
+    error: Exception | None = None
+    cancelled: bool = False
+
+
+_INFLIGHT: dict[str, _Flight] = {}
+
+
+def _singleflight_key(method: str, params: Dict[str, Any] | None) -> str:
+    canonical = json.dumps(
+        params or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return f"{method}\0{canonical}"
+
+
+async def _coalesced_jsonrpc(
+    method: str,
+    params: Dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Share one upstream request between identical concurrent callers (singleflight).
+
+    Followers wait for the leader's outcome and share its result, so callers must
+    treat it as read-only. If the leader is cancelled, a follower takes over.
+    """
+
+    if not PROXY_COALESCE:
+        return await _proxy_jsonrpc(method, params, **kwargs)
+    key = _singleflight_key(method, params)
+    while (flight := _INFLIGHT.get(key)) is not None:
+        await flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        if not flight.cancelled:
+            assert flight.result is not None
+            return flight.result
+    flight = _Flight(done=anyio.Event())
+    _INFLIGHT[key] = flight
+    try:
+        flight.result = await _proxy_jsonrpc(method, params, **kwargs)
+        return flight.result
+    except Exception as exc:
+        flight.error = exc
+        raise
+    except BaseException:
+        flight.cancelled = True
+        raise
+    finally:
+        if _INFLIGHT.get(key) is flight:
+            del _INFLIGHT[key]
+        flight.done.set()
+
+
+def _tool_is_read_only(name: str) -> bool:
+    cache = _TOOL_CATALOG
+    if cache is None:
+        return False
+    for tool in cache.tools:
+        if tool.name == name:
+            return bool(tool.annotations is not None and tool.annotations.readOnlyHint)
+    return False
+
+
 def _normalize_input_schema(schema: Any) -> Dict[str, Any]:
     if isinstance(schema, dict):
         return schema
@@ -612,10 +1053,137 @@ def _convert_prompt_message(payload: Dict[str, Any]) -> types.PromptMessage:
     return types.PromptMessage.model_validate(message_data)
 
 
+@dataclass(slots=True)
+class _ToolCatalogCache:
+    """Converted proxy catalog plus the fingerprints used to invalidate it."""
+
+    tools: List[types.Tool]
+    digest: str
+    fetched_at: float
+    intended_mtime: float | None
+
+
+_TOOL_CATALOG: _ToolCatalogCache | None = None
+_TOOL_CATALOG_LOCK: anyio.Lock | None = None
+_CATALOG_SESSIONS: weakref.WeakSet[ServerSession] = weakref.WeakSet()
+
+
+def _intended_catalog_path() -> Path | None:
+    override = os.getenv("INTENDED_CATALOG_PATH")
+    if override:
+        return Path(override).expanduser()
+    try:
+        return state_home() / "intended_catalog.json"
+    except ValueError:
+        return None
+
+
+def _intended_catalog_mtime() -> float | None:
+    path = _intended_catalog_path()
+    if path is None:
+        return None
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _catalog_digest(raw_tools: Any) -> str:
+    serialized = json.dumps(raw_tools, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _catalog_is_fresh(cache: _ToolCatalogCache, intended_mtime: float | None) -> bool:
+    if CATALOG_CACHE_TTL <= 0 or cache.intended_mtime != intended_mtime:
+        return False
+    return time.monotonic() - cache.fetched_at < CATALOG_CACHE_TTL
+
+
+def _reset_tool_catalog() -> None:
+    global _TOOL_CATALOG, _TOOL_CATALOG_LOCK
+    _TOOL_CATALOG = None
+    _TOOL_CATALOG_LOCK = None
+
+
+def _catalog_lock() -> anyio.Lock:
+    global _TOOL_CATALOG_LOCK
+    if _TOOL_CATALOG_LOCK is None:
+        _TOOL_CATALOG_LOCK = anyio.Lock()
+    return _TOOL_CATALOG_LOCK
+
+
+def _track_session(server: Server) -> None:
+    """Remember the calling client so catalog changes can be pushed to it."""
+
+    try:
+        session = server.request_context.session
+    except LookupError:
+        return
+    _CATALOG_SESSIONS.add(session)
+
+
+async def _notify_tool_list_changed() -> None:
+    for session in list(_CATALOG_SESSIONS):
+        try:
+            await session.send_tool_list_changed()
+        except Exception as exc:  # pragma: no cover - closed transports are expected
+            LOGGER.debug("Dropping session after list_changed failure: %s", exc)
+            _CATALOG_SESSIONS.discard(session)
+
+
+async def _load_tool_catalog(*, force: bool = False) -> List[types.Tool]:
+    """Return the converted proxy catalog, refreshing it when a fingerprint moved."""
+
+    global _TOOL_CATALOG
+    intended_mtime = _intended_catalog_mtime()
+    cache = _TOOL_CATALOG
+    if not force and cache is not None and _catalog_is_fresh(cache, intended_mtime):
+        return cache.tools
+    async with _catalog_lock():
+        cache = _TOOL_CATALOG
+        if not force and cache is not None and _catalog_is_fresh(cache, intended_mtime):
+            return cache.tools
+        result = await _coalesced_jsonrpc("tools/list")
+        raw_tools = result.get("tools")
+        digest = _catalog_digest(raw_tools)
+        now = time.monotonic()
+        if cache is not None and cache.digest == digest:
+            cache.fetched_at = now
+            cache.intended_mtime = intended_mtime
+            return cache.tools
+        tools = _convert_tool_catalog(raw_tools)
+        _TOOL_CATALOG = _ToolCatalogCache(
+            tools=tools,
+            digest=digest,
+            fetched_at=now,
+            intended_mtime=intended_mtime,
+        )
+    if cache is not None:
+        LOGGER.debug("Proxy tool catalog changed (%d tools); notifying clients", len(tools))
+        await _notify_tool_list_changed()
+    return tools
+
+
+async def _watch_tool_catalog() -> None:
+    """Poll the proxy catalog so connected clients hear about changes promptly."""
+
+    while True:
+        await anyio.sleep(CATALOG_CACHE_TTL)
+        if not _CATALOG_SESSIONS:
+            continue
+        try:
+            await _load_tool_catalog()
+        except Exception as exc:  # pragma: no cover - proxy restarts are transient
+            LOGGER.warning("Tool catalog refresh failed: %s", exc)
+
+
 async def _proxy_list_tools(self: FastMCP) -> list[types.Tool]:
+    _track_session(self._mcp_server)
+    return list(await _load_tool_catalog())
+
+
+def _convert_tool_catalog(raw_tools: Any) -> List[types.Tool]:
     global _MANAGE_TOOL_AVAILABLE
-    result = await _proxy_jsonrpc("tools/list")
-    raw_tools = result.get("tools")
     tools_by_name: dict[str, types.Tool] = {}
     if isinstance(raw_tools, list):
         for descriptor in raw_tools:
@@ -638,6 +1206,43 @@ async def _proxy_list_tools(self: FastMCP) -> list[types.Tool]:
     return sorted(tools_by_name.values(), key=lambda tool: tool.name)
 
 
+def _client_notification_forwarder() -> tuple[NotificationHandler, str | int | None] | None:
+    """Relay upstream progress/log notifications to the client of the current request.
+
+    Partial output reported through progress messages reaches the client while the
+    tool is still running. Returns None outside a client request (tests, CLI use).
+    """
+
+    try:
+        ctx = app._mcp_server.request_context
+    except (LookupError, AttributeError):
+        return None
+    progress_token = ctx.meta.progressToken if ctx.meta is not None else None
+    session = ctx.session
+    related_id = str(ctx.request_id)
+
+    async def _forward(message: Dict[str, Any]) -> None:
+        method = message.get("method")
+        params = message.get("params") if isinstance(message.get("params"), dict) else {}
+        if method == "notifications/progress" and progress_token is not None:
+            await session.send_progress_notification(
+                progress_token,
+                float(params.get("progress") or 0.0),
+                total=params.get("total"),
+                message=params.get("message"),
+                related_request_id=related_id,
+            )
+        elif method == "notifications/message":
+            await session.send_log_message(
+                level=params.get("level") or "info",
+                data=params.get("data"),
+                logger=params.get("logger"),
+                related_request_id=related_id,
+            )
+
+    return _forward, progress_token
+
+
 async def _proxy_call_tool(
     self: FastMCP,
     name: str,
@@ -645,8 +1250,21 @@ async def _proxy_call_tool(
 ) -> Iterable[types.Content] | tuple[Iterable[types.Content], Dict[str, Any]]:
     if _is_manage_tool(name):
         return await _call_manage_tool(arguments or {})
-    params = {"name": name, "arguments": arguments or {}}
-    result = await _proxy_jsonrpc("tools/call", params, read_timeout=PROXY_CALL_TIMEOUT)
+    params: Dict[str, Any] = {"name": name, "arguments": arguments or {}}
+    forward = _client_notification_forwarder() if PROXY_STREAM_RESPONSES else None
+    if _tool_is_read_only(name) and (forward is None or forward[1] is None):
+        # Identical read-only calls share one upstream request. A caller that asked
+        # for progress keeps its own request so the updates reach its client.
+        result = await _coalesced_jsonrpc("tools/call", params, read_timeout=PROXY_CALL_TIMEOUT)
+    elif forward is None:
+        result = await _proxy_jsonrpc("tools/call", params, read_timeout=PROXY_CALL_TIMEOUT)
+    else:
+        handler, progress_token = forward
+        if progress_token is not None:
+            params["_meta"] = {"progressToken": progress_token}
+        result = await _proxy_jsonrpc(
+            "tools/call", params, read_timeout=PROXY_CALL_TIMEOUT, on_notification=handler
+        )
     debug_hit = DEBUG_ALL_TOOLS
     if not debug_hit and DEBUG_TOOLS:
         normalized = name.split("__")[-1]
@@ -687,7 +1305,7 @@ async def _proxy_call_tool(
 
 
 async def _proxy_list_prompts(self: FastMCP) -> list[types.Prompt]:
-    result = await _proxy_jsonrpc("prompts/list")
+    result = await _coalesced_jsonrpc("prompts/list")
     raw_prompts = result.get("prompts")
     prompts: list[types.Prompt] = []
     _PROMPT_DESCRIPTIONS.clear()
@@ -730,7 +1348,7 @@ async def _proxy_get_prompt(
 
 
 async def _proxy_list_resources(self: FastMCP) -> list[types.Resource]:
-    result = await _proxy_jsonrpc("resources/list")
+    result = await _coalesced_jsonrpc("resources/list")
     raw_resources = result.get("resources")
     resources: list[types.Resource] = []
     if isinstance(raw_resources, list):
@@ -749,7 +1367,7 @@ async def _proxy_list_resources(self: FastMCP) -> list[types.Resource]:
 async def _proxy_read_resource(
     self: FastMCP, uri: str
 ) -> Iterable[types.ResourceContents]:
-    result = await _proxy_jsonrpc("resources/read", {"uri": uri})
+    result = await _coalesced_jsonrpc("resources/read", {"uri": uri})
     raw_contents = result.get("contents")
     contents: list[types.ResourceContents] = []
     if isinstance(raw_contents, list):
@@ -769,6 +1387,20 @@ async def _proxy_list_resource_templates(self: FastMCP) -> list[types.ResourceTe
     return []
 
 
+def _proxy_initialization_options(
+    self: Server,
+    notification_options: NotificationOptions | None = None,
+    experimental_capabilities: Dict[str, Dict[str, Any]] | None = None,
+):
+    """Advertise tools.listChanged so clients accept catalog change pushes."""
+
+    return Server.create_initialization_options(
+        self,
+        notification_options or NotificationOptions(tools_changed=True),
+        experimental_capabilities,
+    )
+
+
 def _activate_proxy_handlers() -> None:
     app.list_tools = MethodType(_proxy_list_tools, app)
     app.call_tool = MethodType(_proxy_call_tool, app)
@@ -779,6 +1411,7 @@ def _activate_proxy_handlers() -> None:
     app.list_resource_templates = MethodType(_proxy_list_resource_templates, app)
 
     server = app._mcp_server
+    server.create_initialization_options = MethodType(_proxy_initialization_options, server)
     server.list_tools()(app.list_tools)
     server.call_tool(validate_input=False)(app.call_tool)
     server.list_prompts()(app.list_prompts)
@@ -859,6 +1492,14 @@ def _initialize_bridge() -> None:
         _register_fallback_tools()
 
 
+def _index_can_answer(query: str, paths: Sequence[str | os.PathLike[str]]) -> bool:
+    """The index handles literal patterns over the whole search root only."""
+
+    if not trigram.is_literal(query):
+        return False
+    return [Path(path).resolve() for path in paths] == [SEARCH_ROOT]
+
+
 async def search(
     query: str,
     max_results: int = SEARCH_MAX_RESULTS,
@@ -888,7 +1529,32 @@ async def search(
         "ignore_case": ignore_case,
     }
 
-    upstream = await _call_upstream_tool("rg", "grep", arguments)
+    if SEARCH_INDEX_ENABLED and _index_can_answer(query, effective_paths):
+        # Same semantics as the recursive grep: every matching line (up to
+        # max_results), ignored and hidden files included, within the call timeout.
+        index = trigram.shared_index(SEARCH_ROOT, respect_ignore=False)
+        deadline = time.perf_counter() + PROXY_CALL_TIMEOUT
+        found, _ = await anyio.to_thread.run_sync(
+            lambda: index.search(
+                query,
+                max_results=max_results,
+                deadline=deadline,
+                ignore_case=ignore_case,
+                per_file=max_results,
+            )
+        )
+        results = [
+            {
+                "id": f"repo:{item.path}#L{item.line}",
+                "title": item.path,
+                "url": f"stelae://repo/{item.path}#L{item.line}",
+                "metadata": {"snippet": item.text},
+            }
+            for item in found
+        ]
+        return json.dumps({"results": results}, ensure_ascii=False)
+
+    upstream = await _call_upstream_tool("rg", "grep", arguments, idempotent=True)
 
     matches: List[Dict[str, Any]] = []
     for content in upstream.content:
@@ -942,6 +1608,7 @@ async def _maybe_refetch_raw(
                 "raw": True,
             },
             read_timeout=180.0,
+            idempotent=True,
         )
         for content in fallback.content:
             if content.text:
@@ -975,7 +1642,7 @@ async def fetch(
         "raw": raw,
     }
     upstream = await _call_upstream_tool(
-        "fetch", "fetch", proxy_arguments, read_timeout=180.0
+        "fetch", "fetch", proxy_arguments, read_timeout=180.0, idempotent=True
     )
 
     payload_text = ""
@@ -1025,6 +1692,30 @@ async def fetch(
     return json.dumps(data, ensure_ascii=False)
 
 
+_TRANSPORT_RUNNERS = {
+    "stdio": "run_stdio_async",
+    "sse": "run_sse_async",
+    "streamable-http": "run_streamable_http_async",
+}
+
+
+async def _serve_transport(transport: str) -> None:
+    """Run the FastMCP transport and release pooled proxy connections on exit."""
+
+    runner_name = _TRANSPORT_RUNNERS.get(transport)
+    if runner_name is None:
+        raise ValueError(f"Unknown transport: {transport}")
+    try:
+        async with anyio.create_task_group() as group:
+            if PROXY_MODE and CATALOG_CACHE_TTL > 0:
+                group.start_soon(_watch_tool_catalog)
+            await getattr(app, runner_name)()
+            group.cancel_scope.cancel()
+    finally:
+        await _close_upstream_sessions()
+        await _close_proxy_client()
+
+
 def run() -> None:
     _initialize_bridge()
     LOGGER.info(
@@ -1054,7 +1745,7 @@ def run() -> None:
         else:
             LOGGER.info("Emitted server ready notification")
     try:
-        app.run(transport=TRANSPORT)
+        anyio.run(_serve_transport, TRANSPORT)
     except Exception:  # pragma: no cover - surfaced for operational diagnostics
         LOGGER.exception("FastMCP transport %s crashed", TRANSPORT)
         raise
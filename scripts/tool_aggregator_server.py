@@ -3,14 +3,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import itertools
 import json
 import logging
 import os
 import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Mapping
 
+import anyio
 import httpx
 from mcp.server import FastMCP
 from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
@@ -20,6 +24,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from stelae_lib.config_overlays import config_home, require_home_path, runtime_path, state_home
+from stelae_lib.integrator.backpressure import ConcurrencyLimits
+from stelae_lib.integrator.result_cache import ToolResultCache
 from stelae_lib.integrator.stateful_runner import StatefulAggregatedToolRunner
 from stelae_lib.integrator.tool_aggregations import (
     AggregatedToolDefinition,
@@ -61,6 +67,10 @@ _SCHEMA_PATH = Path(
 )
 _PROXY_BASE_ENV = os.getenv("STELAE_PROXY_BASE")
 _DEFAULT_PROXY = "http://127.0.0.1:9090"
+_MAX_CONNECTIONS = max(1, int(os.getenv("STELAE_TOOL_AGGREGATOR_MAX_CONNECTIONS", "50")))
+_MAX_KEEPALIVE = max(0, int(os.getenv("STELAE_TOOL_AGGREGATOR_MAX_KEEPALIVE", "10")))
+_KEEPALIVE_EXPIRY = float(os.getenv("STELAE_TOOL_AGGREGATOR_KEEPALIVE_EXPIRY", "30.0"))
+_MAX_CONCURRENCY = max(1, int(os.getenv("STELAE_TOOL_AGGREGATOR_MAX_CONCURRENCY", "32")))
 _WORKSPACE_ROOT = Path(os.getenv("STELAE_DIR", ROOT)).resolve()
 _STATE_HOME = state_home()
 _STATE_CONTEXT = {
@@ -149,16 +159,52 @@ class PassthroughFuncMetadata(FuncMetadata):
         return result
 
 
+@dataclass
+class LatencyStats:
+    """Running latency counters for one downstream tool."""
+
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, elapsed: float, *, ok: bool) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        mean = self.total_seconds / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "meanMs": round(mean * 1000, 3),
+            "maxMs": round(self.max_seconds * 1000, 3),
+        }
+
+
 class ProxyCaller:
-    def __init__(self, base_url: str) -> None:
-        endpoint = base_url.strip()
-        if not endpoint:
-            endpoint = _DEFAULT_PROXY
-        if endpoint.endswith("/mcp"):
-            self.endpoint = endpoint
-        else:
-            self.endpoint = endpoint.rstrip("/") + "/mcp"
+    """Pooled JSON-RPC caller shared by every aggregation that targets one proxy."""
+
+    def __init__(self, base_url: str, *, max_concurrency: int = _MAX_CONCURRENCY) -> None:
+        self.endpoint = _normalize_endpoint(base_url)
         self._counter = itertools.count(1)
+        self._max_concurrency = max_concurrency
+        self._slots: asyncio.Semaphore | None = None
+        self._client: httpx.AsyncClient | None = None
+        self.stats: Dict[str, LatencyStats] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = _build_http_client()
+        return self._client
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_concurrency)
+        return self._slots
 
     async def __call__(
         self,
@@ -186,21 +232,85 @@ class ProxyCaller:
             read=timeout_value,
             write=timeout_value,
         )
-        try:
-            async with httpx.AsyncClient(timeout=http_timeout) as client:
-                response = await client.post(self.endpoint, json=payload)
+        stats_key = f"{server_name}.{tool_name}" if server_name else tool_name
+        ok = False
+        async with self._get_slots():
+            started = time.perf_counter()
+            try:
+                response = await self._get_client().post(
+                    self.endpoint, json=payload, timeout=http_timeout
+                )
                 response.raise_for_status()
                 body = response.json()
-        except httpx.HTTPError as exc:  # pragma: no cover - network edge cases
-            raise ToolAggregationError(f"Proxy call failed for {tool_name}: {exc}") from exc
+                ok = "error" not in body
+            except httpx.HTTPError as exc:  # pragma: no cover - network edge cases
+                raise ToolAggregationError(f"Proxy call failed for {tool_name}: {exc}") from exc
+            finally:
+                elapsed = time.perf_counter() - started
+                self.stats.setdefault(stats_key, LatencyStats()).record(elapsed, ok=ok)
         if "error" in body:
             raise ToolAggregationError(
                 f"Proxy reported error for {tool_name}: {json.dumps(body['error'])}"
             )
         return body.get("result", {})
 
+    def latency_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: stats.snapshot() for key, stats in sorted(self.stats.items())}
+
+    async def aclose(self) -> None:
+        client = self._client
+        self._client = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+def _normalize_endpoint(base_url: str) -> str:
+    endpoint = base_url.strip()
+    if not endpoint:
+        endpoint = _DEFAULT_PROXY
+    if endpoint.endswith("/mcp"):
+        return endpoint
+    return endpoint.rstrip("/") + "/mcp"
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=_MAX_CONNECTIONS,
+        max_keepalive_connections=_MAX_KEEPALIVE,
+        keepalive_expiry=_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(limits=limits)
+
+
+_PROXY_CALLERS: Dict[str, ProxyCaller] = {}
+_STATEFUL_RUNNERS: list[StatefulAggregatedToolRunner] = []
+_RESULT_CACHE: ToolResultCache | None = None
+_LIMITS: ConcurrencyLimits | None = None
+
+
+def _proxy_caller_for(base_url: str) -> ProxyCaller:
+    """Return the shared caller for a proxy endpoint, creating it on first use."""
+
+    endpoint = _normalize_endpoint(base_url)
+    caller = _PROXY_CALLERS.get(endpoint)
+    if caller is None:
+        caller = ProxyCaller(endpoint)
+        _PROXY_CALLERS[endpoint] = caller
+    return caller
 
 
+async def _close_proxy_callers() -> None:
+    callers = list(_PROXY_CALLERS.values())
+    _PROXY_CALLERS.clear()
+    for caller in callers:
+        if caller.stats:
+            LOGGER.info(
+                "Downstream latency via %s: %s",
+                caller.endpoint,
+                json.dumps(caller.latency_snapshot()),
+            )
+        await caller.aclose()
+
 
 def _load_config() -> ToolAggregationConfig:
     return _load_aggregation_config()
@@ -211,12 +321,18 @@ def _proxy_base_for(aggregation_base: str | None, config: ToolAggregationConfig)
 
 
 def _register_aggregations(config: ToolAggregationConfig) -> None:
+    global _RESULT_CACHE, _LIMITS
     LOGGER.info(
         "Registering %s aggregated tool(s) from %s", len(config.aggregations), _CONFIG_PATH
     )
+    _RESULT_CACHE = ToolResultCache(config.defaults.result_cache_max_bytes)
+    _LIMITS = ConcurrencyLimits(
+        default_server_limit=config.defaults.max_concurrency_per_server,
+        server_limits=config.defaults.server_concurrency,
+    )
     for aggregation in config.aggregations:
         proxy_base = _proxy_base_for(aggregation.proxy_url, config)
-        proxy_caller = ProxyCaller(proxy_base)
+        proxy_caller = _proxy_caller_for(proxy_base)
         if aggregation.state:
             runner = StatefulAggregatedToolRunner(
                 aggregation,
@@ -225,12 +341,17 @@ def _register_aggregations(config: ToolAggregationConfig) -> None:
                 context=_STATE_CONTEXT,
                 workspace_root=_WORKSPACE_ROOT,
                 state_root=_STATE_HOME,
+                result_cache=_RESULT_CACHE,
+                limits=_LIMITS,
             )
+            _STATEFUL_RUNNERS.append(runner)
         else:
             runner = AggregatedToolRunner(
                 aggregation,
                 proxy_caller,
                 fallback_timeout=config.defaults.timeout_seconds,
+                result_cache=_RESULT_CACHE,
+                limits=_LIMITS,
             )
 
         @app.tool(name=aggregation.name, description=aggregation.description)
@@ -254,13 +375,29 @@ def _register_aggregations(config: ToolAggregationConfig) -> None:
         )
 
 
+async def _serve() -> None:
+    try:
+        await app.run_stdio_async()
+    finally:
+        for runner in _STATEFUL_RUNNERS:
+            try:
+                await runner.aclose()
+            except Exception as exc:  # pragma: no cover - best-effort shutdown
+                LOGGER.warning("Failed to flush state for %s: %s", runner.definition.name, exc)
+        if _RESULT_CACHE is not None and (_RESULT_CACHE.hits or _RESULT_CACHE.misses):
+            LOGGER.info("Result cache: %s", json.dumps(_RESULT_CACHE.snapshot()))
+        if _LIMITS is not None and _LIMITS.snapshot():
+            LOGGER.info("Concurrency slots: %s", json.dumps(_LIMITS.snapshot()))
+        await _close_proxy_callers()
+
+
 def main() -> None:
     try:
         config = _load_config()
         _register_aggregations(config)
     except ToolAggregationError as exc:
         raise SystemExit(f"Failed to load tool aggregations: {exc}") from exc
-    app.run()
+    anyio.run(_serve)
 
 
 if __name__ == "__main__":  # pragma: no cover - script entry
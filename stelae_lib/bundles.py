@@ -191,6 +191,7 @@ def install_bundle(
         emit(f"[bundle] {'Would write' if dry_run else 'Wrote'} catalog fragment → {fragment_path}")
     catalog_fragment_path = fragment_path
 
+    targets: list[tuple[str, dict[str, Any]]] = []
     for raw_descriptor in bundle.get("servers", []):
         if not isinstance(raw_descriptor, dict):
             continue
@@ -199,9 +200,20 @@ def install_bundle(
             if filter_set and name:
                 emit(f"[bundle] Skipping '{name}' (filtered)")
             continue
-        emit(f"[bundle] Installing '{name}'…")
-        payload = {"descriptor": raw_descriptor, "dry_run": dry_run, "force": force}
-        result = service.run("install_server", payload)
+        targets.append((name, raw_descriptor))
+
+    payloads = [{"descriptor": raw_descriptor, "dry_run": dry_run, "force": force} for _, raw_descriptor in targets]
+    if isinstance(service, StelaeIntegratorService) and targets:
+        # One batch writes the template/overrides once instead of once per server.
+        emit(f"[bundle] Installing {len(targets)} server(s): {', '.join(name for name, _ in targets)}…")
+        results = _install_batch(service, payloads, dry_run=dry_run)
+    else:
+        results = []
+        for (name, _), payload in zip(targets, payloads):
+            emit(f"[bundle] Installing '{name}'…")
+            results.append(service.run("install_server", payload))
+
+    for (name, raw_descriptor), result in zip(targets, results):
         if result.get("status") != "ok":
             errors.append({"name": name, "error": result})
             emit(f"[bundle] ❌ '{name}' failed: {result}")
@@ -259,6 +271,37 @@ def install_bundle(
     }
 
 
+def _install_batch(
+    service: StelaeIntegratorService,
+    payloads: list[dict[str, Any]],
+    *,
+    dry_run: bool,
+) -> list[dict[str, Any]]:
+    """Install every payload through one non-atomic manage_stelae batch.
+
+    Returns one `install_server`-shaped response per payload so callers can keep
+    their per-server handling.
+    """
+
+    batch = service.run(
+        "batch",
+        {
+            "operations": [{"operation": "install_server", "params": payload} for payload in payloads],
+            "dry_run": dry_run,
+            "atomic": False,
+        },
+    )
+    if batch.get("status") != "ok":
+        return [batch for _ in payloads]
+    results: list[dict[str, Any]] = []
+    for item in (batch.get("details") or {}).get("operations") or []:
+        if item.get("status") == "ok":
+            results.append({"status": "ok", "details": item.get("details") or {}})
+        else:
+            results.append({"status": "error", "errors": [item.get("error")]})
+    return results
+
+
 def _load_bundle_from_dir(directory: Path) -> BundleArtifact:
     catalog_path = directory / BUNDLE_CATALOG_FILENAME
     payload = _normalize_bundle_payload(_read_json(catalog_path))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from stelae_lib.fileio import atomic_write
+
+CACHE_DIRNAME = "catalog-build"
+MISSING_DIGEST = "missing"
+
+# Bump whenever the merge semantics in `load_catalog_store` change so stale
+# checkpoints stop matching instead of replaying an outdated merge.
+_CACHE_VERSION = 1
+_MAX_CHECKPOINTS = 64
+_INDEX_FILENAME = "index.json"
+
+
+@dataclass
+class MergeCheckpoint:
+    """Merged catalog state after applying a prefix of the fragment list."""
+
+    overrides: dict[str, Any]
+    aggregations: dict[str, Any]
+    hide_entries: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_data(self) -> dict[str, Any]:
+        return {
+            "overrides": self.overrides,
+            "aggregations": self.aggregations,
+            "hideEntries": self.hide_entries,
+        }
+
+    @classmethod
+    def from_data(cls, data: Any) -> "MergeCheckpoint | None":
+        if not isinstance(data, dict):
+            return None
+        overrides = data.get("overrides")
+        aggregations = data.get("aggregations")
+        hide_entries = data.get("hideEntries")
+        if not isinstance(overrides, dict) or not isinstance(aggregations, dict) or not isinstance(hide_entries, list):
+            return None
+        return cls(overrides=overrides, aggregations=aggregations, hide_entries=hide_entries)
+
+
+def chain_digest(previous: str, digest: str) -> str:
+    """Fold one fragment digest into the running digest of every fragment before it."""
+
+    return hashlib.sha256(f"{_CACHE_VERSION}:{previous}:{digest}".encode("utf-8")).hexdigest()
+
+
+def payload_digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CatalogBuildCache:
+    """Persisted fragment digests and merge checkpoints for incremental catalog builds.
+
+    Fragment digests are remembered per path alongside the file's mtime and size, so
+    an untouched fragment is never re-read. Checkpoints are addressed by the chained
+    digest of every fragment merged so far; a build resumes from the longest prefix
+    whose checkpoint exists and only re-merges the fragments after it. All I/O is best
+    effort: a cache that cannot be read or written simply falls back to a full merge.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._index_path = root / _INDEX_FILENAME
+        self._files = self._load_index()
+        self._index_dirty = False
+
+    def _load_index(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def fragment_digest(self, path: Path) -> str:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return MISSING_DIGEST
+        key = str(path)
+        cached = self._files.get(key)
+        if (
+            isinstance(cached, dict)
+            and cached.get("mtimeNs") == stat.st_mtime_ns
+            and cached.get("size") == stat.st_size
+            and isinstance(cached.get("sha256"), str)
+        ):
+            return cached["sha256"]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._files[key] = {"mtimeNs": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        self._index_dirty = True
+        return digest
+
+    def _checkpoint_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def load_checkpoint(self, key: str) -> MergeCheckpoint | None:
+        path = self._checkpoint_path(key)
+        try:
+            checkpoint = MergeCheckpoint.from_data(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return None
+        if checkpoint is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return checkpoint
+
+    def store_checkpoint(self, key: str, checkpoint: MergeCheckpoint) -> None:
+        text = json.dumps(checkpoint.to_data(), ensure_ascii=False, separators=(",", ":"))
+        try:
+            atomic_write(self._checkpoint_path(key), text)
+        except OSError:
+            pass
+
+    def save(self) -> None:
+        if self._index_dirty:
+            live = {key: value for key, value in self._files.items() if Path(key).exists()}
+            text = json.dumps({"version": _CACHE_VERSION, "files": live}, indent=2, ensure_ascii=False) + "\n"
+            try:
+                atomic_write(self._index_path, text)
+            except OSError:
+                return
+            self._files = live
+            self._index_dirty = False
+        self._prune()
+
+    def _prune(self) -> None:
+        try:
+            checkpoints = [path for path in self.root.glob("*.json") if path.name != _INDEX_FILENAME]
+            if len(checkpoints) <= _MAX_CHECKPOINTS:
+                return
+            checkpoints.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+            for stale in checkpoints[_MAX_CHECKPOINTS:]:
+                stale.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -1,25 +1,39 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Literal, Mapping, Sequence
 
+from stelae_lib.catalog.build_cache import (
+    CACHE_DIRNAME,
+    CatalogBuildCache,
+    MergeCheckpoint,
+    chain_digest,
+    payload_digest,
+)
 from stelae_lib.catalog_defaults import DEFAULT_CATALOG_FRAGMENT
 from stelae_lib.config_overlays import (
     BUNDLES_DIRNAME,
     CATALOG_DIRNAME,
     config_home,
+    copy_json,
     deep_merge,
     server_enabled,
+    state_home,
     write_json,
 )
 from stelae_lib.integrator.tool_aggregations import merge_aggregation_payload
 
+CATALOG_CACHE_ENV = "STELAE_CATALOG_CACHE"
+
 
-def _copy_payload(value: Any) -> Any:
-    return json.loads(json.dumps(value, ensure_ascii=False))
+@lru_cache(maxsize=1)
+def _embedded_defaults_digest() -> str:
+    return payload_digest(DEFAULT_CATALOG_FRAGMENT)
 
 
 @dataclass(frozen=True)
@@ -27,9 +41,19 @@ class CatalogFragment:
     path: Path
     kind: Literal["catalog", "bundle", "embedded-defaults", "legacy"]
     name: str
-    payload: dict[str, Any]
+    preloaded: dict[str, Any] | None = field(default=None, repr=False, compare=False)
     exists: bool = True
 
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        """Fragment contents, parsed on first access so cached builds can skip the read."""
+
+        if self.preloaded is not None:
+            return self.preloaded
+        if not self.exists:
+            return {}
+        return _load_fragment_payload(self.path)
+
     def to_metadata(self, *, config_root: Path) -> dict[str, Any]:
         metadata = {
             "kind": self.kind,
@@ -87,6 +111,7 @@ def load_catalog_store(
     config_base: Path | None = None,
     include_bundles: bool = True,
     catalog_filenames: Sequence[str] | None = None,
+    use_cache: bool | None = None,
 ) -> CatalogStore:
     home = (config_base or config_home()).expanduser()
     fragments = _discover_fragments(
@@ -94,23 +119,12 @@ def load_catalog_store(
         include_bundles=include_bundles,
         catalog_filter=set(name.strip() for name in catalog_filenames) if catalog_filenames else None,
     )
-    overrides = _copy_payload(DEFAULT_CATALOG_FRAGMENT["tool_overrides"])
-    aggregations = _copy_payload(DEFAULT_CATALOG_FRAGMENT["tool_aggregations"])
-    hide_entries: list[dict[str, Any]] = []
-
-    for fragment in fragments:
-        payload = fragment.payload
-        overrides_payload = payload.get("tool_overrides") or payload.get("toolOverrides")
-        if isinstance(overrides_payload, Mapping):
-            overrides = deep_merge(overrides, overrides_payload)
+    cache = _open_build_cache() if _cache_enabled(use_cache) else None
+    merged = _merge_fragments(fragments, cache)
+    overrides = merged.overrides
+    aggregations = merged.aggregations
 
-        aggregations_payload = payload.get("tool_aggregations") or payload.get("toolAggregations")
-        if isinstance(aggregations_payload, Mapping):
-            aggregations = merge_aggregation_payload(aggregations, aggregations_payload)
-
-        hide_entries.extend(_normalize_hide_tools(payload.get("hide_tools") or payload.get("hideTools"), source=fragment.path))
-
-    hidden = _dedupe_hide_tools(list(aggregations.get("hiddenTools", [])) + hide_entries)
+    hidden = _dedupe_hide_tools(list(aggregations.get("hiddenTools", [])) + merged.hide_entries)
     aggregations["hiddenTools"] = hidden
 
     disabled_servers = {name for name in overrides.get("servers", {}) if not server_enabled(name)}
@@ -134,6 +148,69 @@ def load_catalog_store(
     )
 
 
+def _cache_enabled(use_cache: bool | None) -> bool:
+    if use_cache is not None:
+        return use_cache
+    return os.getenv(CATALOG_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _open_build_cache() -> CatalogBuildCache | None:
+    try:
+        return CatalogBuildCache(state_home() / CACHE_DIRNAME)
+    except (OSError, ValueError):
+        return None
+
+
+def _fragment_digest(fragment: CatalogFragment, cache: CatalogBuildCache) -> str:
+    if fragment.kind == "embedded-defaults":
+        return _embedded_defaults_digest()
+    return cache.fragment_digest(fragment.path)
+
+
+def _merge_fragments(fragments: Sequence[CatalogFragment], cache: CatalogBuildCache | None) -> MergeCheckpoint:
+    """Merge fragments in order, resuming from the longest cached unchanged prefix."""
+
+    chain: list[str] = []
+    state: MergeCheckpoint | None = None
+    start = 0
+    if cache is not None:
+        key = ""
+        for fragment in fragments:
+            key = chain_digest(key, _fragment_digest(fragment, cache))
+            chain.append(key)
+        for index in range(len(chain) - 1, -1, -1):
+            state = cache.load_checkpoint(chain[index])
+            if state is not None:
+                start = index + 1
+                break
+    if state is None:
+        state = MergeCheckpoint(
+            overrides=copy_json(DEFAULT_CATALOG_FRAGMENT["tool_overrides"]),
+            aggregations=copy_json(DEFAULT_CATALOG_FRAGMENT["tool_aggregations"]),
+        )
+
+    for index in range(start, len(fragments)):
+        fragment = fragments[index]
+        payload = fragment.payload
+        overrides_payload = payload.get("tool_overrides") or payload.get("toolOverrides")
+        if isinstance(overrides_payload, Mapping):
+            state.overrides = deep_merge(state.overrides, overrides_payload)
+
+        aggregations_payload = payload.get("tool_aggregations") or payload.get("toolAggregations")
+        if isinstance(aggregations_payload, Mapping):
+            state.aggregations = merge_aggregation_payload(state.aggregations, aggregations_payload)
+
+        state.hide_entries.extend(
+            _normalize_hide_tools(payload.get("hide_tools") or payload.get("hideTools"), source=fragment.path)
+        )
+        if cache is not None:
+            cache.store_checkpoint(chain[index], state)
+
+    if cache is not None:
+        cache.save()
+    return state
+
+
 def _discover_fragments(
     config_root: Path,
     *,
@@ -145,7 +222,7 @@ def _discover_fragments(
             path=config_root / CATALOG_DIRNAME / "_embedded_defaults.json",
             kind="embedded-defaults",
             name="embedded-defaults",
-            payload=_copy_payload(DEFAULT_CATALOG_FRAGMENT),
+            preloaded=copy_json(DEFAULT_CATALOG_FRAGMENT),
             exists=True,
         )
     ]
@@ -177,9 +254,7 @@ def _discover_fragments(
 
 
 def _build_fragment(path: Path, *, kind: Literal["catalog", "bundle"], name: str) -> CatalogFragment:
-    exists = path.exists()
-    payload = _load_fragment_payload(path) if exists else {}
-    return CatalogFragment(path=path, kind=kind, name=name, payload=payload, exists=exists)
+    return CatalogFragment(path=path, kind=kind, name=name, exists=path.exists())
 
 
 def _load_fragment_payload(path: Path) -> dict[str, Any]:
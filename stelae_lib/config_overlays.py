@@ -210,7 +210,7 @@ def ensure_overlay_from_defaults(
     if overlay.exists() and not overwrite:
         return overlay
     ensure_parent(overlay)
-    payload_copy = json.loads(json.dumps(default_payload, ensure_ascii=False))
+    payload_copy = copy_json(default_payload)
     write_json(overlay, payload_copy)
     return overlay
 
@@ -255,23 +255,72 @@ def require_home_path(
     return validated
 
 
+def copy_json(value: Any) -> Any:
+    """Deep-copy a JSON-shaped value.
+
+    Scalars are immutable and returned as-is. Containers are copied through the C
+    encoder/decoder, which beats any pure-Python walk for JSON data, but callers
+    should only use it on subtrees that actually need a private copy.
+    """
+
+    if isinstance(value, (Mapping, list, tuple)):
+        return json.loads(json.dumps(value, ensure_ascii=False))
+    return value
+
+
+def _merge_layers(values: Sequence[Any]) -> Any:
+    # Fold `values` left to right with deep_merge semantics, but only build the
+    # final result: a non-mergeable value discards everything before it, so only
+    # the trailing run of same-kind values is ever copied.
+    start = len(values) - 1
+    while start > 0:
+        previous, current = values[start - 1], values[start]
+        if isinstance(current, Mapping) and isinstance(previous, Mapping):
+            if start - 1 == 0 and not isinstance(previous, dict):
+                break
+        elif not (isinstance(current, list) and isinstance(previous, list)):
+            break
+        start -= 1
+    head = values[start]
+    if start == len(values) - 1:
+        return copy_json(head)
+    if isinstance(head, list):
+        merged: list[Any] = []
+        for value in values[start:]:
+            merged.extend(copy_json(item) for item in value)
+        return merged
+    grouped: dict[Any, list[Any]] = {}
+    for layer in values[start:]:
+        for key, item in layer.items():
+            grouped.setdefault(key, []).append(item)
+    return {key: _merge_layers(items) if len(items) > 1 else copy_json(items[0]) for key, items in grouped.items()}
+
+
+def merge_layers(*layers: Any) -> Any:
+    """Deep-merge any number of layers, materializing the result once.
+
+    ``merge_layers(a, b, c)`` equals ``deep_merge(deep_merge(a, b), c)`` without
+    building (and copying) the intermediate result.
+    """
+
+    if not layers:
+        return None
+    return _merge_layers(layers)
+
+
 def deep_merge(dest: Any, src: Any) -> Any:
-    if isinstance(dest, dict) and isinstance(src, Mapping):
-        result = {key: json.loads(json.dumps(value, ensure_ascii=False)) for key, value in dest.items()}
-        for key, value in src.items():
-            if key in result:
-                result[key] = deep_merge(result[key], value)
-            else:
-                result[key] = json.loads(json.dumps(value, ensure_ascii=False)) if isinstance(value, (dict, list)) else value
-        return result
-    if isinstance(dest, list) and isinstance(src, list):
-        return list(dest) + list(src)
-    return json.loads(json.dumps(src, ensure_ascii=False))
+    """Merge `src` over `dest` and return a fresh copy; neither input is modified.
+
+    Mappings merge key by key, lists concatenate and anything else is replaced by
+    `src`.
+    """
+
+    return _merge_layers((dest, src))
 
 
 def load_json(path: Path, *, default: Any) -> Any:
     if not path.exists():
-        return json.loads(json.dumps(default, ensure_ascii=False))
+        return copy_json(default)
     try:
         return json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
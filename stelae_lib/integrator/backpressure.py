@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Mapping
+
+from .tool_aggregations import LOGGER, DownstreamBusyError
+
+
+@dataclass
+class ConcurrencySlot:
+    """Semaphore with queue-depth counters for one downstream server or aggregation."""
+
+    label: str
+    limit: int
+    in_flight: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    acquired: int = 0
+    rejected: int = 0
+    max_wait_seconds: float = 0.0
+    _semaphore: asyncio.Semaphore | None = field(default=None, repr=False)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    async def acquire(self, deadline: float | None) -> None:
+        semaphore = self._get_semaphore()
+        if not semaphore.locked():
+            await semaphore.acquire()
+            self.in_flight += 1
+            self.acquired += 1
+            return
+        started = time.monotonic()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            if deadline is None:
+                await semaphore.acquire()
+            else:
+                remaining = deadline - started
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(semaphore.acquire(), timeout=remaining)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            # The shutdown summary comes too late to tune limits from, so log the
+            # counters while the slot is still saturated.
+            LOGGER.warning("%s rejected a call: %s", self.label, json.dumps(self.snapshot()))
+            raise DownstreamBusyError(
+                f"{self.label} is saturated: {self.in_flight}/{self.limit} calls in flight and "
+                f"{self.queued - 1} more queued; gave up after waiting "
+                f"{time.monotonic() - started:.2f}s"
+            ) from None
+        finally:
+            self.queued -= 1
+        self.max_wait_seconds = max(self.max_wait_seconds, time.monotonic() - started)
+        self.in_flight += 1
+        self.acquired += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._get_semaphore().release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "maxQueued": self.max_queued,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "maxWaitMs": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class ConcurrencyLimits:
+    """Per-downstream-server and per-aggregation concurrency limits.
+
+    Server slots are shared by every aggregation that targets the server, so one
+    burst cannot monopolise a slow downstream. Callers queue for a slot until the
+    queue budget runs out, then fail with `DownstreamBusyError`.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_server_limit: int | None = None,
+        server_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        self._default_server_limit = default_server_limit
+        self._server_limits = dict(server_limits or {})
+        self._slots: Dict[str, ConcurrencySlot] = {}
+
+    def server_slot(self, server: str | None) -> ConcurrencySlot | None:
+        """Slot for `server`, or None when unlimited.
+
+        Operations without a `downstreamServer` are left to the aggregation limit:
+        the proxy resolves their server per call, and pooling them together would
+        make unrelated servers queue behind each other.
+        """
+
+        if not server:
+            return None
+        limit = self._server_limits.get(server, self._default_server_limit)
+        if not limit:
+            return None
+        key = f"server:{server}"
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = ConcurrencySlot(label=f"Downstream server '{server}'", limit=limit)
+            self._slots[key] = slot
+        return slot
+
+    def aggregation_slot(self, name: str, limit: int | None) -> ConcurrencySlot | None:
+        if not limit:
+            return None
+        key = f"aggregation:{name}"
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = ConcurrencySlot(label=f"Aggregation '{name}'", limit=limit)
+            self._slots[key] = slot
+        return slot
+
+    @asynccontextmanager
+    async def hold(
+        self,
+        *slots: ConcurrencySlot | None,
+        queue_timeout: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold every given slot, in order, within one shared queue budget."""
+
+        deadline = time.monotonic() + queue_timeout if queue_timeout is not None else None
+        async with AsyncExitStack() as stack:
+            for slot in slots:
+                if slot is None:
+                    continue
+                await slot.acquire(deadline)
+                stack.callback(slot.release)
+            yield
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: slot.snapshot() for key, slot in sorted(self._slots.items())}
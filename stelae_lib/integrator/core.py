@@ -6,6 +6,7 @@ import os
 import re
 import shlex
 import shutil
+import threading
 import time
 import urllib.error
 import urllib.request
@@ -30,6 +31,8 @@ from stelae_lib.config_overlays import (
 )
 
 ENV_PATTERN = re.compile(r"\{\{\s*([A-Z0-9_]+)\s*\}\}")
+# Logged by scripts/restart_stelae.sh once its own tools/list probe succeeds.
+READY_LOG_PATTERN = re.compile(r"Tool catalog ready: \d+ tools")
 
 
 def _default_env_files(root: Path) -> list[Path]:
@@ -59,6 +62,20 @@ class IntegratorResponse:
         }
 
 
+def _normalize_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        parts = [part.strip() for part in value.split(",")]
+        return [part for part in parts if part]
+    result_list: List[str] = []
+    for item in value:
+        text = str(item).strip()
+        if text:
+            result_list.append(text)
+    return result_list
+
+
 def _diff_text(path: Path, before: str, after: str) -> str:
     if before == after:
         return ""
@@ -184,8 +201,9 @@ class StelaeIntegratorService:
         self.command_runner = command_runner or CommandRunner(self.root)
         restart_args = os.getenv("STELAE_RESTART_ARGS", "--keep-pm2 --no-bridge --no-cloudflared").strip()
         parsed_restart = shlex.split(restart_args) if restart_args else []
+        # `render-proxy` fans out to independent render targets; -j runs them concurrently.
         self.default_commands: List[List[str]] = [
-            ["make", "render-proxy"],
+            ["make", "-j4", "render-proxy"],
             [str(self.root / "scripts" / "run_restart_stelae.sh"), *parsed_restart],
         ]
         self._one_mcp: OneMCPDiscovery | None = None
@@ -209,6 +227,7 @@ class StelaeIntegratorService:
             "refresh_discovery": self._refresh_discovery,
             "run_reconciler": self._run_reconciler,
             "discover_servers": self._discover_servers,
+            "batch": self._batch,
         }.get(op)
         if not handler:
             raise ValueError(f"Unsupported operation '{operation}'")
@@ -230,12 +249,53 @@ class StelaeIntegratorService:
 
     # operations -----------------------------------------------------------------
     def _list_discovered_servers(self, params: Dict[str, Any]) -> IntegratorResponse:
+        query = str(params.get("query") or "").strip()
+        tags = _normalize_list(params.get("tags"))
+        preset = str(params.get("preset") or "").strip()
+        min_score = params.get("min_score")
+        limit = params.get("limit")
+        if query or tags or preset or min_score is not None or limit is not None:
+            return self._search_discovery_cache(
+                query,
+                tags=tags,
+                preset=preset,
+                min_score=float(min_score) if min_score is not None else None,
+                limit=max(1, int(limit)) if limit is not None else None,
+            )
         entries = [entry.to_summary() for entry in self.discovery_store.entries()]
         return IntegratorResponse(
             status="ok",
             details={"servers": entries, "path": str(self.discovery_path)},
         )
 
+    def _search_discovery_cache(
+        self,
+        query: str,
+        *,
+        tags: List[str],
+        preset: str,
+        min_score: float | None,
+        limit: int | None,
+    ) -> IntegratorResponse:
+        filters = [*tags, preset] if preset else list(tags)
+        matches = self.discovery_store.search(query, filters=filters, min_score=min_score, limit=limit)
+        servers = []
+        for entry, score in matches:
+            summary = entry.to_summary()
+            summary["score"] = score
+            servers.append(summary)
+        details = {
+            "query": query,
+            "source": "local",
+            "results": len(servers),
+            "minScore": min_score,
+            "filters": {"tags": tags, "preset": preset or None},
+            "servers": servers,
+            "path": str(self.discovery_path),
+        }
+        warnings = [] if servers else ["No cached discovery entries matched"]
+        return IntegratorResponse(status="ok", details=details, warnings=warnings)
+
     def _refresh_discovery(self, params: Dict[str, Any]) -> IntegratorResponse:
         source_path = params.get("source_path")
         if source_path:
@@ -267,20 +327,9 @@ class StelaeIntegratorService:
         tags_param = params.get("tags")
         preset = str(params.get("preset") or "").strip()
 
-        def _normalize_list(value: Any) -> List[str]:
-            if value is None:
-                return []
-            if isinstance(value, str):
-                parts = [part.strip() for part in value.split(",")]
-                return [part for part in parts if part]
-            result_list: List[str] = []
-            for item in value:
-                text = str(item).strip()
-                if text:
-                    result_list.append(text)
-            return result_list
-
         tags = _normalize_list(tags_param)
+        if str(params.get("source") or "1mcp").strip().lower() == "local":
+            return self._search_discovery_cache(query, tags=tags, preset=preset, min_score=min_score_val, limit=limit)
         search_terms = [query] if query else []
         search_terms.extend(tags)
         if preset:
@@ -371,9 +420,126 @@ class StelaeIntegratorService:
                 handle.write(f"{key}={value}\n")
 
     def _install_server(self, params: Dict[str, Any]) -> IntegratorResponse:
+        dry_run = bool(params.get("dry_run"))
+        try:
+            details = self._stage_install(params)
+        except Exception:
+            self._reload_template_overrides()
+            raise
+        template_changed = details["templateChanged"]
+        overrides_changed = details["overridesChanged"]
+        files = self._write_staged(template_changed=template_changed, overrides_changed=overrides_changed, dry_run=dry_run)
+        commands: List[Dict[str, Any]] = []
+        should_restart = not dry_run and (template_changed or overrides_changed or bool(params.get("force_restart")))
+        if should_restart:
+            commands = self._run_commands(dry_run=dry_run)
+        details = {"server": details["server"], "dryRun": dry_run, **details}
+        response = IntegratorResponse(status="ok", details=details, files_updated=files, commands_run=commands)
+        self._reload_template_overrides()
+        return response
+
+    def _remove_server(self, params: Dict[str, Any]) -> IntegratorResponse:
+        dry_run = bool(params.get("dry_run"))
+        try:
+            details = self._stage_remove(params)
+        except Exception:
+            self._reload_template_overrides()
+            raise
+        files = self._write_staged(
+            template_changed=details["templateChanged"],
+            overrides_changed=details["overridesChanged"],
+            dry_run=dry_run,
+        )
+        commands: List[Dict[str, Any]] = []
+        if not dry_run:
+            commands = self._run_commands(dry_run=False)
+        details["dryRun"] = dry_run
+        response = IntegratorResponse(status="ok", details=details, files_updated=files, commands_run=commands)
+        self._reload_template_overrides()
+        return response
+
+    def _batch(self, params: Dict[str, Any]) -> IntegratorResponse:
+        """Apply several install/remove operations in memory, then write and restart once.
+
+        With `atomic` (the default) any failing operation aborts the batch before a
+        file is touched. With `atomic: false` failures are reported per operation and
+        the successful ones are still written.
+        """
+
+        items = params.get("operations")
+        if not isinstance(items, list) or not items:
+            raise ValueError("batch requires a non-empty 'operations' list")
+        dry_run = bool(params.get("dry_run"))
+        atomic = bool(params.get("atomic", True))
+        stagers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "install_server": self._stage_install,
+            "remove_server": self._stage_remove,
+        }
+        staged_ops: List[tuple[int, str, Callable[[Dict[str, Any]], Dict[str, Any]], Dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(f"operations[{index}] must be an object")
+            op = str(item.get("operation") or "").strip().lower()
+            stage = stagers.get(op)
+            if stage is None:
+                raise ValueError(f"operations[{index}]: unsupported batch operation '{op}'")
+            item_params = item.get("params") or {}
+            if not isinstance(item_params, dict):
+                raise ValueError(f"operations[{index}].params must be an object")
+            staged_ops.append((index, op, stage, item_params))
+
+        results: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        template_changed = False
+        overrides_changed = False
+        try:
+            for index, op, stage, item_params in staged_ops:
+                # Roll back this item alone so a half-staged change never reaches disk.
+                checkpoint = None if atomic else (self.template.checkpoint(), self.overrides.checkpoint())
+                try:
+                    details = stage(item_params)
+                except Exception as exc:
+                    if checkpoint is not None:
+                        self.template.restore(checkpoint[0])
+                        self.overrides.restore(checkpoint[1])
+                    errors.append(f"operations[{index}] ({op}): {exc}")
+                    results.append({"operation": op, "status": "error", "error": str(exc)})
+                    continue
+                template_changed = template_changed or details["templateChanged"]
+                overrides_changed = overrides_changed or details["overridesChanged"]
+                results.append({"operation": op, "status": "ok", "details": {**details, "dryRun": dry_run}})
+        except BaseException:
+            self._reload_template_overrides()
+            raise
+        if errors and atomic:
+            self._reload_template_overrides()
+            raise ValueError("batch aborted, no files written: " + "; ".join(errors))
+
+        files = self._write_staged(template_changed=template_changed, overrides_changed=overrides_changed, dry_run=dry_run)
+        commands: List[Dict[str, Any]] = []
+        changed = template_changed or overrides_changed
+        if not dry_run and (changed or bool(params.get("force_restart"))):
+            commands = self._run_commands(dry_run=False)
+        details = {
+            "dryRun": dry_run,
+            "atomic": atomic,
+            "templateChanged": template_changed,
+            "overridesChanged": overrides_changed,
+            "operations": results,
+        }
+        response = IntegratorResponse(
+            status="ok",
+            details=details,
+            files_updated=files,
+            commands_run=commands,
+            errors=errors,
+        )
+        self._reload_template_overrides()
+        return response
+
+    def _stage_install(self, params: Dict[str, Any]) -> Dict[str, Any]:
         name = params.get("name") or params.get("server")
         descriptor = params.get("descriptor")
-        dry_run = bool(params.get("dry_run"))
         force = bool(params.get("force"))
         options_override = params.get("options")
         if descriptor:
@@ -400,56 +566,30 @@ class StelaeIntegratorService:
             server_description=entry.description,
             source=entry.source,
         )
-        files: List[Dict[str, Any]] = []
-        if template_changed:
-            files.append(
-                {
-                    "path": str(self.template.path),
-                    "changed": True,
-                    "dryRun": dry_run,
-                    "diff": self.template.diff(),
-                }
-            )
-        if overrides_changed:
-            files.append(
-                {
-                    "path": str(self.overrides.path),
-                    "changed": True,
-                    "dryRun": dry_run,
-                    "diff": self.overrides.diff(),
-                }
-            )
-        commands: List[Dict[str, Any]] = []
-        if not dry_run:
-            if template_changed:
-                self.template.write()
-            if overrides_changed:
-                self.overrides.write()
-        should_restart = not dry_run and (template_changed or overrides_changed or bool(params.get("force_restart")))
-        if should_restart:
-            commands = self._run_commands(dry_run=dry_run)
-        details = {
+        return {
             "server": target_name,
-            "dryRun": dry_run,
             "templateChanged": template_changed,
             "overridesChanged": overrides_changed,
             "toolsSeeded": len(entry.tools),
         }
-        response = IntegratorResponse(status="ok", details=details, files_updated=files, commands_run=commands)
-        self._reload_template_overrides()
-        return response
 
-    def _remove_server(self, params: Dict[str, Any]) -> IntegratorResponse:
+    def _stage_remove(self, params: Dict[str, Any]) -> Dict[str, Any]:
         name = params.get("name")
-        dry_run = bool(params.get("dry_run"))
         if not name:
             raise ValueError("remove_server requires 'name'")
         removed_template = self.template.remove(str(name))
         removed_overrides = self.overrides.remove_server(str(name))
         if not removed_template and not removed_overrides:
             raise ValueError(f"Server '{name}' not found in template or overrides")
+        return {
+            "server": name,
+            "templateChanged": removed_template,
+            "overridesChanged": removed_overrides,
+        }
+
+    def _write_staged(self, *, template_changed: bool, overrides_changed: bool, dry_run: bool) -> List[Dict[str, Any]]:
         files: List[Dict[str, Any]] = []
-        if removed_template:
+        if template_changed:
             files.append(
                 {
                     "path": str(self.template.path),
@@ -458,7 +598,7 @@ class StelaeIntegratorService:
                     "diff": self.template.diff(),
                 }
             )
-        if removed_overrides:
+        if overrides_changed:
             files.append(
                 {
                     "path": str(self.overrides.path),
@@ -468,22 +608,11 @@ class StelaeIntegratorService:
                 }
             )
         if not dry_run:
-            if removed_template:
+            if template_changed:
                 self.template.write()
-            if removed_overrides:
+            if overrides_changed:
                 self.overrides.write()
-        commands: List[Dict[str, Any]] = []
-        if not dry_run:
-            commands = self._run_commands(dry_run=False)
-        details = {
-            "server": name,
-            "templateChanged": removed_template,
-            "overridesChanged": removed_overrides,
-            "dryRun": dry_run,
-        }
-        response = IntegratorResponse(status="ok", details=details, files_updated=files, commands_run=commands)
-        self._reload_template_overrides()
-        return response
+        return files
 
     def _run_reconciler(self, params: Dict[str, Any]) -> IntegratorResponse:
         dry_run = bool(params.get("dry_run"))
@@ -507,8 +636,17 @@ class StelaeIntegratorService:
             return results
         if not self.default_commands:
             return results
+        announced = threading.Event()
+
+        def _watch_output(command: List[str], line: str) -> None:
+            if READY_LOG_PATTERN.search(line):
+                announced.set()
+
         try:
-            executed = self.command_runner.sequence(self.default_commands)
+            if isinstance(self.command_runner, CommandRunner):
+                executed = self.command_runner.sequence(self.default_commands, on_output=_watch_output)
+            else:
+                executed = self.command_runner.sequence(self.default_commands)
         except CommandFailed as exc:
             results.append(
                 {
@@ -529,7 +667,7 @@ class StelaeIntegratorService:
                 }
             )
         if executed:
-            self._await_proxy_ready()
+            self._await_proxy_ready(announced=announced.is_set())
         return results
 
     def _validate_entry(self, entry: DiscoveryEntry) -> None:
@@ -601,17 +739,32 @@ class StelaeIntegratorService:
         tools = result.get("tools")
         return isinstance(tools, list) and len(tools) > 0
 
-    def _await_proxy_ready(self) -> None:
-        deadline = time.time() + self._readiness_timeout
+    def _await_proxy_ready(self, *, announced: bool = False) -> None:
+        """Block until the proxy answers tools/list.
+
+        `announced` means the restart script already logged a successful tools/list
+        of its own, so there is nothing left to wait for. Otherwise probes back off
+        exponentially from 50ms up to the configured interval, so a fast restart is
+        noticed quickly without hammering a slow one.
+        """
+
+        if announced:
+            return
+        deadline = time.monotonic() + self._readiness_timeout
+        delay = min(0.05, self._readiness_interval)
         attempt = 0
-        while time.time() < deadline:
+        while True:
             attempt += 1
             try:
                 if self._readiness_probe():
                     return
             except Exception:
                 pass
-            time.sleep(self._readiness_interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, self._readiness_interval)
         raise RuntimeError(
             f"Proxy at {self.proxy_endpoint} did not become ready within {self._readiness_timeout:.0f}s "
             f"(attempts={attempt})"
@@ -622,7 +775,7 @@ class StelaeIntegratorService:
 
     def _persist_discovery_data(self, data: List[Dict[str, Any]], *, dry_run: bool) -> List[Dict[str, Any]]:
         before = self.discovery_store.text
-        rendered = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+        rendered = self.discovery_store.render(data)
         diff = _diff_text(self.discovery_path, before, rendered)
         files = [
             {
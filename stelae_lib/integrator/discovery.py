@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 from stelae_lib.catalog_defaults import DEFAULT_DISCOVERED_SERVERS
+from stelae_lib.config_overlays import copy_json
 from stelae_lib.fileio import atomic_write, load_json
 
+from .discovery_index import DiscoveryIndex
+
 VALID_TRANSPORTS = {"stdio", "http", "streamable-http", "metadata"}
 TRANSPORT_ALIASES = {
     "sse": "http",
@@ -133,6 +136,7 @@ class DiscoveryEntry:
         options = data.get("options") or {}
         if not isinstance(options, dict):
             raise ValueError("options must be an object when provided")
+        options = dict(options)
         return cls(
             name=name,
             transport=transport,
@@ -198,16 +202,101 @@ class DiscoveryEntry:
         return data
 
 
+_STREAM_CHUNK = 1 << 20
+
+
+def iter_json_array(path: Path, *, chunk_size: int = _STREAM_CHUNK) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the whole file.
+
+    Anything that is not an array yields nothing, matching how the store treats
+    malformed discovery caches.
+    """
+
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as handle:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def _fill() -> None:
+            nonlocal buffer, position, eof
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def _skip(chars: str) -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in chars:
+                    position += 1
+                if position < len(buffer) or eof:
+                    return
+                _fill()
+
+        _skip(" \t\r\n")
+        if position >= len(buffer) or buffer[position] != "[":
+            return
+        position += 1
+        while True:
+            _skip(" \t\r\n,")
+            if position >= len(buffer) or buffer[position] == "]":
+                return
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        return
+                    _fill()
+                    continue
+                # A number cut at the chunk boundary ("12." or "1e") decodes as a
+                # shorter number; only trust a value once a delimiter follows it.
+                follow = end
+                while follow < len(buffer) and buffer[follow] in " \t\r\n":
+                    follow += 1
+                if follow < len(buffer) and buffer[follow] in ",]":
+                    break
+                if eof:
+                    if follow < len(buffer):
+                        return
+                    break
+                _fill()
+            position = end
+            yield value
+
+
+def _render_entry(entry: Any) -> str:
+    # Matches one element of json.dumps(entries, indent=2): JSON strings never
+    # contain raw newlines, so re-indenting line by line is exact.
+    return "  " + json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+
 class DiscoveryStore:
+    """Discovered servers from a base cache plus a writable overlay.
+
+    Entries are indexed by lower-cased name and parsed into `DiscoveryEntry`
+    objects on first use. Rendered overlay entries are cached per name, so saving
+    the overlay only re-serializes entries that actually changed. A BM25 index
+    (`<overlay>.index.json`) answers ranked `search` queries and is updated for the
+    changed names whenever the overlay is saved.
+    """
+
     def __init__(self, base_path: Path, *, overlay_path: Path | None = None):
         self.base_path = base_path
         self.overlay_path = overlay_path or base_path
         self.path = self.overlay_path
-        self._base_text = base_path.read_text(encoding="utf-8") if base_path.exists() else "[]\n"
         self._overlay_text = self.overlay_path.read_text(encoding="utf-8") if self.overlay_path.exists() else "[]\n"
-        self._base_entries = self._parse_entries(self._base_text)
         self._overlay_entries = self._parse_entries(self._overlay_text)
-        self._entries: List[DiscoveryEntry] | None = None
+        if self.overlay_path == base_path:
+            self._base_entries = list(self._overlay_entries)
+        else:
+            self._base_entries = self._load_entries(base_path)
+        self._index: Dict[str, Dict[str, Any]] | None = None
+        self._parsed: Dict[str, DiscoveryEntry | None] = {}
+        self._rendered: Dict[str, tuple[Dict[str, Any], str]] = {}
+        self.index = DiscoveryIndex(self.overlay_path.with_name(f"{self.overlay_path.stem}.index.json"))
 
     @staticmethod
     def _parse_entries(raw: str) -> List[Dict[str, Any]]:
@@ -217,49 +306,93 @@ class DiscoveryStore:
             return []
         return data if isinstance(data, list) else []
 
+    @staticmethod
+    def _load_entries(path: Path) -> List[Dict[str, Any]]:
+        if not path.exists():
+            return []
+        try:
+            return [entry for entry in iter_json_array(path) if isinstance(entry, dict)]
+        except (OSError, UnicodeDecodeError):
+            return []
+
     @property
     def text(self) -> str:
         return self._overlay_text
 
-    def _combined_payload(self) -> List[Dict[str, Any]]:
-        combined: Dict[str, Dict[str, Any]] = {}
-        order: List[str] = []
+    def _name_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            index: Dict[str, Dict[str, Any]] = {}
+            for source in (self._base_entries, self._overlay_entries):
+                for entry in source:
+                    if not isinstance(entry, dict):
+                        continue
+                    name = str(entry.get("name") or "").strip()
+                    if name:
+                        index[name.lower()] = entry
+            self._index = index
+        return self._index
 
-        def _ingest(source: List[Dict[str, Any]]) -> None:
-            for entry in source:
-                name = str(entry.get("name") or "").strip()
-                if not name:
-                    continue
-                key = name.lower()
-                if key not in combined:
-                    order.append(key)
-                combined[key] = entry
+    def _combined_payload(self) -> List[Dict[str, Any]]:
+        return list(self._name_index().values())
 
-        _ingest(self._base_entries)
-        _ingest(self._overlay_entries)
-        return [combined[key] for key in order]
+    def _parsed_entry(self, key: str) -> DiscoveryEntry | None:
+        if key not in self._parsed:
+            payload = self._name_index().get(key)
+            try:
+                self._parsed[key] = DiscoveryEntry.from_data(payload) if payload is not None else None
+            except Exception:
+                self._parsed[key] = None
+        return self._parsed[key]
 
     def entries(self) -> List[DiscoveryEntry]:
-        if self._entries is not None:
-            return list(self._entries)
         entries: List[DiscoveryEntry] = []
-        for payload in self._combined_payload():
-            try:
-                entries.append(DiscoveryEntry.from_data(payload))
-            except Exception:
-                continue
-        self._entries = entries
-        return list(entries)
+        for key in self._name_index():
+            entry = self._parsed_entry(key)
+            if entry is not None:
+                entries.append(entry)
+        return entries
 
     def get(self, name: str) -> DiscoveryEntry:
-        target = name.strip().lower()
-        for entry in self.entries():
-            if entry.name.lower() == target:
-                return entry
+        payload = self._name_index().get(name.strip().lower())
+        if payload is not None:
+            try:
+                # Fresh instance: callers (install_server) adjust options in place.
+                return DiscoveryEntry.from_data(payload)
+            except Exception:
+                pass
         raise KeyError(f"No discovered server named '{name}'")
 
+    def _sources(self) -> List[Path]:
+        return list(dict.fromkeys([self.base_path, self.overlay_path]))
+
+    def search(
+        self,
+        query: str = "",
+        *,
+        filters: Iterable[str] = (),
+        min_score: float | None = None,
+        limit: int | None = None,
+    ) -> List[tuple[DiscoveryEntry, float]]:
+        """Rank cached entries against `query` using the local index.
+
+        Every filter (tag or preset) must match an entry's tags or text.
+        """
+
+        sources = self._sources()
+        if not self.index.is_current(sources):
+            self.index.update(self._name_index().values(), sources=sources)
+        results: List[tuple[DiscoveryEntry, float]] = []
+        for hit in self.index.search(query, filters=list(filters), min_score=min_score):
+            entry = self._parsed_entry(hit.name.lower())
+            if entry is None:
+                continue
+            results.append((entry, hit.score))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
     def overlay_entries(self) -> List[Dict[str, Any]]:
-        return json.loads(json.dumps(self._overlay_entries))
+        return copy_json(self._overlay_entries)
 
     def refresh_from(self, source_path: Path) -> Dict[str, Any]:
         if not source_path.exists():
@@ -274,12 +407,57 @@ class DiscoveryStore:
             "entries": len(data),
         }
 
+    def render(self, entries: List[Dict[str, Any]]) -> str:
+        """Render `entries` exactly like ``json.dumps(entries, indent=2)`` plus a newline."""
+
+        return self._render(entries)[0]
+
+    def _render(self, entries: List[Dict[str, Any]]) -> tuple[str, List[Any], Dict[str, tuple[Dict[str, Any], str]]]:
+        if not entries:
+            return "[]\n", [], {}
+        fragments: List[str] = []
+        snapshots: List[Any] = []
+        rendered: Dict[str, tuple[Dict[str, Any], str]] = {}
+        for entry in entries:
+            key = str(entry.get("name") or "").strip().lower() if isinstance(entry, dict) else ""
+            cached = self._rendered.get(key) if key else None
+            if cached is not None and cached[0] == entry:
+                snapshot, fragment = cached
+            else:
+                snapshot = copy_json(entry)
+                fragment = _render_entry(snapshot)
+            if key:
+                rendered[key] = (snapshot, fragment)
+            snapshots.append(snapshot)
+            fragments.append(fragment)
+        return "[\n" + ",\n".join(fragments) + "\n]\n", snapshots, rendered
+
     def save_overlay(self, entries: List[Dict[str, Any]]) -> None:
-        sanitized = json.loads(json.dumps(entries, ensure_ascii=False))
-        rendered = json.dumps(sanitized, indent=2, ensure_ascii=False) + "\n"
-        if rendered == self._overlay_text:
+        rendered_text, snapshots, rendered = self._render(entries)
+        self._rendered = rendered
+        if rendered_text == self._overlay_text:
             return
-        atomic_write(self.path, rendered)
-        self._overlay_text = rendered
-        self._overlay_entries = sanitized
-        self._entries = None
+        sources = self._sources()
+        index_current = self.index.is_current(sources)
+        atomic_write(self.path, rendered_text)
+        previous = {
+            str(entry.get("name") or "").strip().lower(): entry
+            for entry in self._overlay_entries
+            if isinstance(entry, dict)
+        }
+        self._overlay_text = rendered_text
+        self._overlay_entries = snapshots
+        if self.overlay_path == self.base_path:
+            self._base_entries = list(snapshots)
+        # Only entries whose payload changed need to be parsed or indexed again.
+        changed = set(previous)
+        for key, (snapshot, _) in rendered.items():
+            if previous.get(key) == snapshot:
+                changed.discard(key)
+            else:
+                changed.add(key)
+        for key in changed:
+            self._parsed.pop(key, None)
+        self._index = None
+        if index_current:
+            self.index.update(self._name_index().values(), sources=sources, only=changed)
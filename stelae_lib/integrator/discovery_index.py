@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+from stelae_lib.fileio import atomic_write
+
+_INDEX_VERSION = 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Name matches dominate, tool names come next, free text counts once.
+_FIELD_WEIGHTS = (("name", 3), ("tools", 2), ("description", 1), ("tags", 2))
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _entry_key(entry: Mapping[str, Any]) -> str:
+    return str(entry.get("name") or "").strip().lower()
+
+
+def _entry_tags(entry: Mapping[str, Any]) -> List[str]:
+    options = entry.get("options") if isinstance(entry.get("options"), dict) else {}
+    tags: List[str] = []
+    for source in (entry.get("tags"), options.get("tags"), options.get("keywords")):
+        if isinstance(source, str):
+            source = source.split(",")
+        if isinstance(source, list):
+            tags.extend(str(item).strip().lower() for item in source if str(item).strip())
+    preset = options.get("preset")
+    if isinstance(preset, str) and preset.strip():
+        tags.append(preset.strip().lower())
+    return sorted(set(tags))
+
+
+def _entry_fields(entry: Mapping[str, Any]) -> Dict[str, str]:
+    tools = entry.get("tools") if isinstance(entry.get("tools"), list) else []
+    tool_names = [str(tool.get("name") or "") for tool in tools if isinstance(tool, dict)]
+    tool_text = [str(tool.get("description") or "") for tool in tools if isinstance(tool, dict)]
+    options = entry.get("options") if isinstance(entry.get("options"), dict) else {}
+    return {
+        "name": " ".join([str(entry.get("name") or ""), str(options.get("originalName") or "")]),
+        "tools": " ".join(tool_names),
+        "description": " ".join([str(entry.get("description") or ""), *tool_text]),
+        "tags": " ".join(_entry_tags(entry)),
+    }
+
+
+def entry_digest(entry: Mapping[str, Any]) -> str:
+    text = json.dumps(_entry_fields(entry), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IndexedDocument:
+    name: str
+    digest: str
+    length: int
+    terms: Dict[str, int]
+    tags: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_entry(cls, entry: Mapping[str, Any], digest: str | None = None) -> "IndexedDocument":
+        fields = _entry_fields(entry)
+        terms: Counter[str] = Counter()
+        for field_name, weight in _FIELD_WEIGHTS:
+            for token in tokenize(fields[field_name]):
+                terms[token] += weight
+        return cls(
+            name=str(entry.get("name") or "").strip(),
+            digest=digest or entry_digest(entry),
+            length=sum(terms.values()),
+            terms=dict(terms),
+            tags=_entry_tags(entry),
+        )
+
+    def to_data(self) -> Dict[str, Any]:
+        return {"name": self.name, "digest": self.digest, "length": self.length, "terms": self.terms, "tags": self.tags}
+
+    @classmethod
+    def from_data(cls, data: Any) -> "IndexedDocument | None":
+        if not isinstance(data, dict) or not isinstance(data.get("terms"), dict):
+            return None
+        return cls(
+            name=str(data.get("name") or ""),
+            digest=str(data.get("digest") or ""),
+            length=int(data.get("length") or 0),
+            terms={str(term): int(tf) for term, tf in data["terms"].items()},
+            tags=[str(tag) for tag in data.get("tags") or []],
+        )
+
+    def matches_filter(self, value: str) -> bool:
+        """A filter matches an explicit tag or, failing that, every token of it in the text."""
+
+        lowered = value.strip().lower()
+        if not lowered:
+            return True
+        if lowered in self.tags:
+            return True
+        tokens = tokenize(lowered)
+        return bool(tokens) and all(token in self.terms for token in tokens)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    name: str
+    score: float
+
+
+class DiscoveryIndex:
+    """BM25 inverted index over discovered server names, descriptions, and tool names.
+
+    The index persists beside the discovery cache. Its header records the stat of every
+    source file, so an unchanged cache is searched without re-reading entries. `update`
+    re-tokenizes only entries whose indexed fields changed and drops removed ones.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._documents: Dict[str, IndexedDocument] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._sources: Dict[str, List[int]] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return
+        sources = data.get("sources")
+        self._sources = sources if isinstance(sources, dict) else {}
+        for key, raw in (data.get("documents") or {}).items():
+            document = IndexedDocument.from_data(raw)
+            if document is not None:
+                self._add(str(key), document)
+
+    def _add(self, key: str, document: IndexedDocument) -> None:
+        self._documents[key] = document
+        self._total_length += document.length
+        for term, tf in document.terms.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+    def _remove(self, key: str) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        self._total_length -= document.length
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    @staticmethod
+    def _stat(paths: Iterable[Path]) -> Dict[str, List[int]]:
+        stats: Dict[str, List[int]] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats[str(path)] = [stat.st_mtime_ns, stat.st_size]
+        return stats
+
+    def is_current(self, sources: Sequence[Path]) -> bool:
+        self._load()
+        return bool(self._sources) and self._sources == self._stat(sources)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._documents)
+
+    def update(
+        self,
+        entries: Iterable[Mapping[str, Any]],
+        *,
+        sources: Sequence[Path] = (),
+        only: Iterable[str] | None = None,
+    ) -> int:
+        """Sync the index with `entries` and persist it; returns how many documents changed.
+
+        With `only`, just those keys are reconciled (missing ones are dropped) and every
+        other document is left untouched.
+        """
+
+        self._load()
+        wanted = {key.lower() for key in only} if only is not None else None
+        seen: set[str] = set()
+        changed = 0
+        for entry in entries:
+            if not isinstance(entry, Mapping):
+                continue
+            key = _entry_key(entry)
+            if not key or (wanted is not None and key not in wanted):
+                continue
+            seen.add(key)
+            digest = entry_digest(entry)
+            current = self._documents.get(key)
+            if current is not None and current.digest == digest:
+                continue
+            self._remove(key)
+            self._add(key, IndexedDocument.from_entry(entry, digest))
+            changed += 1
+        stale = (wanted if wanted is not None else set(self._documents)) - seen
+        for key in stale:
+            if key in self._documents:
+                self._remove(key)
+                changed += 1
+        new_sources = self._stat(sources)
+        if changed or new_sources != self._sources:
+            self._sources = new_sources
+            self.save()
+        return changed
+
+    def save(self) -> None:
+        payload = {
+            "version": _INDEX_VERSION,
+            "sources": self._sources,
+            "documents": {key: document.to_data() for key, document in self._documents.items()},
+        }
+        try:
+            atomic_write(self.path, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        except OSError:
+            pass
+
+    def search(
+        self,
+        query: str = "",
+        *,
+        filters: Sequence[str] = (),
+        min_score: float | None = None,
+        limit: int | None = None,
+    ) -> List[SearchHit]:
+        """Rank documents by BM25 against `query`; every filter must match.
+
+        An empty query returns every document passing the filters, ordered by name with
+        a score of 0.
+        """
+
+        self._load()
+        candidates = [
+            key
+            for key, document in self._documents.items()
+            if all(document.matches_filter(value) for value in filters)
+        ]
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            hits = sorted((SearchHit(self._documents[key].name, 0.0) for key in candidates), key=lambda hit: hit.name)
+            return hits[:limit] if limit is not None else hits
+        total = len(self._documents)
+        average = (self._total_length / total) if total else 0.0
+        allowed = set(candidates)
+        scores: Dict[str, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                if key not in allowed:
+                    continue
+                length = self._documents[key].length
+                norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * (length / average if average else 0.0))
+                scores[key] = scores.get(key, 0.0) + idf * (tf * (_BM25_K1 + 1.0)) / (tf + norm)
+        hits = [
+            SearchHit(self._documents[key].name, round(score, 6))
+            for key, score in scores.items()
+            if min_score is None or score >= min_score
+        ]
+        hits.sort(key=lambda hit: (-hit.score, hit.name))
+        return hits[:limit] if limit is not None else hits
@@ -4,7 +4,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-from stelae_lib.config_overlays import deep_merge, overlay_path_for
+from stelae_lib.config_overlays import deep_merge, merge_layers, overlay_path_for
 from stelae_lib.fileio import atomic_write
 
 
@@ -45,8 +45,7 @@ class ProxyTemplate:
 
     def upsert(self, name: str, entry: Dict[str, Any], *, force: bool = False) -> bool:
         servers = self._overlay_data.setdefault("mcpServers", {})
-        existing = servers.get(name)
-        merged_existing = self.snapshot()["mcpServers"].get(name)
+        merged_existing = self._merged_server(name)
         if merged_existing and not force and merged_existing != entry:
             raise ValueError(f"Server '{name}' already exists; pass force to update")
         if merged_existing == entry:
@@ -55,6 +54,15 @@ class ProxyTemplate:
         self._overlay_data["mcpServers"] = {key: servers[key] for key in sorted(servers)}
         return True
 
+    def _merged_server(self, name: str) -> Any:
+        # Merge only the one entry instead of snapshotting the whole template.
+        layers = [
+            servers[name]
+            for servers in (self._base_data.get("mcpServers"), self._overlay_data.get("mcpServers"))
+            if isinstance(servers, dict) and name in servers
+        ]
+        return merge_layers(*layers) if layers else None
+
     def remove(self, name: str) -> bool:
         servers = self._overlay_data.setdefault("mcpServers", {})
         if name not in servers:
@@ -86,6 +94,19 @@ class ProxyTemplate:
         atomic_write(self.path, text)
         self._overlay_text = text
 
+    def checkpoint(self) -> Dict[str, Any]:
+        """Capture the staged overlay so a failed change can be rolled back.
+
+        Staging only adds, replaces or drops whole server entries, so copying the
+        two container levels is enough.
+        """
+
+        overlay = dict(self._overlay_data)
+        overlay["mcpServers"] = dict(overlay.get("mcpServers") or {})
+        return overlay
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self._overlay_data = state
+
     def snapshot(self) -> Dict[str, Any]:
-        merged = deep_merge(self._base_data, self._overlay_data)
-        return json.loads(json.dumps(merged, ensure_ascii=False))
+        return deep_merge(self._base_data, self._overlay_data)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping
+
+DEFAULT_RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class _CacheEntry:
+    text: str
+    size: int
+    expires_at: float
+    server: str
+
+
+def result_cache_key(server: str | None, tool: str, arguments: Mapping[str, Any]) -> str:
+    canonical = json.dumps(
+        arguments, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{server or ''}\0{tool}\0{digest}"
+
+
+class ToolResultCache:
+    """LRU result cache bounded by serialized size, with per-entry TTLs.
+
+    Entries are grouped by downstream server so a write can invalidate every read
+    it might have made stale. Each server also carries a generation counter: a
+    result fetched before an invalidation is dropped instead of being stored, so a
+    read racing a write cannot repopulate the cache with pre-write data. Values are
+    stored as JSON text, so every hit is a fresh copy that callers may mutate.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, server: str | None) -> int:
+        return self._generations.get(server or "", 0)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= self._clock():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return json.loads(entry.text)
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        *,
+        server: str | None,
+        ttl_seconds: float,
+        generation: int | None = None,
+    ) -> bool:
+        label = server or ""
+        if ttl_seconds <= 0 or self.max_bytes <= 0:
+            return False
+        if generation is not None and generation != self._generations.get(label, 0):
+            return False
+        try:
+            text = json.dumps(value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            return False
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _CacheEntry(
+            text=text,
+            size=size,
+            expires_at=self._clock() + ttl_seconds,
+            server=label,
+        )
+        self.bytes += size
+        while self.bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, server: str | None) -> int:
+        """Drop every entry fetched from `server` and fence reads still in flight."""
+
+        label = server or ""
+        self._generations[label] = self._generations.get(label, 0) + 1
+        stale = [key for key, entry in self._entries.items() if entry.server == label]
+        for key in stale:
+            self._drop(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        for label in {entry.server for entry in self._entries.values()}:
+            self._generations[label] = self._generations.get(label, 0) + 1
+        self._entries.clear()
+        self.bytes = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
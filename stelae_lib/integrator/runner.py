@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Awaitable, Callable, Iterable, List, Sequence, TypeVar
+
+OutputCallback = Callable[[List[str], str], None]
+"""Receives `(command, line)` for every output line as soon as it is read."""
+
+_T = TypeVar("_T")
 
 
 @dataclass
@@ -22,35 +29,138 @@ class CommandFailed(RuntimeError):
         self.result = result
 
 
+def _run_coroutine(factory: Callable[[], Awaitable[_T]]) -> _T:
+    """Run a coroutine to completion from sync code, even inside a running loop."""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(factory())
+    # Called from an event-loop thread (e.g. a sync tool handler); run the
+    # pipeline on a private loop in a helper thread instead of nesting loops.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="stelae-runner") as pool:
+        return pool.submit(lambda: asyncio.run(factory())).result()
+
+
 class CommandRunner:
-    def __init__(self, cwd: Path):
+    """Run integrator commands, streaming their output as it is produced.
+
+    Commands are grouped into stages: every command within a stage runs
+    concurrently and stages run in order, stopping at the first failure.
+    `on_output` (per call or per runner) sees each line as soon as it is read,
+    so callers can react to log lines instead of waiting for the process to exit.
+    """
+
+    def __init__(self, cwd: Path, *, on_output: OutputCallback | None = None):
         self.cwd = cwd
+        self.on_output = on_output
+        self._output_lock = threading.Lock()
 
-    def run(self, command: Sequence[str], *, env: dict[str, str] | None = None, dry_run: bool = False) -> CommandResult:
-        cmd_list = list(command)
-        if dry_run:
-            return CommandResult(command=cmd_list, status="skipped", output="dry-run", returncode=None)
+    def _env(self, env: dict[str, str] | None) -> dict[str, str]:
         merged_env = os.environ.copy()
         if env:
             merged_env.update(env)
-        proc = subprocess.run(
-            cmd_list,
+        return merged_env
+
+    def _emit(self, callback: OutputCallback | None, command: List[str], line: str) -> None:
+        if callback is None:
+            return
+        with self._output_lock:
+            callback(command, line)
+
+    async def arun(
+        self,
+        command: Sequence[str],
+        *,
+        env: dict[str, str] | None = None,
+        dry_run: bool = False,
+        on_output: OutputCallback | None = None,
+    ) -> CommandResult:
+        cmd_list = list(command)
+        if dry_run:
+            return CommandResult(command=cmd_list, status="skipped", output="dry-run", returncode=None)
+        callback = on_output or self.on_output
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_list,
             cwd=self.cwd,
-            capture_output=True,
-            text=True,
-            env=merged_env,
-            check=False,
+            env=self._env(env),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
-        output = "".join(filter(None, [proc.stdout, proc.stderr]))
-        status = "ok" if proc.returncode == 0 else "failed"
-        result = CommandResult(command=cmd_list, status=status, output=output, returncode=proc.returncode)
-        if proc.returncode != 0:
+        chunks: List[str] = []
+        assert proc.stdout is not None
+        try:
+            async for raw in proc.stdout:
+                line = raw.decode("utf-8", errors="replace")
+                chunks.append(line)
+                self._emit(callback, cmd_list, line.rstrip("\n"))
+            returncode = await proc.wait()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+        status = "ok" if returncode == 0 else "failed"
+        result = CommandResult(command=cmd_list, status=status, output="".join(chunks), returncode=returncode)
+        if returncode != 0:
             raise CommandFailed(result)
         return result
 
-    def sequence(self, commands: Iterable[Sequence[str]], *, env: dict[str, str] | None = None, dry_run: bool = False) -> List[CommandResult]:
+    async def apipeline(
+        self,
+        stages: Iterable[Sequence[Sequence[str]]],
+        *,
+        env: dict[str, str] | None = None,
+        dry_run: bool = False,
+        on_output: OutputCallback | None = None,
+    ) -> List[CommandResult]:
         results: List[CommandResult] = []
-        for command in commands:
-            results.append(self.run(command, env=env, dry_run=dry_run))
+        for stage in stages:
+            commands = [list(command) for command in stage]
+            if not commands:
+                continue
+            tasks = [
+                asyncio.ensure_future(self.arun(command, env=env, dry_run=dry_run, on_output=on_output))
+                for command in commands
+            ]
+            try:
+                results.extend(await asyncio.gather(*tasks))
+            except CommandFailed:
+                # Let siblings in the failed stage stop before reporting.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
         return results
 
+    def run(
+        self,
+        command: Sequence[str],
+        *,
+        env: dict[str, str] | None = None,
+        dry_run: bool = False,
+        on_output: OutputCallback | None = None,
+    ) -> CommandResult:
+        return _run_coroutine(lambda: self.arun(command, env=env, dry_run=dry_run, on_output=on_output))
+
+    def pipeline(
+        self,
+        stages: Iterable[Sequence[Sequence[str]]],
+        *,
+        env: dict[str, str] | None = None,
+        dry_run: bool = False,
+        on_output: OutputCallback | None = None,
+    ) -> List[CommandResult]:
+        stage_list = [list(stage) for stage in stages]
+        return _run_coroutine(lambda: self.apipeline(stage_list, env=env, dry_run=dry_run, on_output=on_output))
+
+    def sequence(
+        self,
+        commands: Iterable[Sequence[str]],
+        *,
+        env: dict[str, str] | None = None,
+        dry_run: bool = False,
+        on_output: OutputCallback | None = None,
+    ) -> List[CommandResult]:
+        return self.pipeline([[command] for command in commands], env=env, dry_run=dry_run, on_output=on_output)
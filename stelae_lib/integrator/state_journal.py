@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from stelae_lib.fileio import atomic_write
+
+_READ_BLOCK = 64 * 1024
+# Entries kept in memory for `recent()`; bounded journals keep at least `max_length`.
+_TAIL_ENTRIES = 1000
+
+
+def _iter_lines_reverse(path: Path, *, block_size: int = _READ_BLOCK) -> Iterator[bytes]:
+    """Yield the non-empty lines of `path` from last to first, reading backwards in blocks."""
+
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return
+    with handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            chunk = handle.read(step) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+class JsonlJournal:
+    """Append-only JSON-lines journal backing one list-kind state field.
+
+    Entries are stored oldest-first on disk, so an append is a single line write.
+    When `max_length` is set, the file is compacted back to `max_length` entries once
+    it grows past twice that size, which bounds both disk use and compaction cost.
+    Appends are buffered until `flush()`, which may run in a worker thread; the newest
+    entries are also kept in memory so `recent()` normally never touches the disk.
+    """
+
+    def __init__(self, path: Path, *, max_length: int | None = None) -> None:
+        self.path = path
+        self.max_length = max_length
+        # `_lock` only guards the in-memory buffers and is never held across I/O;
+        # `_io_lock` serializes writers and the rare reader that must hit the file.
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: list[str] = []
+        self._tail: deque[str] = deque(maxlen=max(max_length or 0, _TAIL_ENTRIES))
+        self._line_count = 0
+        for line in _iter_lines_reverse(path):
+            self._line_count += 1
+            if len(self._tail) < self._tail.maxlen:
+                raw = line.decode("utf-8", errors="replace")
+                if _decode(raw) is not _TORN:
+                    self._tail.appendleft(raw)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def __len__(self) -> int:
+        total = self._line_count + len(self._pending)
+        if self.max_length:
+            return min(total, self.max_length)
+        return total
+
+    def append(self, entry: Any) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._pending.append(line)
+            self._tail.append(line)
+
+    def extend(self, entries: Iterable[Any]) -> None:
+        lines = [json.dumps(entry, ensure_ascii=False, separators=(",", ":")) for entry in entries]
+        with self._lock:
+            self._pending.extend(lines)
+            self._tail.extend(lines)
+
+    def prepend(self, entries: Iterable[Any]) -> None:
+        """Insert `entries` (oldest first) before everything already journaled."""
+
+        lines = [json.dumps(entry, ensure_ascii=False, separators=(",", ":")) for entry in entries]
+        if not lines:
+            return
+        with self._io_lock:
+            existing = [line.decode("utf-8") for line in _iter_lines_reverse(self.path)]
+            existing.reverse()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, "".join(line + "\n" for line in [*lines, *existing]))
+            with self._lock:
+                self._line_count += len(lines)
+                merged = [*lines, *existing, *self._pending]
+                self._tail.clear()
+                self._tail.extend(merged[-self._tail.maxlen :])
+            if self.max_length and self._line_count > self.max_length * 2:
+                self._compact(self.max_length)
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+            with self._lock:
+                self._line_count += len(lines)
+                line_count = self._line_count
+            if self.max_length and line_count > self.max_length * 2:
+                self._compact(self.max_length)
+
+    def _compact(self, keep: int) -> None:
+        newest_first: list[bytes] = []
+        for line in _iter_lines_reverse(self.path):
+            newest_first.append(line)
+            if len(newest_first) >= keep:
+                break
+        text = "".join(line.decode("utf-8") + "\n" for line in reversed(newest_first))
+        atomic_write(self.path, text)
+        with self._lock:
+            self._line_count = len(newest_first)
+
+    def recent(self, limit: int | None = None) -> list[Any]:
+        """Return up to `limit` entries, newest first.
+
+        Served from the in-memory tail whenever it covers the request, which is
+        always the case for bounded journals; only an unbounded journal asked for
+        more than the tail holds reads the file.
+        """
+
+        if self.max_length:
+            limit = min(limit, self.max_length) if limit else self.max_length
+        with self._lock:
+            total = self._line_count + len(self._pending)
+            if len(self._tail) >= total or (limit is not None and limit <= len(self._tail)):
+                return _decode_lines(reversed(self._tail), limit)
+        with self._io_lock:
+            with self._lock:
+                pending = list(self._pending)
+            raw_lines = chain(
+                reversed(pending),
+                (line.decode("utf-8") for line in _iter_lines_reverse(self.path)),
+            )
+            return _decode_lines(raw_lines, limit)
+
+
+_TORN = object()
+
+
+def _decode(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        # A torn trailing line from an interrupted write; skip it.
+        return _TORN
+
+
+def _decode_lines(raw_lines: Iterable[str], limit: int | None) -> list[Any]:
+    entries: list[Any] = []
+    for raw in raw_lines:
+        if limit is not None and len(entries) >= limit:
+            break
+        entry = _decode(raw)
+        if entry is not _TORN:
+            entries.append(entry)
+    return entries
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 import re
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from typing import Any, Mapping, MutableMapping
 
 from mcp import types
 
+from stelae_lib.fileio import atomic_write
+
+from .backpressure import ConcurrencyLimits
+from .result_cache import ToolResultCache
+from .state_journal import JsonlJournal
+
 from .tool_aggregations import (
+    LOGGER,
     AggregatedToolDefinition,
     AggregationStateDefinition,
     AggregatedToolRunner,
@@ -23,6 +33,10 @@ from .tool_aggregations import _lookup_path  # reuse helper
 
 
 _TEMPLATE_PATTERN = re.compile(r"\{\{([^}]+)\}\}")
+_DEFAULT_FLUSH_DELAY = max(
+    0.0, float(os.getenv("STELAE_TOOL_AGGREGATOR_STATE_FLUSH_DELAY", "0.5"))
+)
+_MAX_FLUSH_RETRY_DELAY = 30.0
 
 
 def _render_template(value: Any, context: Mapping[str, str]) -> Any:
@@ -41,6 +55,13 @@ def _render_template(value: Any, context: Mapping[str, str]) -> Any:
     return value
 
 
+def _journal_has_tail(journal: JsonlJournal, newest_first: list[Any]) -> bool:
+    """Whether the journal already ends with `newest_first` (up to its max length)."""
+
+    recent = journal.recent(len(newest_first))
+    return bool(recent) and recent == newest_first[: len(recent)]
+
+
 class JsonStateStore:
     def __init__(
         self,
@@ -59,7 +80,14 @@ class JsonStateStore:
         rendered_defaults = _render_template(definition.defaults, context)
         self._data = self._load_state(rendered_defaults)
         self._dirty = False
+        self._journals = self._open_journals(definition)
         self.lock = asyncio.Lock()
+        delay = definition.flush_delay_seconds
+        self._flush_delay = _DEFAULT_FLUSH_DELAY if delay is None else max(0.0, delay)
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_error: BaseException | None = None
+        self._flush_failures = 0
+        self._write_lock = asyncio.Lock()
 
     def _resolve_state_path(self, template: str) -> Path:
         rendered = _render_template(template, self._context)
@@ -87,6 +115,28 @@ class JsonStateStore:
             fields[key] = entry
         return fields
 
+    def _open_journals(self, definition: AggregationStateDefinition) -> dict[str, JsonlJournal]:
+        journals: dict[str, JsonlJournal] = {}
+        for key, field_def in definition.fields.items():
+            if field_def.storage != "journal":
+                continue
+            journal_path = self._path.with_name(f"{self._path.stem}.{key}.jsonl")
+            journal = JsonlJournal(journal_path, max_length=field_def.max_length)
+            inline = self._data.pop(key, None)
+            if isinstance(inline, list) and inline:
+                # Migrate history kept inline by earlier versions (newest-first).
+                if not journal_path.exists():
+                    journal.extend(reversed(inline))
+                elif not _journal_has_tail(journal, inline):
+                    # Inline history written alongside an existing journal (e.g. by an
+                    # older version after a downgrade): keep it ahead of the journal.
+                    journal.prepend(reversed(inline))
+                # Otherwise an interrupted write already migrated it; only the state
+                # file still needs rewriting.
+                self._dirty = True
+            journals[key] = journal
+        return journals
+
     def _load_state(self, defaults: Mapping[str, Any]) -> dict[str, Any]:
         if not self._path.exists():
             return {k: self._coerce_default(k, v) for k, v in defaults.items()}
@@ -135,22 +185,44 @@ class JsonStateStore:
             self._dirty = True
 
     def append_value(self, key: str, entry: dict[str, Any], *, max_length: int | None = None) -> None:
-        items = self._data.get(key)
-        if not isinstance(items, list):
-            items = []
-        items.insert(0, entry)
         limit = max_length or self._fields.get(key, {}).get("max_length")
-        if isinstance(limit, int) and limit > 0:
-            del items[limit:]
-        self._data[key] = items
+        maxlen = limit if isinstance(limit, int) and limit > 0 else None
+        journal = self._journals.get(key)
+        if journal is not None:
+            journal.max_length = maxlen
+            journal.append(entry)
+            self._dirty = True
+            return
+        items = self._data.get(key)
+        if not isinstance(items, deque) or items.maxlen != maxlen:
+            # History is newest-first; a bounded deque drops the oldest entry on
+            # appendleft, so appends stay O(1) instead of list.insert(0, ...).
+            existing = items if isinstance(items, (list, deque)) else ()
+            items = deque(islice(existing, maxlen), maxlen=maxlen)
+            self._data[key] = items
+        items.appendleft(entry)
         self._dirty = True
 
     def mark_clean(self) -> None:
         self._dirty = False
 
+    def history(self, key: str, limit: int | None = None) -> list[Any]:
+        """Return up to `limit` entries of a list field, newest first."""
+
+        journal = self._journals.get(key)
+        if journal is not None:
+            return journal.recent(limit)
+        value = self._state_value(key)
+        if not isinstance(value, (list, deque)):
+            return []
+        return list(islice(value, limit))
+
     def get(self, key: str) -> Any:
+        journal = self._journals.get(key)
+        if journal is not None:
+            return journal.recent()
         value = self._state_value(key)
-        if isinstance(value, list):
+        if isinstance(value, (list, deque)):
             return list(value)
         if isinstance(value, dict):
             return dict(value)
@@ -189,14 +261,97 @@ class JsonStateStore:
     def needs_flush(self) -> bool:
         return self._dirty
 
+    def _snapshot(self) -> str:
+        """Serialize the state now, so a writer thread never sees later mutations."""
+
+        data = {
+            key: list(value) if isinstance(value, deque) else value
+            for key, value in self._data.items()
+        }
+        return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+    def _write(self, snapshot: str) -> None:
+        for journal in self._journals.values():
+            journal.flush()
+        atomic_write(self._path, snapshot)
+
     def flush(self) -> None:
+        """Write pending changes synchronously."""
+
         if not self._dirty:
             return
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        with self._path.open("w", encoding="utf-8") as handle:
-            json.dump(self._data, handle, indent=2, ensure_ascii=False)
-            handle.write("\n")
+        snapshot = self._snapshot()
         self._dirty = False
+        self._write(snapshot)
+
+    async def _write_pending(self) -> None:
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            snapshot = self._snapshot()
+            self._dirty = False
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except Exception:
+                self._dirty = True
+                raise
+            self._flush_error = None
+            self._flush_failures = 0
+
+    @property
+    def flush_error(self) -> BaseException | None:
+        """The last failed background write, until a later write succeeds."""
+
+        return self._flush_error
+
+    def _start_flush_timer(self, delay: float) -> None:
+        task = asyncio.get_running_loop().create_task(self._delayed_flush(delay))
+        task.add_done_callback(self._flush_done)
+        self._flush_task = task
+
+    def _flush_done(self, task: asyncio.Task[None]) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self._flush_error = task.exception()
+        self._flush_failures += 1
+        delay = min(self._flush_delay * 2**self._flush_failures, _MAX_FLUSH_RETRY_DELAY)
+        LOGGER.warning(
+            "Failed to write state %s; retrying in %.1fs: %s", self._path, delay, self._flush_error
+        )
+        # A flush scheduled while this one was writing already covers the retry.
+        if self._flush_task is None and self._dirty:
+            self._start_flush_timer(delay)
+
+    async def _delayed_flush(self, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._flush_task = None
+        await self._write_pending()
+
+    async def schedule_flush(self) -> None:
+        """Write pending changes behind the caller, coalescing within the flush window."""
+
+        if not self._dirty:
+            return
+        if self._flush_delay <= 0:
+            await self._write_pending()
+            return
+        if self._flush_task is None:
+            self._start_flush_timer(self._flush_delay)
+
+    async def aclose(self) -> None:
+        """Cancel any pending timer and write outstanding changes."""
+
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._write_pending()
 
 
 class StatefulAggregatedToolRunner(AggregatedToolRunner):
@@ -209,10 +364,18 @@ class StatefulAggregatedToolRunner(AggregatedToolRunner):
         context: Mapping[str, str],
         workspace_root: Path,
         state_root: Path,
+        result_cache: ToolResultCache | None = None,
+        limits: ConcurrencyLimits | None = None,
     ) -> None:
         if not definition.state:
             raise ToolAggregationError("Stateful runner requires a state definition")
-        super().__init__(definition, proxy_call, fallback_timeout=fallback_timeout)
+        super().__init__(
+            definition,
+            proxy_call,
+            fallback_timeout=fallback_timeout,
+            result_cache=result_cache,
+            limits=limits,
+        )
         self._state_definition = definition.state
         self._store = JsonStateStore(
             definition.state,
@@ -236,20 +399,19 @@ class StatefulAggregatedToolRunner(AggregatedToolRunner):
                 self._apply_preloads(state_op, payload)
                 self._apply_mutations(state_op, payload, None)
                 result = self._build_state_response(state_op, payload)
-                needs_flush = self._store.needs_flush()
-            if needs_flush:
-                self._store.flush()
+            await self._store.schedule_flush()
             return result
         async with self._store.lock:
             self._apply_preloads(state_op, payload)
         result = await super().dispatch(payload)
         async with self._store.lock:
             self._apply_mutations(state_op, payload, result)
-            needs_flush = self._store.needs_flush()
-        if needs_flush:
-            self._store.flush()
+        await self._store.schedule_flush()
         return result
 
+    async def aclose(self) -> None:
+        await self._store.aclose()
+
     def _apply_preloads(self, state_op: StateOperationDefinition, payload: MutableMapping[str, Any]) -> None:
         for preload in state_op.preloads:
             value = self._store.get(preload.state_key)
@@ -305,7 +467,6 @@ class StatefulAggregatedToolRunner(AggregatedToolRunner):
         if not response:
             return [types.TextContent(type="text", text="OK")]
         if response.mode == "history":
-            history = self._store.get(response.key) or []
             max_items = None
             if response.max_argument:
                 try:
@@ -314,7 +475,7 @@ class StatefulAggregatedToolRunner(AggregatedToolRunner):
                         max_items = requested
                 except (TypeError, ValueError):
                     pass
-            entries = history[:max_items] if isinstance(history, list) else []
+            entries = self._store.history(response.key, max_items)
             if not entries:
                 text = "No command execution history."
                 structured = {response.structured_field or "result": {"commands": []}}
@@ -7,19 +7,31 @@ from datetime import datetime
 import logging
 import os
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, Literal, Mapping, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Literal, Mapping, MutableMapping, Sequence
 
 from mcp import types
 
 from stelae_lib.catalog_defaults import DEFAULT_TOOL_AGGREGATIONS
-from stelae_lib.config_overlays import deep_merge, overlay_path_for
+from stelae_lib.config_overlays import copy_json, deep_merge, overlay_path_for
+from stelae_lib.integrator.result_cache import (
+    DEFAULT_RESULT_CACHE_MAX_BYTES,
+    ToolResultCache,
+    result_cache_key,
+)
 from stelae_lib.integrator.tool_overrides import ToolOverridesStore
 
+if TYPE_CHECKING:
+    from stelae_lib.integrator.backpressure import ConcurrencyLimits
+
 ProxyCaller = Callable[[str, Dict[str, Any], float | None, str | None], Awaitable[Dict[str, Any]]]
+PathGetter = Callable[[Any, bool], Any]
+PathSetter = Callable[[MutableMapping[str, Any], Any, "set[int] | None"], None]
 
 DEFAULT_SELECTOR_FIELD = "operation"
 DEFAULT_AGGREGATOR_SERVER = "tool_aggregator"
 DEFAULT_TIMEOUT = 45.0
+# Result caching is opt-in: aggregations enable it with `cache.ttlSeconds`.
+DEFAULT_RESULT_CACHE_TTL = 0.0
 _SKIP = object()
 
 LOGGER = logging.getLogger("stelae.tool_aggregator")
@@ -37,6 +49,9 @@ _DEBUG_AGGREGATIONS = _parse_debug_entries(
 _DEBUG_LIMIT = max(
     0, int(os.getenv("STELAE_TOOL_AGGREGATOR_DEBUG_MAX_CHARS", "2048"))
 )
+_DECODE_MAX_CHARS = max(
+    0, int(os.getenv("STELAE_TOOL_AGGREGATOR_DECODE_MAX_CHARS", "262144"))
+)
 _DEBUG_LOG_PATH_ENV = os.getenv("STELAE_TOOL_AGGREGATOR_DEBUG_LOG")
 _DEBUG_LOG_PATH = (
     Path(_DEBUG_LOG_PATH_ENV).expanduser()
@@ -70,6 +85,10 @@ class ToolAggregationError(ValueError):
     """Raised when declarative aggregation config cannot be satisfied."""
 
 
+class DownstreamBusyError(ToolAggregationError):
+    """Raised when a call waited longer than its queue budget for a concurrency slot."""
+
+
 @dataclass(frozen=True)
 class AggregationDefaults:
     selector_field: str = DEFAULT_SELECTOR_FIELD
@@ -77,6 +96,12 @@ class AggregationDefaults:
     timeout_seconds: float | None = DEFAULT_TIMEOUT
     proxy_url: str | None = None
     server_name: str = DEFAULT_AGGREGATOR_SERVER
+    result_cache_ttl_seconds: float = DEFAULT_RESULT_CACHE_TTL
+    result_cache_max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES
+    max_concurrency: int | None = None
+    max_concurrency_per_server: int | None = None
+    server_concurrency: Mapping[str, int] = field(default_factory=dict)
+    queue_timeout_seconds: float | None = None
 
     @classmethod
     def from_data(cls, payload: Mapping[str, Any] | None) -> AggregationDefaults:
@@ -88,15 +113,43 @@ class AggregationDefaults:
         timeout_seconds = float(timeout_value) if isinstance(timeout_value, (int, float)) else DEFAULT_TIMEOUT
         proxy_url = str(payload.get("proxyURL") or payload.get("proxyUrl") or "").strip() or None
         server_name = str(payload.get("serverName") or DEFAULT_AGGREGATOR_SERVER).strip() or DEFAULT_AGGREGATOR_SERVER
+        cache_ttl_value = payload.get("resultCacheTtlSeconds")
+        cache_ttl = float(cache_ttl_value) if isinstance(cache_ttl_value, (int, float)) else DEFAULT_RESULT_CACHE_TTL
+        cache_bytes_value = payload.get("resultCacheMaxBytes")
+        cache_bytes = int(cache_bytes_value) if isinstance(cache_bytes_value, int) else DEFAULT_RESULT_CACHE_MAX_BYTES
+        server_concurrency_payload = payload.get("serverConcurrency")
+        server_concurrency = {
+            str(name): limit
+            for name, value in (server_concurrency_payload.items() if isinstance(server_concurrency_payload, Mapping) else ())
+            if (limit := _positive_int(value)) is not None
+        }
         return cls(
             selector_field=selector_field,
             case_insensitive_selector=case_insensitive,
             timeout_seconds=timeout_seconds,
             proxy_url=proxy_url,
             server_name=server_name,
+            result_cache_ttl_seconds=max(0.0, cache_ttl),
+            result_cache_max_bytes=max(0, cache_bytes),
+            max_concurrency=_positive_int(payload.get("maxConcurrency")),
+            max_concurrency_per_server=_positive_int(payload.get("maxConcurrencyPerServer")),
+            server_concurrency=server_concurrency,
+            queue_timeout_seconds=_non_negative_float(payload.get("queueTimeoutSeconds")),
         )
 
 
+def _positive_int(value: Any) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
+
+def _non_negative_float(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return None
+    return float(value)
+
+
 @dataclass(frozen=True)
 class HiddenTool:
     server: str
@@ -119,6 +172,7 @@ class StateFieldDefinition:
     kind: Literal["path", "list", "value"]
     root: str | None = None
     max_length: int | None = None
+    storage: Literal["inline", "journal"] = "inline"
 
     @classmethod
     def from_data(cls, name: str, payload: Mapping[str, Any] | None) -> "StateFieldDefinition":
@@ -132,7 +186,18 @@ class StateFieldDefinition:
         root = str(payload.get("root") or "").strip() or None
         max_length = payload.get("maxLength")
         max_len_value = int(max_length) if isinstance(max_length, (int, float)) else None
-        return cls(name=name, kind=kind, root=root, max_length=max_len_value)
+        storage = str(payload.get("storage") or "inline").strip().lower()
+        if storage not in {"inline", "journal"}:
+            raise ToolAggregationError(f"State field '{name}' has invalid storage '{storage}'")
+        if storage == "journal" and kind != "list":
+            raise ToolAggregationError(f"State field '{name}' can only use journal storage with type 'list'")
+        return cls(
+            name=name,
+            kind=kind,
+            root=root,
+            max_length=max_len_value,
+            storage=storage,  # type: ignore[arg-type]
+        )
 
 
 @dataclass(frozen=True)
@@ -317,6 +382,7 @@ class AggregationStateDefinition:
     defaults: Dict[str, Any]
     fields: Dict[str, StateFieldDefinition]
     operations: Dict[str, StateOperationDefinition]
+    flush_delay_seconds: float | None = None
 
     @classmethod
     def from_data(cls, payload: Mapping[str, Any]) -> "AggregationStateDefinition":
@@ -343,7 +409,15 @@ class AggregationStateDefinition:
             operations[op.value] = op
         if not operations:
             raise ToolAggregationError("state block must declare at least one operation")
-        return cls(path=path, defaults=defaults, fields=fields, operations=operations)
+        delay_value = payload.get("flushDelaySeconds")
+        flush_delay = float(delay_value) if isinstance(delay_value, (int, float)) else None
+        return cls(
+            path=path,
+            defaults=defaults,
+            fields=fields,
+            operations=operations,
+            flush_delay_seconds=flush_delay,
+        )
 
     def get_operation(self, value: str) -> StateOperationDefinition | None:
         return self.operations.get(value)
@@ -358,6 +432,13 @@ class MappingRule:
     required: bool = False
     allow_null: bool = True
     strip_if_null: bool = True
+    _getter: PathGetter | None = field(init=False, repr=False, compare=False)
+    _setter: PathSetter = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        getter = _compile_getter(self.source) if self.source is not None else None
+        object.__setattr__(self, "_getter", getter)
+        object.__setattr__(self, "_setter", _compile_setter(self.target))
 
     @classmethod
     def from_data(cls, payload: Mapping[str, Any]) -> MappingRule:
@@ -383,18 +464,20 @@ class MappingRule:
             strip_if_null=strip_if_null,
         )
 
-    def resolve(self, data: Mapping[str, Any], *, label: str) -> Any | object:
+    def resolve(self, data: Mapping[str, Any], *, label: str, decode: bool = False) -> Any | object:
         value: Any | None
         if self.literal is not None:
-            value = self.literal
-        elif self.source is not None:
-            value = _lookup_path(data, self.source)
+            # Literals and defaults belong to the shared config, so hand out copies;
+            # values read from the payload are passed through without copying.
+            value = _copy_config_value(self.literal)
+        elif self._getter is not None:
+            value = self._getter(data, decode)
         else:
             value = None
 
         if value is None:
             if self.default is not None:
-                value = self.default
+                value = _copy_config_value(self.default)
             elif self.required:
                 source_label = self.source or self.target
                 raise ToolAggregationError(
@@ -411,7 +494,10 @@ class MappingRule:
         if value is None and not self.allow_null:
             return _SKIP
 
-        return copy.deepcopy(value)
+        return value
+
+    def assign(self, dest: MutableMapping[str, Any], value: Any, owned: set[int] | None = None) -> None:
+        self._setter(dest, value, owned)
 
 
 @dataclass(frozen=True)
@@ -425,6 +511,7 @@ class OperationMapping:
     timeout_seconds: float | None = None
     description: str | None = None
     required_any_of: Sequence[tuple[str, ...]] = field(default_factory=tuple)
+    cache_ttl_seconds: float | None = None
 
     @classmethod
     def from_data(cls, payload: Mapping[str, Any]) -> OperationMapping:
@@ -474,6 +561,12 @@ class OperationMapping:
             )
             if members:
                 required_any_of.append(members)
+        cache_ttl_value = payload.get("cacheTtlSeconds")
+        cache_ttl_seconds = (
+            max(0.0, float(cache_ttl_value))
+            if isinstance(cache_ttl_value, (int, float))
+            else None
+        )
         return cls(
             value=raw_value.strip(),
             downstream_tool=downstream_tool,
@@ -484,6 +577,7 @@ class OperationMapping:
             timeout_seconds=timeout_seconds,
             description=description,
             required_any_of=tuple(required_any_of),
+            cache_ttl_seconds=cache_ttl_seconds,
         )
 
     def matches(self, candidate: str, *, case_insensitive: bool) -> bool:
@@ -524,6 +618,20 @@ class AggregatedToolDefinition:
     operations: Sequence[OperationMapping]
     hidden_tools: Sequence[HiddenTool]
     state: AggregationStateDefinition | None = None
+    cache_ttl_seconds: float = 0.0
+    cache_invalidates: tuple[str, ...] = ()
+    max_concurrency: int | None = None
+    queue_timeout_seconds: float | None = None
+    operation_index: Mapping[str, OperationMapping] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.operation_index:
+            index = _build_operation_index(
+                self.name, self.operations, case_insensitive=self.case_insensitive_selector
+            )
+            object.__setattr__(self, "operation_index", index)
 
     @classmethod
     def from_data(
@@ -588,6 +696,22 @@ class AggregatedToolDefinition:
             if isinstance(state_payload, Mapping)
             else None
         )
+        cache_payload = payload.get("cache") if isinstance(payload.get("cache"), Mapping) else {}
+        cache_ttl_value = cache_payload.get("ttlSeconds")
+        cache_ttl_seconds = (
+            max(0.0, float(cache_ttl_value))
+            if isinstance(cache_ttl_value, (int, float))
+            else defaults.result_cache_ttl_seconds
+        )
+        annotation_flags = annotations or {}
+        if not (annotation_flags.get("readOnlyHint") is True and annotation_flags.get("idempotentHint") is True):
+            # Only tools that promise read-only, idempotent behaviour are cacheable.
+            cache_ttl_seconds = 0.0
+        cache_invalidates = tuple(
+            str(item).strip()
+            for item in cache_payload.get("invalidates", [])
+            if isinstance(item, str) and item.strip()
+        )
         return cls(
             name=name,
             description=description,
@@ -602,8 +726,29 @@ class AggregatedToolDefinition:
             operations=tuple(operations),
             hidden_tools=hidden_tools,
             state=state_config,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_invalidates=cache_invalidates,
+            max_concurrency=_positive_int(payload.get("maxConcurrency")) or defaults.max_concurrency,
+            queue_timeout_seconds=(
+                _non_negative_float(payload.get("queueTimeoutSeconds"))
+                if payload.get("queueTimeoutSeconds") is not None
+                else defaults.queue_timeout_seconds
+            ),
         )
 
+    @property
+    def read_only(self) -> bool:
+        return bool(self.annotations and self.annotations.get("readOnlyHint") is True)
+
+    def cache_ttl_for(self, operation: OperationMapping) -> float:
+        """Result TTL for `operation`; 0 when its results must not be cached."""
+
+        if self.cache_ttl_seconds <= 0:
+            return 0.0
+        if operation.cache_ttl_seconds is not None:
+            return operation.cache_ttl_seconds
+        return self.cache_ttl_seconds
+
     def resolve_operation(self, arguments: Mapping[str, Any]) -> OperationMapping:
         selector_value = _lookup_path(arguments, self.selector_field)
         if selector_value is None or not isinstance(selector_value, str):
@@ -611,15 +756,46 @@ class AggregatedToolDefinition:
             raise ToolAggregationError(
                 f"Aggregation '{self.name}' requires field '{field}'"
             )
-        for operation in self.operations:
-            if operation.matches(selector_value, case_insensitive=self.case_insensitive_selector):
-                return operation
+        needle = selector_value.lower() if self.case_insensitive_selector else selector_value
+        operation = self.operation_index.get(needle)
+        if operation is not None:
+            return operation
         allowed = ", ".join(op.value for op in self.operations)
         raise ToolAggregationError(
             f"Aggregation '{self.name}' does not support operation '{selector_value}'. Allowed: {allowed}"
         )
 
 
+def _build_operation_index(
+    name: str,
+    operations: Sequence[OperationMapping],
+    *,
+    case_insensitive: bool,
+) -> Dict[str, OperationMapping]:
+    """Map every selector value and alias to its operation, rejecting conflicts."""
+
+    index: Dict[str, OperationMapping] = {}
+    for operation in operations:
+        for candidate in (operation.value, *operation.aliases):
+            key = candidate.lower() if case_insensitive else candidate
+            existing = index.get(key)
+            if existing is None:
+                index[key] = operation
+            elif existing is not operation:
+                raise ToolAggregationError(
+                    f"Aggregation '{name}' maps selector '{candidate}' to both "
+                    f"'{existing.value}' and '{operation.value}'"
+                )
+            else:
+                LOGGER.warning(
+                    "Aggregation '%s' operation '%s' lists selector '%s' more than once",
+                    name,
+                    operation.value,
+                    candidate,
+                )
+    return index
+
+
 @dataclass(frozen=True)
 class ToolAggregationConfig:
     schema_version: int
@@ -694,10 +870,73 @@ class AggregatedToolRunner:
         proxy_call: ProxyCaller,
         *,
         fallback_timeout: float | None = None,
+        result_cache: ToolResultCache | None = None,
+        limits: ConcurrencyLimits | None = None,
     ) -> None:
         self.definition = definition
         self._proxy_call = proxy_call
         self._fallback_timeout = fallback_timeout
+        self._result_cache = result_cache
+        self._limits = limits
+
+    async def _invoke(
+        self,
+        operation: OperationMapping,
+        request_args: Dict[str, Any],
+        timeout: float | None,
+    ) -> Dict[str, Any]:
+        limits = self._limits
+        if limits is None:
+            return await self._proxy_call(
+                operation.downstream_tool, request_args, timeout, operation.downstream_server
+            )
+        async with limits.hold(
+            limits.aggregation_slot(self.definition.name, self.definition.max_concurrency),
+            limits.server_slot(operation.downstream_server),
+            queue_timeout=self.definition.queue_timeout_seconds,
+        ):
+            return await self._proxy_call(
+                operation.downstream_tool, request_args, timeout, operation.downstream_server
+            )
+
+    async def _call_downstream(
+        self,
+        operation: OperationMapping,
+        request_args: Dict[str, Any],
+        timeout: float | None,
+    ) -> Dict[str, Any]:
+        """Call the downstream tool, serving cacheable reads from the result cache.
+
+        Calls from aggregations that are not read-only invalidate cached results for
+        their downstream server (and any `cache.invalidates` servers) before and after
+        they run, so reads never outlive the write that made them stale.
+        """
+
+        cache = self._result_cache
+        server = operation.downstream_server
+        if cache is None:
+            return await self._invoke(operation, request_args, timeout)
+        ttl = self.definition.cache_ttl_for(operation)
+        if ttl > 0:
+            key = result_cache_key(server, operation.downstream_tool, request_args)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            generation = cache.generation(server)
+            result = await self._invoke(operation, request_args, timeout)
+            if isinstance(result, Mapping) and not result.get("isError"):
+                cache.put(key, result, server=server, ttl_seconds=ttl, generation=generation)
+            return result
+        if self.definition.read_only:
+            return await self._invoke(operation, request_args, timeout)
+        targets = {server or "", *self.definition.cache_invalidates}
+        for target in targets:
+            cache.invalidate(target)
+        try:
+            return await self._invoke(operation, request_args, timeout)
+        finally:
+            for target in targets:
+                cache.invalidate(target)
 
     async def dispatch(self, arguments: Mapping[str, Any] | None) -> Dict[str, Any]:
         payload = arguments if isinstance(arguments, Mapping) else {}
@@ -727,31 +966,39 @@ class AggregatedToolRunner:
             label=f"{self.definition.name}:{operation.value}",
         )
         timeout = operation.timeout_seconds or self.definition.timeout_seconds or self._fallback_timeout
-        raw_result = await self._proxy_call(
-            operation.downstream_tool,
-            request_args,
-            timeout,
-            operation.downstream_server,
-        )
-        decoded_result = _decode_json_like(raw_result)
+        raw_result = await self._call_downstream(operation, request_args, timeout)
+        if not isinstance(raw_result, Mapping):
+            raw_result = _decode_json_step(raw_result)
+        if not isinstance(raw_result, Mapping):
+            raw_result = {}
+        # Only the parts of the result that are actually consumed get JSON-decoded:
+        # the fields referenced by response rules, or structuredContent.
         structured_payload = None
         if operation.response_rules:
             structured_payload = _evaluate_rules(
                 operation.response_rules,
-                decoded_result,
+                raw_result,
                 label=f"{self.definition.name}:{operation.value}:response",
+                decode=True,
             )
         else:
-            structured_content = decoded_result.get("structuredContent")
+            structured_content = _decode_json_like(
+                _decode_json_step(raw_result.get("structuredContent")),
+                max_chars=_DECODE_MAX_CHARS,
+            )
             if isinstance(structured_content, Mapping):
                 structured_payload = structured_content
-        proxy_content = decoded_result.get("content")
+        proxy_content = raw_result.get("content")
         content_blocks = _convert_content_blocks(proxy_content)
         if not content_blocks:
-            fallback_body = structured_payload if structured_payload is not None else decoded_result
+            fallback_body = (
+                structured_payload
+                if structured_payload is not None
+                else _decode_json_like(raw_result, max_chars=_DECODE_MAX_CHARS)
+            )
             content_blocks = [_fallback_text_block(fallback_body)]
         if debug_enabled:
-            snapshot_result = _debug_repr(decoded_result)
+            snapshot_result = _debug_repr(raw_result)
             LOGGER.info(
                 "Debug aggregated tool %s operation=%s result=%s",
                 self.definition.name,
@@ -767,23 +1014,47 @@ class AggregatedToolRunner:
         return content_blocks
 
 
-def _decode_json_like(value: Any) -> Any:
+def _decode_json_step(value: Any) -> Any:
+    """Parse `value` if it is a JSON object/array string, without recursing."""
+
     if isinstance(value, str):
         text = value.strip()
         if text and text[0] in {"{", "["}:
             try:
-                parsed = json.loads(text)
+                return json.loads(text)
             except json.JSONDecodeError:
                 return value
-            return _decode_json_like(parsed)
-        return value
-    if isinstance(value, list):
-        return [_decode_json_like(item) for item in value]
-    if isinstance(value, Mapping):
-        return {key: _decode_json_like(val) for key, val in value.items()}
     return value
 
 
+def _decode_json_like(value: Any, *, max_chars: int | None = None) -> Any:
+    """Recursively decode JSON-looking strings.
+
+    `max_chars` only bounds the `text` of `content` blocks, which can hold whole
+    files; structured and selected values are always decoded.
+    """
+
+    def _walk(node: Any, in_content: bool, is_text: bool) -> Any:
+        if isinstance(node, str):
+            if is_text and max_chars and len(node) > max_chars:
+                LOGGER.debug("Left %d-char content text undecoded (limit %d)", len(node), max_chars)
+                return node
+            parsed = _decode_json_step(node)
+            if parsed is node:
+                return node
+            return _walk(parsed, in_content, False)
+        if isinstance(node, list):
+            return [_walk(item, in_content, False) for item in node]
+        if isinstance(node, Mapping):
+            return {
+                key: _walk(val, in_content or key == "content", in_content and key == "text")
+                for key, val in node.items()
+            }
+        return node
+
+    return _walk(value, False, False)
+
+
 def _convert_content_blocks(raw_content: Any) -> list[types.Content]:
     blocks: list[types.Content] = []
     if isinstance(raw_content, list):
@@ -877,26 +1148,28 @@ def load_tool_aggregation_config(
 def merge_aggregation_payload(base: Any, overlay: Any) -> Any:
     if not isinstance(base, dict) or not isinstance(overlay, dict):
         return overlay
-    result = json.loads(json.dumps(base, ensure_ascii=False))
+    # Copy untouched base values once; merged keys are rebuilt from the originals
+    # below (each branch copies what it keeps), so nothing is copied twice.
+    result = {key: None if key in overlay else copy_json(value) for key, value in base.items()}
     for key, value in overlay.items():
         if key == "aggregations" and isinstance(value, list):
-            existing = result.get(key)
+            existing = base.get(key)
             result[key] = _merge_named_list(existing if isinstance(existing, list) else [], value, lambda item: str(item.get("name") or "").strip())
         elif key == "hiddenTools" and isinstance(value, list):
-            existing = result.get(key)
+            existing = base.get(key)
             result[key] = _merge_named_list(
                 existing if isinstance(existing, list) else [],
                 value,
                 lambda item: f"{item.get('server')}::{item.get('tool')}" if item.get("server") and item.get("tool") else None,
             )
         elif isinstance(value, dict):
-            existing = result.get(key)
+            existing = base.get(key)
             if isinstance(existing, dict):
                 result[key] = deep_merge(existing, value)
             else:
-                result[key] = json.loads(json.dumps(value, ensure_ascii=False))
+                result[key] = copy_json(value)
         else:
-            result[key] = json.loads(json.dumps(value, ensure_ascii=False))
+            result[key] = copy_json(value)
     return result
 
 
@@ -911,7 +1184,7 @@ def _merge_named_list(base_list: Sequence[Mapping[str, Any]], overlay_list: Sequ
                 continue
             if key not in merged:
                 order.append(key)
-            merged[key] = json.loads(json.dumps(item, ensure_ascii=False))
+            merged[key] = copy_json(item)
 
     _ingest(base_list)
     _ingest(overlay_list)
@@ -1003,18 +1276,75 @@ def _lookup_path(data: Mapping[str, Any], path: str) -> Any:
     return current
 
 
-def _assign_path(dest: MutableMapping[str, Any], path: str, value: Any) -> None:
-    parts = [part for part in path.split(".") if part]
+def _compile_getter(path: str) -> PathGetter:
+    """Pre-split a dotted source path into a lookup closure (see `_lookup_path`).
+
+    With `decode=True` the closure parses JSON strings it has to descend through
+    and decodes the selected value, leaving the rest of the payload untouched.
+    """
+
+    if path in {"", ".", "$"}:
+
+        def get_root(data: Any, decode: bool = False) -> Any:
+            if decode:
+                return _decode_json_like(data, max_chars=_DECODE_MAX_CHARS)
+            return data
+
+        return get_root
+    parts = tuple(part for part in path.split(".") if part)
+
+    def get_path(data: Any, decode: bool = False) -> Any:
+        current = data
+        for part in parts:
+            if decode:
+                current = _decode_json_step(current)
+            if isinstance(current, Mapping) and part in current:
+                current = current[part]
+            else:
+                return None
+        if decode:
+            return _decode_json_like(current, max_chars=_DECODE_MAX_CHARS)
+        return current
+
+    return get_path
+
+
+def _compile_setter(path: str) -> PathSetter:
+    """Pre-split a dotted target path into an assignment closure.
+
+    Values are assigned by reference, so an intermediate mapping may belong to the
+    caller's payload. When `owned` (ids of mappings the result created) is given, any
+    intermediate mapping not in it is shallow-copied before being written into.
+    """
+
+    parts = tuple(part for part in path.split(".") if part)
     if not parts:
         raise ToolAggregationError("mapping rule target must not be empty")
-    cursor: MutableMapping[str, Any] = dest
-    for part in parts[:-1]:
-        next_value = cursor.get(part)
-        if not isinstance(next_value, MutableMapping):
-            next_value = {}
-            cursor[part] = next_value
-        cursor = next_value  # type: ignore[assignment]
-    cursor[parts[-1]] = copy.deepcopy(value)
+    parents, leaf = parts[:-1], parts[-1]
+
+    def assign(dest: MutableMapping[str, Any], value: Any, owned: set[int] | None = None) -> None:
+        cursor = dest
+        for part in parents:
+            next_value = cursor.get(part)
+            if not isinstance(next_value, MutableMapping):
+                next_value = {}
+                cursor[part] = next_value
+                if owned is not None:
+                    owned.add(id(next_value))
+            elif owned is not None and id(next_value) not in owned:
+                next_value = dict(next_value)
+                cursor[part] = next_value
+                owned.add(id(next_value))
+            cursor = next_value
+        cursor[leaf] = value
+
+    return assign
+
+
+def _copy_config_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
 
 
 def _evaluate_rules(
@@ -1022,15 +1352,17 @@ def _evaluate_rules(
     data: Mapping[str, Any],
     *,
     label: str,
+    decode: bool = False,
 ) -> Dict[str, Any]:
     if not rules:
-        return copy.deepcopy(data if isinstance(data, Mapping) else {})
+        return dict(data) if isinstance(data, Mapping) else {}
     result: Dict[str, Any] = {}
+    owned = {id(result)}
     for rule in rules:
-        value = rule.resolve(data, label=label)
+        value = rule.resolve(data, label=label, decode=decode)
         if value is _SKIP:
             continue
-        _assign_path(result, rule.target, value)
+        rule.assign(result, value, owned)
     return result
 
 
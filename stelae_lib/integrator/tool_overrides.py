@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
 from typing import Any, Dict, Iterable, Sequence
@@ -9,6 +10,8 @@ from stelae_lib.config_overlays import deep_merge
 from stelae_lib.fileio import atomic_write
 from .discovery import ToolInfo
 
+_ABSENT = object()
+
 
 class ToolOverridesStore:
     def __init__(
@@ -44,6 +47,7 @@ class ToolOverridesStore:
 
         self._legacy_global_tools: Dict[str, Dict[str, Any]] = {}
         self._legacy_master_tools: Dict[str, Dict[str, Any]] = {}
+        self._undo: Dict[str, Any] | None = None
         self._ensure_roots(self._base_data)
         self._ensure_roots(self._overlay_data)
 
@@ -106,7 +110,14 @@ class ToolOverridesStore:
             if metadata is not None and not isinstance(metadata, dict):
                 fragment["metadata"] = {}
 
+    def _record_undo(self, server_name: str) -> None:
+        if self._undo is None or server_name in self._undo["servers"]:
+            return
+        previous = self._data.get("servers", {}).get(server_name, _ABSENT)
+        self._undo["servers"][server_name] = previous if previous is _ABSENT else copy.deepcopy(previous)
+
     def _ensure_tool_block(self, server_name: str, tool_name: str) -> Dict[str, Any]:
+        self._record_undo(server_name)
         servers = self._data.setdefault("servers", {})
         server_block = servers.setdefault(server_name, {"enabled": True, "tools": {}})
         server_block.setdefault("tools", {})
@@ -217,6 +228,7 @@ class ToolOverridesStore:
         source: str | None,
     ) -> bool:
         changed = False
+        self._record_undo(server_name)
         server_block = self._data.setdefault("servers", {}).setdefault(server_name, {"enabled": True, "tools": {}})
         tool_map: Dict[str, Dict[str, Any]] = server_block.setdefault("tools", {})
         metadata = server_block.setdefault("metadata", {})
@@ -252,6 +264,7 @@ class ToolOverridesStore:
         servers = self._data.setdefault("servers", {})
         if server_name not in servers:
             return False
+        self._record_undo(server_name)
         del servers[server_name]
         return True
 
@@ -302,7 +315,7 @@ class ToolOverridesStore:
         merged = deep_merge(self._base_data, self._overlay_data)
         sanitized = _dedupe_schema_arrays(merged)
         self._prune_empty_servers(sanitized)
-        return json.loads(json.dumps(sanitized, ensure_ascii=False))
+        return sanitized
 
     def _prune_empty_servers(self, payload: Dict[str, Any]) -> None:
         servers = payload.get("servers")
@@ -319,6 +332,29 @@ class ToolOverridesStore:
         for name in empty:
             servers.pop(name, None)
 
+    def checkpoint(self) -> Dict[str, Any]:
+        """Start an undo log so a failed change can be rolled back.
+
+        Each server block is copied the first time a change touches it, so the cost
+        follows the change rather than the size of the overrides.
+        """
+
+        self._undo = {
+            "servers": {},
+            "legacy": (dict(self._legacy_master_tools), dict(self._legacy_global_tools)),
+        }
+        return self._undo
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        servers = self._data.setdefault("servers", {})
+        for name, previous in state["servers"].items():
+            if previous is _ABSENT:
+                servers.pop(name, None)
+            else:
+                servers[name] = previous
+        self._legacy_master_tools, self._legacy_global_tools = state["legacy"]
+        self._undo = None
+
     def snapshot(self) -> Dict[str, Any]:
         return json.loads(json.dumps(self._data, ensure_ascii=False))
 
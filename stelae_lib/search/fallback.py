@@ -0,0 +1,385 @@
+"""Parallel pure-Python search used when ripgrep is not installed.
+
+Files are walked in sorted order, honoring `.gitignore`/`.ignore` files and glob
+filters, then scanned in batches on a process pool. Each file is memory-mapped and
+searched with a byte-level regex, so no file is decoded or split into lines. Batches
+are consumed in submission order, which keeps results deterministic regardless of
+which worker finishes first.
+"""
+
+from __future__ import annotations
+
+import atexit
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path, PurePosixPath
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_WORKERS = max(1, int(os.getenv("STELAE_SEARCH_WORKERS", str(os.cpu_count() or 1))))
+# Below this many candidate files, pool start-up costs more than it saves.
+PARALLEL_MIN_FILES = 256
+BATCH_FILES = 64
+BINARY_SNIFF_BYTES = 8192
+MAX_SNIPPET_BYTES = 4096
+IGNORE_FILES = (".gitignore", ".ignore")
+ALWAYS_SKIP = frozenset({".git"})
+
+_COUNT_CHUNK = 1 << 20
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+_EXECUTOR_WORKERS = 0
+
+
+@dataclass(frozen=True)
+class FallbackMatch:
+    path: str
+    line: int
+    col: int
+    text: str
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out: List[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            out.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            out.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            close = pattern.find("]", index + 1)
+            if close == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[index + 1 : close]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                index = close
+        else:
+            out.append(re.escape(char))
+        index += 1
+    return "".join(out)
+
+
+def _compile_ignore_line(line: str) -> _IgnoreRule | None:
+    line = line.rstrip("\r\n")
+    if not line.endswith("\\ "):
+        line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    body = _glob_to_regex(line.lstrip("/"))
+    prefix = "" if anchored else "(?:.*/)?"
+    return _IgnoreRule(re.compile(f"^{prefix}{body}$"), negate, dir_only)
+
+
+def _load_ignore_rules(directory: Path) -> List[_IgnoreRule]:
+    rules: List[_IgnoreRule] = []
+    for name in IGNORE_FILES:
+        try:
+            text = (directory / name).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        for line in text.splitlines():
+            rule = _compile_ignore_line(line)
+            if rule is not None:
+                rules.append(rule)
+    return rules
+
+
+def _ignored(layers: Sequence[Tuple[str, List[_IgnoreRule]]], rel: str, is_dir: bool) -> bool:
+    """Apply every ignore file from the root down; the last matching rule wins."""
+
+    ignored = False
+    for base, rules in layers:
+        sub = rel[len(base) + 1 :] if base else rel
+        for rule in rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(sub):
+                ignored = not rule.negate
+    return ignored
+
+
+def split_globs(globs: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Split glob filters into includes and `!`-prefixed excludes."""
+
+    globs = list(globs)
+    include = [pattern for pattern in globs if not pattern.startswith("!")]
+    exclude = [pattern[1:] for pattern in globs if pattern.startswith("!")]
+    return include, exclude
+
+
+def glob_allows(rel: str, include: Sequence[str], exclude: Sequence[str]) -> bool:
+    path = PurePosixPath(rel)
+    if any(path.match(pattern) for pattern in exclude):
+        return False
+    return not include or any(path.match(pattern) for pattern in include)
+
+
+def iter_files(root: Path, globs: Iterable[str] = (), *, respect_ignore: bool = True) -> Iterator[Tuple[str, str]]:
+    """Yield `(relative posix path, absolute path)` for every candidate file, in sorted order.
+
+    Globs use `Path.match` semantics; a leading `!` turns a glob into an exclusion.
+    Symlinked directories are not followed and `.git` is always skipped.
+    """
+
+    include, exclude = split_globs(globs)
+    stack: List[Tuple[Path, str, List[Tuple[str, List[_IgnoreRule]]]]] = [(root, "", [])]
+    while stack:
+        directory, rel_dir, layers = stack.pop()
+        if respect_ignore:
+            rules = _load_ignore_rules(directory)
+            if rules:
+                layers = [*layers, (rel_dir, rules)]
+        try:
+            with os.scandir(directory) as handle:
+                entries = sorted(handle, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = entry.is_file()
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name in ALWAYS_SKIP or (layers and _ignored(layers, rel, True)):
+                    continue
+                subdirs.append((Path(entry.path), rel, layers))
+            elif is_file:
+                if layers and _ignored(layers, rel, False):
+                    continue
+                if glob_allows(rel, include, exclude):
+                    yield rel, entry.path
+        # Files of a directory come before its subdirectories, which are visited in name order.
+        stack.extend(reversed(subdirs))
+
+
+@lru_cache(maxsize=32)
+def _compile(pattern: bytes, flags: int) -> re.Pattern[bytes]:
+    return re.compile(pattern, flags)
+
+
+def _count_newlines(view: mmap.mmap, end: int, start: int = 0) -> int:
+    count = 0
+    for offset in range(start, end, _COUNT_CHUNK):
+        count += view[offset : min(end, offset + _COUNT_CHUNK)].count(b"\n")
+    return count
+
+
+def scan_file(path: str, regex: re.Pattern[bytes]) -> Optional[Tuple[int, int, str]]:
+    """Return `(line, byte column, line text)` for the first match, or None.
+
+    Empty files and files with a NUL byte in their first 8 KiB are skipped as binary.
+    """
+
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if view.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                    return None
+                match = regex.search(view)
+                if match is None:
+                    return None
+                start = match.start()
+                line_start = view.rfind(b"\n", 0, start) + 1
+                line_end = view.find(b"\n", start)
+                if line_end == -1:
+                    line_end = len(view)
+                line_no = _count_newlines(view, line_start) + 1
+                snippet = view[line_start : min(line_end, line_start + MAX_SNIPPET_BYTES)]
+    except (OSError, ValueError):
+        return None
+    return line_no, start - line_start + 1, snippet.decode("utf-8", errors="replace").strip()
+
+
+def scan_file_lines(path: str, regex: re.Pattern[bytes], limit: int) -> List[Tuple[int, int, str]]:
+    """Like `scan_file`, but return up to `limit` matching lines, each reported once."""
+
+    found: List[Tuple[int, int, str]] = []
+    if limit <= 0:
+        return found
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return found
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if view.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                    return found
+                counted = line_no = 0
+                position = 0
+                while len(found) < limit:
+                    match = regex.search(view, position)
+                    if match is None:
+                        break
+                    start = match.start()
+                    line_start = view.rfind(b"\n", 0, start) + 1
+                    line_end = view.find(b"\n", start)
+                    if line_end == -1:
+                        line_end = len(view)
+                    line_no += _count_newlines(view, line_start, counted)
+                    counted = line_start
+                    snippet = view[line_start : min(line_end, line_start + MAX_SNIPPET_BYTES)]
+                    text = snippet.decode("utf-8", errors="replace").strip()
+                    found.append((line_no + 1, start - line_start + 1, text))
+                    position = line_end + 1
+    except (OSError, ValueError):
+        pass
+    return found
+
+
+def scan_batch(batch: Sequence[Tuple[str, str]], pattern: bytes, flags: int) -> List[FallbackMatch]:
+    regex = _compile(pattern, flags)
+    matches: List[FallbackMatch] = []
+    for rel, path in batch:
+        found = scan_file(path, regex)
+        if found is not None:
+            matches.append(FallbackMatch(rel, *found))
+    return matches
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+        shutdown()
+        # spawn: the search runs in a worker thread, where forking is unsafe.
+        _EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _EXECUTOR_WORKERS = workers
+    return _EXECUTOR
+
+
+def shutdown() -> None:
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
+
+atexit.register(shutdown)
+
+
+def _batches(files: Iterable[Tuple[str, str]]) -> Iterator[List[Tuple[str, str]]]:
+    iterator = iter(files)
+    while batch := list(islice(iterator, BATCH_FILES)):
+        yield batch
+
+
+def search(
+    root: Path,
+    query: str,
+    *,
+    globs: Sequence[str] = (),
+    max_results: int,
+    deadline: float | None = None,
+    workers: int | None = None,
+    respect_ignore: bool = True,
+) -> Tuple[List[FallbackMatch], bool]:
+    """Find the first case-insensitive occurrence of `query` in each file under `root`.
+
+    Returns up to `max_results` matches in walk order and whether the search stopped
+    early, either because enough matches were found or `deadline` (a
+    `time.perf_counter()` value) passed.
+    """
+
+    pattern = re.escape(query.encode("utf-8"))
+    flags = re.IGNORECASE
+    files = iter_files(root, globs, respect_ignore=respect_ignore)
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+    head = list(islice(files, PARALLEL_MIN_FILES))
+    matches: List[FallbackMatch] = []
+
+    def _take(found: List[FallbackMatch]) -> bool:
+        matches.extend(found[: max_results - len(matches)])
+        return len(matches) >= max_results
+
+    def _expired() -> bool:
+        return deadline is not None and time.perf_counter() >= deadline
+
+    if workers == 1 or len(head) < PARALLEL_MIN_FILES:
+        for batch in _batches(chain(head, files)):
+            if _expired():
+                return matches, True
+            if _take(scan_batch(batch, pattern, flags)):
+                return matches, True
+        return matches, False
+
+    executor = _executor(workers)
+    window: Deque[Tuple[List[Tuple[str, str]], Future[List[FallbackMatch]]]] = deque()
+
+    def _submit(batch: List[Tuple[str, str]]) -> Future[List[FallbackMatch]]:
+        try:
+            return executor.submit(scan_batch, batch, pattern, flags)
+        except BrokenProcessPool:
+            shutdown()
+            done: Future[List[FallbackMatch]] = Future()
+            done.set_result(scan_batch(batch, pattern, flags))
+            return done
+
+    def _collect() -> bool:
+        batch, future = window.popleft()
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            found = future.result(timeout=timeout)
+        except FutureTimeout:
+            return True
+        except BrokenProcessPool:
+            # A worker died; finish this batch here rather than losing its matches.
+            shutdown()
+            found = scan_batch(batch, pattern, flags)
+        return _take(found)
+
+    try:
+        for batch in _batches(chain(head, files)):
+            if _expired():
+                return matches, True
+            window.append((batch, _submit(batch)))
+            if len(window) >= workers * 2 and _collect():
+                return matches, True
+        while window:
+            if _collect():
+                return matches, True
+        return matches, False
+    finally:
+        for _, future in window:
+            future.cancel()
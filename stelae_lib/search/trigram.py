@@ -0,0 +1,393 @@
+"""Persistent trigram index over a workspace, kept in SQLite under the state home.
+
+Every text file's lower-cased byte trigrams are stored as posting lists. A query
+intersects the postings of its own trigrams and only the surviving candidate files
+are opened and verified with the fallback scanner, so repeated searches skip
+everything that cannot match. The index refreshes incrementally: a refresh walks the
+tree (honoring ignore files unless told not to), re-reads only files whose mtime or
+size changed, and drops files that disappeared. Every search first runs such a
+refresh, which for an unchanged tree is only a stat sweep, so files written just
+before a query are always found; a sweep cut short by the query's deadline makes
+the answer incomplete rather than silently stale.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from stelae_lib.config_overlays import state_home
+
+from .fallback import BINARY_SNIFF_BYTES, FallbackMatch, glob_allows, iter_files, scan_file_lines, split_globs
+
+INDEX_VERSION = "1"
+MAX_INDEXED_BYTES = int(os.getenv("STELAE_SEARCH_INDEX_MAX_FILE_BYTES", str(1024 * 1024)))
+# Refreshes commit their changes in batches of this many files, so searches can
+# read the index between batches instead of waiting for the whole walk.
+REFRESH_BATCH_FILES = 256
+
+KIND_TEXT = "text"
+KIND_LARGE = "large"  # too big to index; always a candidate
+KIND_BINARY = "binary"  # never a candidate
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram BLOB NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+"""
+
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def default_index_path(root: Path, *, respect_ignore: bool = True) -> Path:
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    suffix = "" if respect_ignore else "-all"
+    return state_home() / "search-index" / f"{digest}{suffix}.sqlite"
+
+
+def is_literal(query: str) -> bool:
+    """Whether `query` means the same thing as a regex and as a literal string."""
+
+    return not any(char in _REGEX_METACHARS for char in query)
+
+
+def trigrams(data: bytes) -> Set[bytes]:
+    lowered = data.lower()
+    return {lowered[index : index + 3] for index in range(len(lowered) - 2)}
+
+
+@dataclass(frozen=True)
+class RefreshStats:
+    scanned: int
+    added: int
+    updated: int
+    removed: int
+    seconds: float
+    complete: bool = True
+
+    def to_data(self) -> Dict[str, Any]:
+        return {
+            "scanned": self.scanned,
+            "added": self.added,
+            "updated": self.updated,
+            "removed": self.removed,
+            "seconds": round(self.seconds, 3),
+            "complete": self.complete,
+        }
+
+
+class TrigramIndex:
+    """Trigram index for one search root. Safe to share between threads."""
+
+    def __init__(
+        self,
+        root: Path,
+        path: Path | None = None,
+        *,
+        respect_ignore: bool = True,
+        max_file_bytes: int = MAX_INDEXED_BYTES,
+    ) -> None:
+        self.root = root.resolve()
+        self.path = path or default_index_path(self.root, respect_ignore=respect_ignore)
+        self.respect_ignore = respect_ignore
+        self.max_file_bytes = max_file_bytes
+        # `_lock` guards the connection and is held only for short reads and batch
+        # writes; `_refresh_lock` keeps refreshes from overlapping.
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        # `time.perf_counter()` at the start of the last complete refresh: that walk
+        # saw every change made before this moment.
+        self._synced_from: float | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        expected = {"version": INDEX_VERSION, "root": str(self.root), "ignore": str(int(self.respect_ignore))}
+        if any(meta.get(key) != value for key, value in expected.items()):
+            with conn:
+                conn.execute("DELETE FROM postings")
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM meta")
+                conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", expected.items())
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _read(self, path: str, size: int) -> Tuple[str, Set[bytes]]:
+        if size > self.max_file_bytes:
+            return KIND_LARGE, set()
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read(self.max_file_bytes + 1)
+        except OSError:
+            return KIND_LARGE, set()
+        if len(data) > self.max_file_bytes:
+            return KIND_LARGE, set()
+        if b"\0" in data[:BINARY_SNIFF_BYTES]:
+            return KIND_BINARY, set()
+        return KIND_TEXT, trigrams(data)
+
+    def refresh(self, *, deadline: float | None = None) -> RefreshStats:
+        """Bring the index in line with the tree, re-reading only changed files.
+
+        When `deadline` (a `time.perf_counter()` value) passes, the walk stops and
+        the files indexed so far are kept; vanished files are only dropped, and the
+        refresh clock only restarts, once a walk completes.
+        """
+
+        started = time.perf_counter()
+        scanned = added = updated = removed = 0
+        complete = True
+        with self._refresh_lock:
+            with self._lock:
+                rows = self._connect().execute("SELECT id, path, mtime_ns, size FROM files").fetchall()
+            known = {path: (file_id, mtime, size) for file_id, path, mtime, size in rows}
+            seen: Set[str] = set()
+            batch: List[Tuple[str, Tuple[int, int, int] | None, os.stat_result, str, Set[bytes]]] = []
+            for rel, path in iter_files(self.root, respect_ignore=self.respect_ignore):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    complete = False
+                    break
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                scanned += 1
+                seen.add(rel)
+                row = known.get(rel)
+                if row is not None and row[1] == stat.st_mtime_ns and row[2] == stat.st_size:
+                    continue
+                if row is None:
+                    added += 1
+                else:
+                    updated += 1
+                batch.append((rel, row, stat, *self._read(path, stat.st_size)))
+                if len(batch) >= REFRESH_BATCH_FILES:
+                    self._write_batch(batch)
+                    batch = []
+            self._write_batch(batch)
+            if complete:
+                with self._lock:
+                    conn = self._connect()
+                    with conn:
+                        for rel in known.keys() - seen:
+                            file_id = known[rel][0]
+                            conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                            conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                            removed += 1
+                        conn.execute(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)", (str(time.time()),)
+                        )
+                    self._synced_from = started
+        return RefreshStats(scanned, added, updated, removed, time.perf_counter() - started, complete)
+
+    def _write_batch(
+        self, batch: Sequence[Tuple[str, Tuple[int, int, int] | None, os.stat_result, str, Set[bytes]]]
+    ) -> None:
+        if not batch:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for rel, row, stat, kind, grams in batch:
+                    if row is None:
+                        file_id = conn.execute(
+                            "INSERT INTO files (path, mtime_ns, size, kind) VALUES (?, ?, ?, ?)",
+                            (rel, stat.st_mtime_ns, stat.st_size, kind),
+                        ).lastrowid
+                    else:
+                        file_id = row[0]
+                        conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                        conn.execute(
+                            "UPDATE files SET mtime_ns = ?, size = ?, kind = ? WHERE id = ?",
+                            (stat.st_mtime_ns, stat.st_size, kind, file_id),
+                        )
+                    conn.executemany(
+                        "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                        ((gram, file_id) for gram in grams),
+                    )
+
+    def rebuild(self) -> RefreshStats:
+        with self._refresh_lock:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM postings")
+                    conn.execute("DELETE FROM files")
+                    conn.execute("DELETE FROM meta WHERE key = 'refreshed_at'")
+                self._synced_from = None
+            return self.refresh()
+
+    def candidates(self, query: str) -> List[str]:
+        """Paths that may contain `query`, ordered by path; may include false positives."""
+
+        grams = sorted(trigrams(query.encode("utf-8")))
+        with self._lock:
+            conn = self._connect()
+            if not grams:
+                rows = conn.execute("SELECT path FROM files WHERE kind != ? ORDER BY path", (KIND_BINARY,))
+            else:
+                placeholders = ",".join("?" for _ in grams)
+                rows = conn.execute(
+                    f"""
+                    SELECT path FROM files WHERE id IN (
+                        SELECT file_id FROM postings WHERE trigram IN ({placeholders})
+                        GROUP BY file_id HAVING COUNT(*) = ?
+                    ) OR kind = ?
+                    ORDER BY path
+                    """,
+                    (*grams, len(grams), KIND_LARGE),
+                )
+            return [path for (path,) in rows]
+
+    def _prepare(self, deadline: float | None) -> bool:
+        """Bring the index up to date before answering; return True when it may be stale.
+
+        Concurrent queries share one refresh: a query that waited while another ran a
+        complete refresh which started after this query arrived reuses its result.
+        When `deadline` passes before the refresh finishes (or before this query can
+        start one), the index is answered from as-is and reported as incomplete.
+        """
+
+        arrived = time.perf_counter()
+        if deadline is None:
+            self._refresh_lock.acquire()
+        else:
+            remaining = deadline - arrived
+            if remaining <= 0 or not self._refresh_lock.acquire(timeout=remaining):
+                return True
+        try:
+            if self._synced_from is not None and self._synced_from >= arrived:
+                return False
+            return not self.refresh(deadline=deadline).complete
+        finally:
+            self._refresh_lock.release()
+
+    def search(
+        self,
+        query: str,
+        *,
+        globs: Sequence[str] = (),
+        max_results: int,
+        deadline: float | None = None,
+        ignore_case: bool = True,
+        per_file: int = 1,
+    ) -> Tuple[List[FallbackMatch], bool]:
+        """Find up to `per_file` lines containing the literal `query` in each file.
+
+        Only candidate files are opened. Same result shape as `fallback.search`,
+        ordered by path and line. The boolean is True when the search stopped early
+        or the index could not be brought up to date before `deadline`.
+        """
+
+        incomplete = self._prepare(deadline)
+        include, exclude = split_globs(globs)
+        regex = re.compile(re.escape(query.encode("utf-8")), re.IGNORECASE if ignore_case else 0)
+        matches: List[FallbackMatch] = []
+        for rel in self.candidates(query):
+            if not glob_allows(rel, include, exclude):
+                continue
+            if deadline is not None and time.perf_counter() >= deadline:
+                return matches, True
+            limit = min(per_file, max_results - len(matches))
+            for found in scan_file_lines(str(self.root / rel), regex, limit):
+                matches.append(FallbackMatch(rel, *found))
+            if len(matches) >= max_results:
+                return matches, True
+        return matches, incomplete
+
+    def inspect(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            kinds = dict(conn.execute("SELECT kind, COUNT(*) FROM files GROUP BY kind"))
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            (postings,) = conn.execute("SELECT COUNT(*) FROM postings").fetchone()
+            (distinct,) = conn.execute("SELECT COUNT(DISTINCT trigram) FROM postings").fetchone()
+        refreshed = meta.get("refreshed_at")
+        return {
+            "root": str(self.root),
+            "index": str(self.path),
+            "files": sum(kinds.values()),
+            "kinds": kinds,
+            "trigrams": distinct,
+            "postings": postings,
+            "bytes": self._disk_bytes(),
+            "refreshedAt": float(refreshed) if refreshed else None,
+        }
+
+    def vacuum(self) -> Dict[str, Any]:
+        """Drop entries for files that vanished, then compact the database file."""
+
+        before = self._disk_bytes()
+        removed = 0
+        with self._lock:
+            conn = self._connect()
+            stale = [
+                file_id
+                for file_id, path in conn.execute("SELECT id, path FROM files").fetchall()
+                if not (self.root / path).is_file()
+            ]
+            with conn:
+                for file_id in stale:
+                    conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    removed += 1
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"removed": removed, "bytesBefore": before, "bytesAfter": self._disk_bytes()}
+
+    def _disk_bytes(self) -> int:
+        total = 0
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                total += os.stat(f"{self.path}{suffix}").st_size
+            except OSError:
+                continue
+        return total
+
+
+_INDEXES: Dict[str, TrigramIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def shared_index(root: Path, *, respect_ignore: bool = True) -> TrigramIndex:
+    """Process-wide index for `root`, so every caller shares one connection and refresh clock."""
+
+    key = str(root.resolve()) if respect_ignore else f"{root.resolve()}:all"
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = TrigramIndex(root, respect_ignore=respect_ignore)
+            _INDEXES[key] = index
+        return index
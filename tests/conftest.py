@@ -1,11 +1,17 @@
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+# The streamable bridge opens its file log at import time; keep test runs out of the repo's logs/.
+os.environ.setdefault(
+    "STELAE_STREAMABLE_STDIO_LOG", str(Path(tempfile.gettempdir()) / "stelae-tests" / "stelae_stdio_bridge.log")
+)
+
 import pytest  # noqa: E402
 from stelae_lib import config_overlays  # noqa: E402
 
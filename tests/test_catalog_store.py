@@ -151,3 +151,50 @@ def test_catalog_store_respects_server_flags(tmp_path: Path, monkeypatch: pytest
     assert one_mcp.get("enabled") is False
     facade = store.tool_overrides.get("servers", {}).get("facade", {})
     assert facade.get("enabled") is False
+
+
+def test_catalog_store_reuses_cached_merge(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from stelae_lib.catalog import store as store_module
+
+    config_dir = tmp_path / "config-home"
+    _write(config_dir / "catalog" / "core.json", {"tool_overrides": {"servers": {"demo": {"enabled": True}}}})
+    _write(
+        config_dir / "catalog" / "extras.json",
+        {"tool_overrides": {"servers": {"demo": {"tools": {"beta": {"enabled": False}}}}}},
+    )
+    _write(config_dir / "bundles" / "one" / "catalog.json", {"hide_tools": [{"server": "demo", "tool": "gamma"}]})
+    monkeypatch.setenv("STELAE_CONFIG_HOME", str(config_dir))
+    config_overlays.config_home.cache_clear()
+    config_overlays.state_home.cache_clear()
+
+    loaded: list[str] = []
+    original_loader = store_module._load_fragment_payload
+
+    def _tracking_loader(path: Path) -> dict:
+        loaded.append(path.parent.name if path.name == "catalog.json" else path.stem)
+        return original_loader(path)
+
+    monkeypatch.setattr(store_module, "_load_fragment_payload", _tracking_loader)
+
+    first = load_catalog_store()
+    assert loaded == ["core", "extras", "one"]
+    assert (config_dir / ".state" / "catalog-build" / "index.json").exists()
+
+    loaded.clear()
+    second = load_catalog_store()
+    assert loaded == []
+    assert second.tool_overrides == first.tool_overrides
+    assert second.tool_aggregations == first.tool_aggregations
+    assert second.hide_tools == first.hide_tools
+    assert {"server": "demo", "tool": "gamma"} in second.hide_tools
+
+    _write(
+        config_dir / "catalog" / "extras.json",
+        {"tool_overrides": {"servers": {"demo": {"tools": {"beta": {"enabled": True}}}}}},
+    )
+    loaded.clear()
+    third = load_catalog_store()
+    # Only the changed fragment and those merged after it are re-read.
+    assert loaded == ["extras", "one"]
+    assert third.tool_overrides["servers"]["demo"]["tools"]["beta"]["enabled"] is True
+    assert third.tool_overrides == load_catalog_store(use_cache=False).tool_overrides
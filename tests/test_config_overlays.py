@@ -12,10 +12,12 @@ if str(ROOT) not in sys.path:
 
 from stelae_lib.config_overlays import (
     config_home,
+    deep_merge,
     ensure_bundle_catalog,
     ensure_config_home_scaffold,
     ensure_overlay_from_defaults,
     load_layered_env,
+    merge_layers,
     parse_env_file,
     server_enabled,
     state_home,
@@ -129,3 +131,26 @@ def test_validate_home_path_rejects_outside_home(monkeypatch, tmp_path: Path) ->
     outside = tmp_path / "other" / "file.json"
     with pytest.raises(ValueError):
         validate_home_path(outside, label="outside", allow_config=True, allow_state=True)
+
+
+def test_merge_layers_matches_pairwise_deep_merge_without_sharing() -> None:
+    base = {"servers": {"fs": {"tools": {"read": {"enabled": True}}, "args": ["a"]}}, "version": 1}
+    overlay = {"servers": {"fs": {"tools": {"write": {"enabled": False}}, "args": ["b"]}, "sh": {"enabled": True}}}
+    replace = {"servers": {"sh": "disabled"}, "version": 2}
+    before = json.dumps([base, overlay, replace])
+
+    merged = merge_layers(base, overlay, replace)
+
+    assert merged == deep_merge(deep_merge(base, overlay), replace)
+    assert merged == {
+        "servers": {
+            "fs": {"tools": {"read": {"enabled": True}, "write": {"enabled": False}}, "args": ["a", "b"]},
+            "sh": "disabled",
+        },
+        "version": 2,
+    }
+    assert json.dumps([base, overlay, replace]) == before
+    merged["servers"]["fs"]["tools"]["read"]["enabled"] = False
+    merged["servers"]["fs"]["args"].append("c")
+    assert base["servers"]["fs"]["tools"]["read"]["enabled"] is True
+    assert overlay["servers"]["fs"]["args"] == ["b"]
@@ -56,3 +56,149 @@ def test_env_override_respected(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     loaded_path, specs = server._load_specs()
     assert loaded_path == custom_path
     assert len(specs) == 1
+
+
+def test_tools_run_concurrently_with_caps_and_timeouts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+    import time
+
+    server = _reload_server(monkeypatch, tmp_path / "config-home")
+    sleeper = server.ToolSpec.from_dict(
+        {
+            "name": "sleeper",
+            "command": sys.executable,
+            "args": ["-c", "import json,sys,time; args=json.load(sys.stdin); time.sleep(0.3); print(args['tag'])"],
+        }
+    )
+    chatty = server.ToolSpec.from_dict(
+        {
+            "name": "chatty",
+            "command": sys.executable,
+            "args": ["-c", "import sys; sys.stdout.write('x' * 200000)"],
+            "maxOutputBytes": 1024,
+        }
+    )
+    stuck = server.ToolSpec.from_dict(
+        {"name": "stuck", "command": sys.executable, "args": ["-c", "import time; time.sleep(30)"], "timeout": 0.2}
+    )
+    single = server.ToolSpec.from_dict(
+        {
+            "name": "single",
+            "command": sys.executable,
+            "args": ["-c", "import time; time.sleep(0.2)"],
+            "inputMode": "none",
+            "maxConcurrency": 1,
+        }
+    )
+
+    async def _scenario():
+        started = time.monotonic()
+        tags = await asyncio.gather(*(sleeper.arun({"tag": f"t{index}"}) for index in range(4)))
+        overlapped = time.monotonic() - started
+        output = await chatty.arun({})
+        with pytest.raises(RuntimeError, match="timed out"):
+            await stuck.arun({})
+        started = time.monotonic()
+        await asyncio.gather(single.arun({}), single.arun({}))
+        serialized = time.monotonic() - started
+        return tags, overlapped, output, serialized
+
+    tags, overlapped, output, serialized = asyncio.run(_scenario())
+    assert tags == ["t0", "t1", "t2", "t3"]
+    assert overlapped < 1.0
+    assert output.startswith("x" * 1024) and output.endswith("[truncated 198976 bytes]")
+    assert serialized >= 0.4
+
+
+WORKER_SCRIPT = """
+import json, os, sys, time
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("method") == "ping":
+        reply = {"id": request["id"], "result": "pong"}
+    else:
+        args = request["arguments"]
+        print("log noise", flush=True)
+        if args.get("sleep"):
+            time.sleep(args["sleep"])
+        if args.get("fail"):
+            reply = {"id": request["id"], "error": "bad input"}
+        else:
+            reply = {"id": request["id"], "result": {"pid": os.getpid(), "worker": os.environ.get("STELAE_TOOL_WORKER")}}
+    print(json.dumps(reply), flush=True)
+"""
+
+
+def test_worker_mode_reuses_recycles_and_reaps(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+    import signal
+
+    server = _reload_server(monkeypatch, tmp_path / "config-home")
+    spec = server.ToolSpec.from_dict(
+        {
+            "name": "resident",
+            "command": sys.executable,
+            "args": ["-c", WORKER_SCRIPT],
+            "inputMode": "worker",
+            "timeout": 1,
+            "workerMaxRequests": 2,
+            "workerIdleSeconds": 0.2,
+        }
+    )
+
+    async def _call(arguments):
+        return json.loads(await spec.arun(arguments))
+
+    async def _scenario():
+        replies = [await _call({}) for _ in range(4)]
+        with pytest.raises(RuntimeError, match="bad input"):
+            await spec.arun({"fail": True})
+        pool = server._POOLS["resident"]
+        os.kill(pool.snapshot()["pids"][0], signal.SIGKILL)
+        await asyncio.sleep(0.05)
+        after_crash = await _call({})
+        with pytest.raises(RuntimeError, match="timed out"):
+            await spec.arun({"sleep": 5})
+        recovered = await _call({})
+        await asyncio.sleep(0.5)
+        return replies, after_crash, recovered, pool.snapshot()
+
+    replies, after_crash, recovered, snapshot = asyncio.run(_scenario())
+    pids = [reply["pid"] for reply in replies]
+    assert all(reply["worker"] == "1" for reply in replies)
+    assert pids[0] == pids[1] and pids[2] == pids[3] and pids[0] != pids[2]
+    assert after_crash["pid"] not in pids
+    assert recovered["pid"] != after_crash["pid"]
+    assert snapshot["live"] == 0 and snapshot["spawned"] == 5
+
+
+def test_shutdown_kills_live_and_retiring_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    server = _reload_server(monkeypatch, tmp_path / "config-home")
+    spec = server.ToolSpec.from_dict(
+        {
+            "name": "lingering",
+            "command": sys.executable,
+            # Keeps running after stdin closes, so retirement alone never ends it.
+            "args": ["-c", WORKER_SCRIPT + "time.sleep(30)\n"],
+            "inputMode": "worker",
+            "timeout": 5,
+            "workerMaxRequests": 2,
+        }
+    )
+
+    async def _scenario():
+        for _ in range(3):
+            await spec.arun({})
+        pool = server._POOLS["lingering"]
+        procs = [worker.proc for worker in pool._retiring.values()] + [worker.proc for worker in pool._live]
+        assert len(procs) == 2 and all(proc.returncode is None for proc in procs)
+        server.shutdown_workers()
+        codes = await asyncio.wait_for(asyncio.gather(*(proc.wait() for proc in procs)), timeout=5)
+        await asyncio.sleep(0)
+        return codes, pool._retiring, server._POOLS
+
+    codes, retiring, pools = asyncio.run(_scenario())
+    assert all(code is not None and code < 0 for code in codes)
+    assert retiring == {} and pools == {}
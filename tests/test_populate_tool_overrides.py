@@ -60,3 +60,55 @@ def test_iter_stdio_servers_filters_non_stdio():
     assert names == {"fs", "implicit_stdio"}
     for _, entry in servers:
         assert entry["command"] in {"fs-server", "rg-server"}
+
+
+def test_populate_from_stdio_bounds_concurrency_and_caches(tmp_path: Path, monkeypatch):
+    import asyncio
+
+    from mcp import types
+
+    from scripts import populate_tool_overrides as module
+
+    active = 0
+    peak = 0
+    spawned: list[str] = []
+
+    async def fake_fetch_tools(command, args, env):
+        nonlocal active, peak
+        spawned.append(command)
+        active += 1
+        peak = max(peak, active)
+        try:
+            if command == "hang":
+                await asyncio.sleep(10)
+            await asyncio.sleep(0.01)
+        finally:
+            active -= 1
+        schema = {"type": "object", "properties": {"result": {"type": "string"}}}
+        return [types.Tool(name=f"{command}_tool", inputSchema={"type": "object"}, outputSchema=schema)]
+
+    monkeypatch.setattr(module, "fetch_tools", fake_fetch_tools)
+    config = {"mcpServers": {name: {"command": name} for name in ("a", "b", "c", "d", "hang")}}
+    cache = module.ListToolsCache(tmp_path / "cache.json")
+    store = ToolOverridesStore(tmp_path / "overrides.json")
+
+    updates = asyncio.run(
+        module.populate_from_stdio(
+            config, store, set(), ("outputSchema",), True, concurrency=2, timeout=0.2, cache=cache
+        )
+    )
+    assert updates == 4
+    assert peak == 2
+    assert sorted(spawned) == ["a", "b", "c", "d", "hang"]
+
+    spawned.clear()
+    reloaded = module.ListToolsCache(tmp_path / "cache.json")
+    fresh_store = ToolOverridesStore(tmp_path / "fresh.json")
+    updates = asyncio.run(
+        module.populate_from_stdio(
+            config, fresh_store, set(), ("outputSchema",), True, concurrency=2, timeout=0.2, cache=reloaded
+        )
+    )
+    # Cached servers are not spawned again; the one that timed out is retried.
+    assert spawned == ["hang"]
+    assert updates == 4
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from stelae_lib.search import fallback
+
+
+def _tree(root: Path) -> None:
+    (root / ".gitignore").write_text("build/\n*.log\n!keep.log\n", encoding="utf-8")
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / ".ignore").write_text("generated_*.py\n", encoding="utf-8")
+    (root / "build").mkdir()
+    (root / ".git").mkdir()
+    (root / "a.py").write_text("first\nsecond Needle here\nneedle again\n", encoding="utf-8")
+    (root / "debug.log").write_text("needle\n", encoding="utf-8")
+    (root / "keep.log").write_text("needle kept\n", encoding="utf-8")
+    (root / "build" / "out.py").write_text("needle\n", encoding="utf-8")
+    (root / ".git" / "config").write_text("needle\n", encoding="utf-8")
+    (root / "pkg" / "generated_api.py").write_text("needle\n", encoding="utf-8")
+    (root / "pkg" / "blob.bin").write_bytes(b"needle\0\x01\x02")
+    (root / "pkg" / "empty.txt").write_text("", encoding="utf-8")
+    (root / "pkg" / "notes.md").write_text("no match\n", encoding="utf-8")
+    for index in range(12):
+        (root / "pkg" / "sub" / f"m{index:02}.py").write_text(f"x = 1\ny = 'needle {index}'\n", encoding="utf-8")
+
+
+def test_fallback_honors_ignores_binaries_and_globs(tmp_path: Path) -> None:
+    _tree(tmp_path)
+
+    matches, truncated = fallback.search(tmp_path, "needle", max_results=50, workers=1)
+    paths = [match.path for match in matches]
+    assert not truncated
+    assert paths[:2] == ["a.py", "keep.log"]
+    assert paths[2:] == [f"pkg/sub/m{index:02}.py" for index in range(12)]
+    assert (matches[0].line, matches[0].col, matches[0].text) == (2, 8, "second Needle here")
+
+    only_py, _ = fallback.search(tmp_path, "needle", globs=["*.py", "!m1*.py"], max_results=50, workers=1)
+    assert [match.path for match in only_py] == ["a.py", *[f"pkg/sub/m0{index}.py" for index in range(10)]]
+
+    capped, truncated = fallback.search(tmp_path, "needle", max_results=3, workers=1)
+    assert truncated and [match.path for match in capped] == paths[:3]
+
+    unignored, _ = fallback.search(tmp_path, "needle", max_results=50, workers=1, respect_ignore=False)
+    assert {"debug.log", "build/out.py", "pkg/generated_api.py"} <= {match.path for match in unignored}
+    assert not any(match.path.startswith(".git/") or match.path.endswith(".bin") for match in unignored)
+
+
+def test_parallel_fallback_matches_serial_order(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _tree(tmp_path)
+    serial, _ = fallback.search(tmp_path, "needle", max_results=50, workers=1)
+    monkeypatch.setattr(fallback, "PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(fallback, "BATCH_FILES", 2)
+    try:
+        parallel, truncated = fallback.search(tmp_path, "needle", max_results=50, workers=2)
+        capped, capped_truncated = fallback.search(tmp_path, "needle", max_results=5, workers=2)
+    finally:
+        fallback.shutdown()
+    assert parallel == serial and not truncated
+    assert capped == serial[:5] and capped_truncated
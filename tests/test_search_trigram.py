@@ -0,0 +1,186 @@
+import asyncio
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from stelae_lib import config_overlays
+from stelae_lib.search import trigram
+from stelae_lib.search.trigram import TrigramIndex
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_index_narrows_candidates_and_updates_incrementally(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    _write(root, ".gitignore", "dist/\n")
+    _write(root, "src/alpha.py", "def handle_request():\n    return 'Needle'\n")
+    _write(root, "src/beta.py", "nothing to see\n")
+    _write(root, "docs/guide.md", "search for the needle here\n")
+    _write(root, "dist/bundle.js", "needle\n")
+    (root / "data.bin").write_bytes(b"needle\0")
+    index = TrigramIndex(root, tmp_path / "index.sqlite", max_file_bytes=1024)
+    _write(root, "big.log", "needle " * 200)
+
+    first = index.refresh()
+    assert (first.added, first.updated, first.removed) == (6, 0, 0)
+    assert index.candidates("needle") == ["big.log", "docs/guide.md", "src/alpha.py"]
+    matches, truncated = index.search("NEEDLE", globs=["*.py", "*.md"], max_results=10)
+    assert not truncated
+    assert [(match.path, match.line, match.text) for match in matches] == [
+        ("docs/guide.md", 1, "search for the needle here"),
+        ("src/alpha.py", 2, "return 'Needle'"),
+    ]
+    exact, _ = index.search("needle", globs=["*.py"], max_results=10, ignore_case=False)
+    assert exact == []
+
+    assert index.refresh().to_data()["added"] == 0
+    _write(root, "src/beta.py", "now with a needle\n")
+    os.utime(root / "src" / "beta.py", ns=(1, 1))
+    (root / "docs" / "guide.md").unlink()
+    _write(root, "src/gamma.py", "needle\n")
+    second = index.refresh()
+    assert (second.added, second.updated, second.removed) == (1, 1, 1)
+    assert index.candidates("needle") == ["big.log", "src/alpha.py", "src/beta.py", "src/gamma.py"]
+
+    stats = index.inspect()
+    assert stats["files"] == 6 and stats["kinds"] == {"binary": 1, "large": 1, "text": 4}
+    (root / "src" / "gamma.py").unlink()
+    vacuumed = index.vacuum()
+    assert vacuumed["removed"] == 1 and vacuumed["bytesAfter"] > 0
+    index.close()
+
+    moved = TrigramIndex(tmp_path / "elsewhere", tmp_path / "index.sqlite")
+    assert moved.inspect()["files"] == 0
+    moved.close()
+
+
+def test_cli_and_search_server_use_the_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    root = tmp_path / "repo"
+    _write(root, "notes.txt", "alpha\nimportant needle here\n")
+    index_path = tmp_path / "index.sqlite"
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+    cli = importlib.import_module("scripts.stelae_search_index")
+
+    cli.main(["build", "--root", str(root), "--index", str(index_path)])
+    built = json.loads(capsys.readouterr().out)
+    assert built["added"] == 1 and built["files"] == 1 and built["trigrams"] > 0
+    cli.main(["inspect", "--root", str(root), "--index", str(index_path)])
+    assert json.loads(capsys.readouterr().out)["postings"] == built["postings"]
+
+    # Without --index the CLI prebuilds exactly the database the search servers open.
+    monkeypatch.setenv("STELAE_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("STELAE_STATE_HOME", str(tmp_path / "config" / ".state"))
+    config_overlays.config_home.cache_clear()
+    config_overlays.state_home.cache_clear()
+    cli.main(["build", "--root", str(root)])
+    assert json.loads(capsys.readouterr().out)["index"] == str(TrigramIndex(root, respect_ignore=False).path)
+
+    monkeypatch.setenv("STELAE_SEARCH_ROOT", str(root))
+    monkeypatch.setenv("STELAE_SEARCH_INDEX", "1")
+    sys.modules.pop("scripts.stelae_search_mcp", None)
+    server = importlib.import_module("scripts.stelae_search_mcp")
+    shared = TrigramIndex(root, index_path, respect_ignore=False)
+    monkeypatch.setitem(trigram._INDEXES, f"{root.resolve()}:all", shared)
+    rg_queries: list[str] = []
+
+    async def fake_rg(query, globs, max_results, deadline):
+        rg_queries.append(query)
+        return [], False
+
+    monkeypatch.setattr(server, "_rg_available", lambda: True)
+    monkeypatch.setattr(server, "_search_rg", fake_rg)
+    try:
+        payload = json.loads(asyncio.run(server.search("needle")).content[0].text)
+        # Case-sensitive like rg, and regex queries still go to rg.
+        assert json.loads(asyncio.run(server.search("NEEDLE")).content[0].text)["results"] == []
+        asyncio.run(server.search("need.e"))
+    finally:
+        shared.close()
+    assert [item["id"] for item in payload["results"]] == ["repo:notes.txt#L2"]
+    assert payload["truncated"] is False
+    assert rg_queries == ["need.e"]
+
+
+def test_search_reports_every_matching_line_when_asked(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    _write(root, "a.txt", "needle one\nnothing\nneedle two needle\n")
+    _write(root, "b.txt", "needle three\n")
+    index = TrigramIndex(root, tmp_path / "index.sqlite")
+    try:
+        first, _ = index.search("needle", max_results=10)
+        every, truncated = index.search("needle", max_results=10, per_file=10)
+        capped, capped_truncated = index.search("needle", max_results=2, per_file=10)
+    finally:
+        index.close()
+    assert [(match.path, match.line) for match in first] == [("a.txt", 1), ("b.txt", 1)]
+    assert [(match.path, match.line, match.col) for match in every] == [("a.txt", 1, 1), ("a.txt", 3, 1), ("b.txt", 1, 1)]
+    assert not truncated
+    assert [(match.path, match.line) for match in capped] == [("a.txt", 1), ("a.txt", 3)] and capped_truncated
+
+
+def test_search_sees_files_changed_since_the_last_refresh(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    _write(root, "a.txt", "nothing here\n")
+    index = TrigramIndex(root, tmp_path / "index.sqlite")
+    try:
+        index.refresh()
+        _write(root, "b.txt", "needle\n")
+        found, truncated = index.search("needle", max_results=10, deadline=time.perf_counter() + 5)
+        assert [match.path for match in found] == ["b.txt"] and not truncated
+
+        _write(root, "a.txt", "now a needle too\n")
+        os.utime(root / "a.txt", ns=(1, 1))
+        found, truncated = index.search("needle", max_results=10)
+        assert [match.path for match in found] == ["a.txt", "b.txt"] and not truncated
+
+        # A sweep that cannot finish before the deadline marks the answer incomplete.
+        _write(root, "c.txt", "needle\n")
+        found, truncated = index.search("needle", max_results=10, deadline=time.perf_counter())
+        assert truncated
+    finally:
+        index.close()
+
+
+def test_concurrent_searches_share_one_refresh(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    root = tmp_path / "repo"
+    _write(root, "a.txt", "needle\n")
+    index = TrigramIndex(root, tmp_path / "index.sqlite")
+    refreshes: list[float] = []
+    refresh = index.refresh
+
+    def counting_refresh(**kwargs):
+        refreshes.append(time.perf_counter())
+        time.sleep(0.1)
+        return refresh(**kwargs)
+
+    monkeypatch.setattr(index, "refresh", counting_refresh)
+    try:
+        index._refresh_lock.acquire()
+        threads = [
+            threading.Thread(target=index.search, args=("needle",), kwargs={"max_results": 5}) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        index._refresh_lock.release()
+        for thread in threads:
+            thread.join(5)
+    finally:
+        index.close()
+    # The first waiter refreshes; the others arrived before that refresh began and reuse it.
+    assert len(refreshes) == 1
@@ -297,6 +297,48 @@ def test_discover_servers_overwrite(monkeypatch, integrator_workspace):
     assert [entry["name"] for entry in data] == ["newserver"]
 
 
+def test_local_discovery_search_ranks_filters_and_tracks_writes(monkeypatch, integrator_workspace):
+    entries = [
+        SAMPLE_DISCOVERY,
+        {
+            "name": "vector_store",
+            "transport": "stdio",
+            "command": "uvx",
+            "description": "Vector search over embeddings",
+            "tags": ["search", "vector"],
+            "tools": [{"name": "vector_search"}],
+        },
+        {"name": "web_fetch", "transport": "stdio", "command": "npx", "description": "Fetch web pages for search"},
+    ]
+    _write_json(integrator_workspace["discovery"], entries)
+
+    def _no_backend(*_args, **_kwargs):
+        raise AssertionError("local search must not load the 1mcp backend")
+
+    monkeypatch.setattr(core_module, "OneMCPDiscovery", _no_backend)
+    service = _service(integrator_workspace)
+    response = service.dispatch("discover_servers", {"query": "vector search", "source": "local"})
+    assert response["status"] == "ok"
+    names = [server["name"] for server in response["details"]["servers"]]
+    assert names[:2] == ["vector_store", "web_fetch"]
+    scores = [server["score"] for server in response["details"]["servers"]]
+    assert scores == sorted(scores, reverse=True)
+
+    filtered = service.dispatch("list_discovered_servers", {"query": "search", "tags": "vector"})
+    assert [server["name"] for server in filtered["details"]["servers"]] == ["vector_store"]
+    strict = service.dispatch("list_discovered_servers", {"query": "search", "min_score": 100})
+    assert strict["details"]["servers"] == []
+    index_path = integrator_workspace["discovery"].with_name("discovered_servers.index.json")
+    assert index_path.exists()
+
+    updated = service._load_discovery_data()
+    updated[0]["description"] = "Vector demo with vector helpers"
+    service._persist_discovery_data(updated, dry_run=False)
+    assert service.discovery_store.index.is_current([integrator_workspace["discovery"]])
+    after = service.dispatch("list_discovered_servers", {"query": "helpers", "limit": 1})
+    assert [server["name"] for server in after["details"]["servers"]] == ["demo_server"]
+
+
 def test_run_wraps_errors(integrator_workspace):
     service = _service(integrator_workspace)
     response = service.run("unknown_op", {})
@@ -311,3 +353,228 @@ def test_restart_defaults_skip_cloudflared(monkeypatch, integrator_workspace):
     assert "run_restart_stelae.sh" in restart_command[0]
     assert "--no-cloudflared" in restart_command
     assert "--full" not in restart_command
+
+
+def test_command_runner_streams_output_and_runs_stages_concurrently(tmp_path: Path):
+    import sys
+    import time
+
+    from stelae_lib.integrator.runner import CommandFailed, CommandRunner
+
+    lines: list[tuple[str, str]] = []
+    runner = CommandRunner(tmp_path, on_output=lambda command, line: lines.append((command[-1], line)))
+    sleeper = [sys.executable, "-c", "import sys, time; time.sleep(0.5); print(sys.argv[1])"]
+
+    started = time.monotonic()
+    results = runner.pipeline([[sleeper + ["a"], sleeper + ["b"]], [sleeper[:2] + ["print('done')", "c"]]])
+    elapsed = time.monotonic() - started
+
+    assert [result.status for result in results] == ["ok", "ok", "ok"]
+    assert [result.output for result in results] == ["a\n", "b\n", "done\n"]
+    assert elapsed < 1.0, "commands within a stage should overlap"
+    assert sorted(lines) == [("a", "a"), ("b", "b"), ("c", "done")]
+
+    with pytest.raises(CommandFailed) as excinfo:
+        runner.sequence([[sys.executable, "-c", "print('boom'); raise SystemExit(3)"], ["false-never-runs"]])
+    assert excinfo.value.result.returncode == 3
+    assert excinfo.value.result.output == "boom\n"
+
+
+def test_restart_log_line_short_circuits_readiness(integrator_workspace):
+    import sys
+
+    from stelae_lib.integrator.runner import CommandRunner
+
+    probes = {"count": 0}
+
+    def _probe():
+        probes["count"] += 1
+        return False
+
+    service = _service(integrator_workspace, CommandRunner(integrator_workspace["root"]), readiness_probe=_probe)
+    service.default_commands = [[sys.executable, "-c", "print('[restart] Tool catalog ready: 12 tools.')"]]
+    results = service._run_commands(dry_run=False)
+    assert results[0]["status"] == "ok"
+    assert probes["count"] == 0
+
+
+def test_batch_applies_operations_with_single_write_and_restart(integrator_workspace, monkeypatch):
+    runner = FakeRunner()
+    service = _service(integrator_workspace, runner)
+    template_path = service.template.path
+    before = template_path.read_text(encoding="utf-8")
+
+    other = {"name": "other_server", "transport": "stdio", "command": "echo", "args": ["other"]}
+    with pytest.raises(ValueError, match="batch aborted"):
+        service.dispatch(
+            "batch",
+            {
+                "operations": [
+                    {"operation": "install_server", "params": {"name": "demo_server"}},
+                    {"operation": "remove_server", "params": {"name": "missing"}},
+                ]
+            },
+        )
+    assert template_path.read_text(encoding="utf-8") == before
+    assert runner.invocations == []
+
+    writes: list[str] = []
+    original_write = core_module.ProxyTemplate.write
+
+    def _counting_write(self):
+        writes.append(str(self.path))
+        original_write(self)
+
+    monkeypatch.setattr(core_module.ProxyTemplate, "write", _counting_write)
+    response = service.dispatch(
+        "batch",
+        {
+            "operations": [
+                {"operation": "install_server", "params": {"name": "demo_server"}},
+                {"operation": "install_server", "params": {"descriptor": other}},
+                {"operation": "remove_server", "params": {"name": "demo_server"}},
+            ]
+        },
+    )
+    assert response["status"] == "ok"
+    assert [item["status"] for item in response["details"]["operations"]] == ["ok", "ok", "ok"]
+    assert len(writes) == 1
+    assert len(runner.invocations) == 1
+    data = json.loads(template_path.read_text(encoding="utf-8"))
+    assert "other_server" in data["mcpServers"]
+    assert "demo_server" not in data["mcpServers"]
+
+    partial = service.dispatch(
+        "batch",
+        {
+            "atomic": False,
+            "dry_run": True,
+            "operations": [
+                {"operation": "remove_server", "params": {"name": "missing"}},
+                {"operation": "remove_server", "params": {"name": "other_server"}},
+            ],
+        },
+    )
+    assert [item["status"] for item in partial["details"]["operations"]] == ["error", "ok"]
+    assert partial["errors"] and "missing" in partial["errors"][0]
+    assert "other_server" in json.loads(template_path.read_text(encoding="utf-8"))["mcpServers"]
+
+
+def test_batch_failures_never_leave_half_staged_changes(integrator_workspace, monkeypatch):
+    runner = FakeRunner()
+    service = _service(integrator_workspace, runner)
+    template_path = service.template.path
+
+    with pytest.raises(ValueError, match="unsupported batch operation"):
+        service.dispatch(
+            "batch",
+            {
+                "operations": [
+                    {"operation": "install_server", "params": {"name": "demo_server"}},
+                    {"operation": "bogus"},
+                ]
+            },
+        )
+    assert "demo_server" not in service.template.snapshot()["mcpServers"]
+
+    other = {"name": "other_server", "transport": "stdio", "command": "echo", "args": ["other"]}
+    service.dispatch("install_server", {"descriptor": other})
+    original_apply = core_module.ToolOverridesStore.apply
+
+    def _failing_apply(self, server_name, *args, **kwargs):
+        if server_name == "demo_server":
+            raise RuntimeError("overrides exploded")
+        return original_apply(self, server_name, *args, **kwargs)
+
+    monkeypatch.setattr(core_module.ToolOverridesStore, "apply", _failing_apply)
+    partial = service.dispatch(
+        "batch",
+        {
+            "atomic": False,
+            "operations": [
+                {"operation": "install_server", "params": {"name": "demo_server"}},
+                {"operation": "remove_server", "params": {"name": "other_server"}},
+            ],
+        },
+    )
+    assert [item["status"] for item in partial["details"]["operations"]] == ["error", "ok"]
+    written = json.loads(template_path.read_text(encoding="utf-8"))["mcpServers"]
+    assert "demo_server" not in written and "other_server" not in written
+
+
+def test_checkpoint_restore_undoes_only_the_failed_change(tmp_path: Path):
+    from stelae_lib.integrator.discovery import ToolInfo
+    from stelae_lib.integrator.proxy_template import ProxyTemplate
+    from stelae_lib.integrator.tool_overrides import ToolOverridesStore
+
+    overrides = ToolOverridesStore(tmp_path / "tool_overrides.json")
+    overrides.apply("kept", [ToolInfo(name="read", description="Read")], server_description=None, source=None)
+    before = overrides.render()
+    state = overrides.checkpoint()
+    overrides.disable_tool("kept", "read")
+    overrides.apply("added", [ToolInfo(name="write", description="Write")], server_description="New", source=None)
+    overrides.remove_server("kept")
+    overrides.restore(state)
+    assert overrides.render() == before
+    assert list(state["servers"]) == ["kept", "added"]
+
+    template = ProxyTemplate(tmp_path / "proxy.template.json")
+    template.upsert("kept", {"command": "echo"})
+    before = template.render()
+    state = template.checkpoint()
+    template.upsert("added", {"command": "cat"})
+    template.remove("kept")
+    template.restore(state)
+    assert template.render() == before
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 64])
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [12.5, 3],
+        [1e5, 2],
+        [-0.25, 1.5e-3, 7, 100],
+        [{"score": 2.75e10}, 3.0, "x"],
+    ],
+)
+def test_iter_json_array_never_splits_numbers_at_chunk_boundaries(tmp_path: Path, chunk_size: int, payload: list):
+    from stelae_lib.integrator.discovery import iter_json_array
+
+    path = tmp_path / "numbers.json"
+    for text in (json.dumps(payload), json.dumps(payload, indent=2)):
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == payload
+
+
+def test_discovery_store_indexes_entries_and_renders_incrementally(tmp_path: Path):
+    from stelae_lib.integrator.discovery import DiscoveryStore, iter_json_array
+
+    base = tmp_path / "base.json"
+    base_entries = [
+        {"name": f"srv-{index}", "transport": "stdio", "command": "npx", "args": [str(index)], "score": index / 3}
+        for index in range(40)
+    ]
+    base.write_text(json.dumps(base_entries, indent=2), encoding="utf-8")
+    assert list(iter_json_array(base, chunk_size=7)) == base_entries
+
+    overlay = tmp_path / "overlay.json"
+    store = DiscoveryStore(base, overlay_path=overlay)
+    entry = store.get("SRV-3")
+    entry.options["mutated"] = True
+    assert "mutated" not in store.get("srv-3").options
+    assert len(store.entries()) == 40
+
+    data = [{"name": "srv-3", "transport": "stdio", "command": "uvx", "description": "ünïcode"}]
+    rendered = store.render(data)
+    assert rendered == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    store.save_overlay(data)
+    assert overlay.read_text(encoding="utf-8") == rendered
+    assert store.get("srv-3").command == "uvx"
+
+    data.append({"name": "extra", "transport": "stdio", "command": "node"})
+    data[0]["description"] = "changed"
+    assert store.render(data) == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    store.save_overlay(data)
+    assert store.get("extra").command == "node"
+    assert store.render([]) == "[]\n"
@@ -5,9 +5,9 @@ import sys
 from pathlib import Path
 
 
-def _import_module(monkeypatch, tmp_path: Path):
+def _import_module(monkeypatch, tmp_path: Path, rg_bin: str = "nonexistent-rg"):
     monkeypatch.setenv("STELAE_SEARCH_ROOT", str(tmp_path))
-    monkeypatch.setenv("STELAE_RG_BIN", "nonexistent-rg")
+    monkeypatch.setenv("STELAE_RG_BIN", rg_bin)
     repo_root = Path(__file__).resolve().parents[1]
     if str(repo_root) not in sys.path:
         sys.path.insert(0, str(repo_root))
@@ -72,3 +72,36 @@ def test_fetch_returns_document(monkeypatch, tmp_path: Path):
     assert document["id"] == "repo:notes.txt#L2"
     assert document["title"] == "notes.txt"
     assert "needle line" in document["text"]
+
+
+def test_search_streams_ripgrep_and_stops_early(monkeypatch, tmp_path: Path):
+    import time
+
+    fake_rg = tmp_path / "fake-rg"
+    fake_rg.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        "root = sys.argv[-1]\n"
+        "for index in range(3):\n"
+        "    print(f'{root}/file{index}.py:{index + 1}:5:needle {index}', flush=True)\n"
+        "print('x' * 100000, flush=True)\n"
+        "time.sleep(30)\n",
+        encoding="utf-8",
+    )
+    fake_rg.chmod(0o755)
+    module = _import_module(monkeypatch, tmp_path / "repo", rg_bin=str(fake_rg))
+
+    started = time.perf_counter()
+    capped = json.loads(asyncio.run(module.search("needle", max_results=2)).content[0].text)
+    capped_elapsed = time.perf_counter() - started
+
+    monkeypatch.setattr(module, "SEARCH_TIMEOUT", 0.5)
+    started = time.perf_counter()
+    partial = json.loads(asyncio.run(module.search("needle", max_results=10)).content[0].text)
+    partial_elapsed = time.perf_counter() - started
+
+    assert [item["id"] for item in capped["results"]] == ["repo:file0.py#L1", "repo:file1.py#L2"]
+    assert capped["truncated"] is True and capped_elapsed < 5
+    assert len(partial["results"]) == 3 and partial["truncated"] is True
+    assert partial["results"][2]["metadata"] == {"snippet": "needle 2"}
+    assert 0.4 < partial_elapsed < 5
@@ -9,6 +9,13 @@ def _stub_tool(name: str) -> py_types.SimpleNamespace:
     return py_types.SimpleNamespace(name=name)
 
 
+@pytest.fixture(autouse=True)
+def _reset_tool_catalog():
+    bridge._reset_tool_catalog()
+    yield
+    bridge._reset_tool_catalog()
+
+
 @pytest.mark.anyio("asyncio")
 async def test_manage_tool_injected_when_proxy_catalog_is_empty(monkeypatch):
     async def fake_rpc(method, *_, **__):
@@ -1,5 +1,7 @@
 import asyncio
 import json
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
@@ -18,6 +20,13 @@ from tests._tool_override_test_helpers import (
 jsonschema = pytest.importorskip("jsonschema")
 
 
+@pytest.fixture(autouse=True)
+def _reset_tool_catalog():
+    hub._reset_tool_catalog()
+    yield
+    hub._reset_tool_catalog()
+
+
 @pytest.fixture(autouse=True)
 def _run_manage_tool_inline(monkeypatch):
     async def _inline_runner(func, *args, **kwargs):
@@ -75,7 +84,7 @@ async def test_search_delegates_to_rg_when_static_disabled(monkeypatch, tmp_path
         ]
     )
 
-    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT):
+    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT, idempotent=False):
         assert server_name == "rg"
         assert tool_name == "grep"
         return hub.CallResult(
@@ -119,7 +128,7 @@ async def test_fetch_falls_back_to_raw(monkeypatch):
         ),
     ]
 
-    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT):
+    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT, idempotent=False):
         call = responses.pop(0)
         if tool_name == "fetch" and arguments.get("raw"):
             assert "raw" in arguments and arguments["raw"] is True
@@ -135,7 +144,7 @@ async def test_fetch_falls_back_to_raw(monkeypatch):
 
 @pytest.mark.anyio("asyncio")
 async def test_fetch_non_json_response(monkeypatch):
-    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT):
+    async def fake_call(server_name, tool_name, arguments, read_timeout=hub.SSE_READ_TIMEOUT, idempotent=False):
         return hub.CallResult(
             content=[types.TextContent(type="text", text="plain text output")],
             structured_content=None,
@@ -354,3 +363,397 @@ def test_rendered_manifest_contains_only_aggregates(tmp_path: Path) -> None:
     assert len(schema["required"]) == len(set(schema["required"]))
     enum_values = schema["properties"]["operation"]["enum"]
     assert len(enum_values) == len(set(enum_values))
+
+
+@pytest.mark.anyio("asyncio")
+async def test_proxy_jsonrpc_reuses_pooled_client(monkeypatch):
+    seen_timeouts: list[Any] = []
+
+    def handler(request):
+        seen_timeouts.append(request.extensions.get("timeout"))
+        body = json.loads(request.content)
+        return hub.httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"ok": True}})
+
+    built: list[Any] = []
+
+    def fake_build():
+        client = hub.httpx.AsyncClient(transport=hub.httpx.MockTransport(handler))
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(hub, "_build_proxy_client", fake_build)
+    monkeypatch.setattr(hub, "_PROXY_CLIENT", None)
+
+    assert await hub._proxy_jsonrpc("tools/list") == {"ok": True}
+    assert await hub._proxy_jsonrpc("tools/call", {"name": "x"}, read_timeout=5.0) == {"ok": True}
+    assert len(built) == 1
+    assert seen_timeouts[1]["read"] == 5.0
+
+    await hub._close_proxy_client()
+    assert built[0].is_closed
+    assert hub._PROXY_CLIENT is None
+
+
+def test_proxy_client_from_another_loop_is_closed_on_its_loop(monkeypatch):
+    def handler(request):
+        return hub.httpx.Response(200, json={})
+
+    def fake_build():
+        return hub.httpx.AsyncClient(transport=hub.httpx.MockTransport(handler))
+
+    monkeypatch.setattr(hub, "_build_proxy_client", fake_build)
+    old_loop = asyncio.new_event_loop()
+    stale = fake_build()
+    monkeypatch.setattr(hub, "_PROXY_CLIENT", stale)
+    monkeypatch.setattr(hub, "_PROXY_CLIENT_LOOP", old_loop)
+
+    async def _rebuild():
+        client = hub._get_proxy_client()
+        await hub._close_proxy_client()
+        return client
+
+    try:
+        fresh = asyncio.run(_rebuild())
+        assert fresh is not stale
+        old_loop.run_until_complete(asyncio.sleep(0.01))
+        assert stale.is_closed
+    finally:
+        old_loop.close()
+
+    # A client whose loop already closed is simply dropped.
+    dropped = fake_build()
+    monkeypatch.setattr(hub, "_PROXY_CLIENT", dropped)
+    monkeypatch.setattr(hub, "_PROXY_CLIENT_LOOP", old_loop)
+    assert asyncio.run(_rebuild()) is not dropped
+
+
+@pytest.mark.anyio("asyncio")
+async def test_proxy_jsonrpc_streams_sse_notifications(monkeypatch):
+    def handler(request):
+        assert "text/event-stream" in request.headers["accept"]
+        body = json.loads(request.content)
+        assert body["params"]["_meta"] == {"progressToken": "tok"}
+        events = [
+            {"jsonrpc": "2.0", "method": "notifications/progress", "params": {"progressToken": "tok", "progress": 1, "message": "chunk-1"}},
+            {"jsonrpc": "2.0", "method": "notifications/message", "params": {"level": "info", "data": "halfway"}},
+            {"jsonrpc": "2.0", "id": body["id"], "result": {"content": [{"type": "text", "text": "done"}]}},
+        ]
+        stream = "".join(f"event: message\ndata: {json.dumps(event)}\n\n" for event in events)
+        return hub.httpx.Response(200, headers={"content-type": "text/event-stream"}, text=stream)
+
+    monkeypatch.setattr(hub, "_build_proxy_client", lambda: hub.httpx.AsyncClient(transport=hub.httpx.MockTransport(handler)))
+    monkeypatch.setattr(hub, "_PROXY_CLIENT", None)
+    forwarded: list[dict] = []
+
+    async def _forward(message):
+        forwarded.append(message)
+
+    monkeypatch.setattr(hub, "_client_notification_forwarder", lambda: (_forward, "tok"))
+    hub._activate_proxy_handlers()
+    hub.PROXY_MODE = True
+    contents = await hub.app.call_tool("slow_tool", {})
+    assert [block.text for block in contents] == ["done"]
+    assert [message["method"] for message in forwarded] == ["notifications/progress", "notifications/message"]
+
+    monkeypatch.setattr(hub, "PROXY_MAX_RESPONSE_BYTES", 16)
+    with pytest.raises(RuntimeError, match="exceeded"):
+        await hub._proxy_jsonrpc("tools/call", {"name": "slow_tool", "_meta": {"progressToken": "tok"}})
+    await hub._close_proxy_client()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_identical_concurrent_requests_share_one_upstream_call(monkeypatch):
+    calls: list[tuple[str, Any]] = []
+
+    async def fake_proxy_jsonrpc(method, params=None, *, read_timeout=None):
+        calls.append((method, params))
+        await anyio.sleep(0.01)
+        if method == "tools/list":
+            return {
+                "tools": [
+                    {"name": "read_file", "inputSchema": {"type": "object"}, "annotations": {"readOnlyHint": True}},
+                    {"name": "write_file", "inputSchema": {"type": "object"}},
+                ]
+            }
+        if method == "prompts/list":
+            return {"prompts": []}
+        return {"content": [{"type": "text", "text": params["arguments"]["path"]}]}
+
+    async def _concurrently(*factories):
+        results: list[Any] = [None] * len(factories)
+
+        async def _run(index, factory):
+            results[index] = await factory()
+
+        async with anyio.create_task_group() as group:
+            for index, factory in enumerate(factories):
+                group.start_soon(_run, index, factory)
+        return results
+
+    hub._activate_proxy_handlers()
+    hub.PROXY_MODE = True
+    monkeypatch.setattr(hub, "_proxy_jsonrpc", fake_proxy_jsonrpc)
+
+    await _concurrently(*([hub.app.list_prompts] * 3))
+    assert [method for method, _ in calls] == ["prompts/list"]
+
+    await hub.app.list_tools()
+    calls.clear()
+    reads = await _concurrently(
+        lambda: hub.app.call_tool("read_file", {"path": "a"}),
+        lambda: hub.app.call_tool("read_file", {"path": "a"}),
+        lambda: hub.app.call_tool("read_file", {"path": "b"}),
+    )
+    assert [blocks[0].text for blocks in reads] == ["a", "a", "b"]
+    assert sorted(params["arguments"]["path"] for _, params in calls) == ["a", "b"]
+
+    calls.clear()
+    await _concurrently(*([lambda: hub.app.call_tool("write_file", {"path": "a"})] * 2))
+    assert len(calls) == 2
+    assert not hub._INFLIGHT
+
+
+@pytest.mark.anyio("asyncio")
+async def test_tool_catalog_cache_reuses_converted_tools(monkeypatch, tmp_path):
+    intended = tmp_path / "intended_catalog.json"
+    intended.write_text("{}", encoding="utf-8")
+    monkeypatch.setenv("INTENDED_CATALOG_PATH", str(intended))
+    monkeypatch.setattr(hub, "CATALOG_CACHE_TTL", 60.0)
+
+    catalog = {"tools": [{"name": "read_file", "inputSchema": {"type": "object"}}]}
+    rpc_calls: list[str] = []
+
+    async def fake_proxy_jsonrpc(method, params=None, *, read_timeout=None):
+        rpc_calls.append(method)
+        return json.loads(json.dumps(catalog))
+
+    conversions: list[Any] = []
+    original_convert = hub._convert_tool_catalog
+
+    def counting_convert(raw_tools):
+        conversions.append(raw_tools)
+        return original_convert(raw_tools)
+
+    notified: list[bool] = []
+
+    async def fake_notify():
+        notified.append(True)
+
+    monkeypatch.setattr(hub, "_proxy_jsonrpc", fake_proxy_jsonrpc)
+    monkeypatch.setattr(hub, "_convert_tool_catalog", counting_convert)
+    monkeypatch.setattr(hub, "_notify_tool_list_changed", fake_notify)
+
+    first = await hub._proxy_list_tools(hub.app)
+    second = await hub._proxy_list_tools(hub.app)
+    assert [tool.name for tool in first] == [tool.name for tool in second]
+    assert rpc_calls == ["tools/list"]
+
+    # Touching intended_catalog.json forces a proxy round-trip; an unchanged
+    # payload hash keeps the converted tools without re-validating them.
+    stat = intended.stat()
+    os.utime(intended, (stat.st_atime, stat.st_mtime + 5))
+    await hub._proxy_list_tools(hub.app)
+    assert rpc_calls == ["tools/list", "tools/list"]
+    assert len(conversions) == 1
+    assert notified == []
+
+    catalog["tools"].append({"name": "write_file", "inputSchema": {"type": "object"}})
+    refreshed = await hub._load_tool_catalog(force=True)
+    assert "write_file" in {tool.name for tool in refreshed}
+    assert len(conversions) == 2
+    assert notified == [True]
+
+
+def test_upstream_session_pool_reuses_initialized_session(monkeypatch):
+    opened: list[str] = []
+    initialized: list[str] = []
+
+    @asynccontextmanager
+    async def fake_sse_client(endpoint, timeout, sse_read_timeout):
+        opened.append(endpoint)
+        yield ("read", "write")
+
+    class FakeSession:
+        def __init__(self, read_stream, write_stream):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def initialize(self):
+            initialized.append("ok")
+
+        async def call_tool(self, name, arguments, read_timeout_seconds=None):
+            await asyncio.sleep(0)
+            return types.CallToolResult(
+                content=[types.TextContent(type="text", text=f"{name}:{arguments['url']}")],
+                isError=False,
+            )
+
+    monkeypatch.setattr(hub, "sse_client", fake_sse_client)
+    monkeypatch.setattr(hub, "ClientSession", FakeSession)
+    monkeypatch.setattr(hub, "SSE_POOL_ENABLED", True)
+
+    async def _runner():
+        results = await asyncio.gather(
+            *(hub._call_upstream_tool("fetch", "fetch", {"url": f"u{idx}"}) for idx in range(4))
+        )
+        assert [r.content[0].text for r in results] == [f"fetch:u{idx}" for idx in range(4)]
+        assert len(opened) == 1
+        assert initialized == ["ok"]
+
+        # A dead stream is replaced on the next call.
+        await hub._upstream_session("fetch").reset()
+        await hub._call_upstream_tool("fetch", "fetch", {"url": "again"})
+        assert len(opened) == 2
+
+        await hub._close_upstream_sessions()
+        assert hub._UPSTREAM_SESSIONS == {}
+
+    asyncio.run(_runner())
+
+
+def test_upstream_session_retries_dropped_connections_only_for_idempotent_calls(monkeypatch):
+    from mcp.shared.exceptions import McpError
+
+    calls: list[str] = []
+    opened: list[str] = []
+
+    @asynccontextmanager
+    async def fake_sse_client(endpoint, timeout, sse_read_timeout):
+        opened.append(endpoint)
+        yield ("read", "write")
+
+    class FakeSession:
+        def __init__(self, read_stream, write_stream):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def initialize(self):
+            pass
+
+        async def call_tool(self, name, arguments, read_timeout_seconds=None):
+            calls.append(name)
+            if len(calls) % 2:
+                raise McpError(types.ErrorData(code=types.CONNECTION_CLOSED, message="Connection closed"))
+            return types.CallToolResult(content=[types.TextContent(type="text", text="ok")], isError=False)
+
+    monkeypatch.setattr(hub, "sse_client", fake_sse_client)
+    monkeypatch.setattr(hub, "ClientSession", FakeSession)
+    monkeypatch.setattr(hub, "SSE_POOL_ENABLED", True)
+
+    async def _runner():
+        result = await hub._call_upstream_tool("fetch", "fetch", {"url": "u"}, idempotent=True)
+        assert result.content[0].text == "ok"
+        assert calls == ["fetch", "fetch"] and len(opened) == 2
+
+        with pytest.raises(McpError):
+            await hub._call_upstream_tool("fs", "write_file", {"path": "p"})
+        assert calls[2:] == ["write_file"]
+        await hub._close_upstream_sessions()
+
+    asyncio.run(_runner())
+
+
+def test_concurrent_failures_on_one_session_reconnect_once(monkeypatch):
+    opened: list[str] = []
+
+    @asynccontextmanager
+    async def fake_sse_client(endpoint, timeout, sse_read_timeout):
+        opened.append(endpoint)
+        yield ("read", "write")
+
+    class FakeSession:
+        def __init__(self, read_stream, write_stream):
+            self.generation = len(opened)
+            self.closed = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+            return False
+
+        async def initialize(self):
+            pass
+
+        async def call_tool(self, name, arguments, read_timeout_seconds=None):
+            if self.generation == 1:
+                # The slower caller notices the dead stream after the faster one reconnected.
+                await asyncio.sleep(0.005 if arguments["url"] == "slow" else 0)
+                raise anyio.ClosedResourceError
+            await asyncio.sleep(0.02)
+            if self.closed:
+                raise anyio.ClosedResourceError
+            return types.CallToolResult(content=[types.TextContent(type="text", text=arguments["url"])], isError=False)
+
+    monkeypatch.setattr(hub, "sse_client", fake_sse_client)
+    monkeypatch.setattr(hub, "ClientSession", FakeSession)
+    monkeypatch.setattr(hub, "SSE_POOL_ENABLED", True)
+
+    async def _runner():
+        results = await asyncio.gather(
+            hub._call_upstream_tool("fetch", "fetch", {"url": "fast"}),
+            hub._call_upstream_tool("fetch", "fetch", {"url": "slow"}),
+        )
+        assert [r.content[0].text for r in results] == ["fast", "slow"]
+        assert len(opened) == 2
+        await hub._close_upstream_sessions()
+
+    asyncio.run(_runner())
+
+
+def test_upstream_sessions_from_another_loop_are_reset_on_their_loop(monkeypatch):
+    sessions: list[Any] = []
+
+    @asynccontextmanager
+    async def fake_sse_client(endpoint, timeout, sse_read_timeout):
+        yield ("read", "write")
+
+    class FakeSession:
+        def __init__(self, read_stream, write_stream):
+            self.closed = False
+            sessions.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+            return False
+
+        async def initialize(self):
+            pass
+
+        async def call_tool(self, name, arguments, read_timeout_seconds=None):
+            return types.CallToolResult(content=[types.TextContent(type="text", text="ok")], isError=False)
+
+    monkeypatch.setattr(hub, "sse_client", fake_sse_client)
+    monkeypatch.setattr(hub, "ClientSession", FakeSession)
+    monkeypatch.setattr(hub, "SSE_POOL_ENABLED", True)
+    monkeypatch.setattr(hub, "_UPSTREAM_SESSIONS", {})
+    monkeypatch.setattr(hub, "_UPSTREAM_SESSIONS_LOOP", None)
+
+    async def _switch():
+        fresh = hub._upstream_session("fetch")
+        await hub._close_upstream_sessions()
+        return fresh
+
+    old_loop = asyncio.new_event_loop()
+    try:
+        old_loop.run_until_complete(hub._call_upstream_tool("fetch", "fetch", {"url": "u"}))
+        stale = hub._UPSTREAM_SESSIONS["fetch"]
+        assert asyncio.run(_switch()) is not stale
+        old_loop.run_until_complete(asyncio.sleep(0.01))
+        assert sessions[0].closed and not stale.connected
+    finally:
+        old_loop.close()
@@ -1,6 +1,7 @@
 import asyncio
 import importlib.util
 import json
+import logging
 import sys
 from pathlib import Path
 from typing import Any
@@ -17,8 +18,10 @@ jsonschema = pytest.importorskip("jsonschema")
 from stelae_lib.config_overlays import config_home, overlay_path_for, state_home
 from stelae_lib.integrator.tool_aggregations import (
     AggregatedToolRunner,
+    MappingRule,
     ToolAggregationConfig,
     ToolAggregationError,
+    _evaluate_rules,
     load_tool_aggregation_config,
 )
 from stelae_lib.integrator.tool_overrides import ToolOverridesStore
@@ -385,6 +388,71 @@ def test_runner_decodes_structured_json_payloads() -> None:
     assert structured["result"]["status"] == "ok"
 
 
+def test_runner_decodes_only_consumed_payload_paths(monkeypatch) -> None:
+    import stelae_lib.integrator.tool_aggregations as aggregations_module
+
+    monkeypatch.setattr(aggregations_module, "_DECODE_MAX_CHARS", 64)
+    big_json = json.dumps({"rows": list(range(50))})
+    config = ToolAggregationConfig.from_data(
+        {
+            "schemaVersion": 1,
+            "aggregations": [
+                {
+                    "name": "demo_aggregate",
+                    "description": "Sample aggregate",
+                    "operations": [
+                        {"value": "read", "downstreamTool": "read_file"},
+                        {
+                            "value": "status",
+                            "downstreamTool": "status_tool",
+                            "responseMappings": [{"target": "result.state", "from": "structuredContent.result.state"}],
+                        },
+                    ],
+                }
+            ],
+        }
+    )
+    aggregation = config.aggregations[0]
+
+    async def fake_call(name: str, arguments: dict[str, Any], timeout: float | None, server_name: str | None):
+        if name == "read_file":
+            return {
+                "content": [{"type": "text", "text": big_json}],
+                "structuredContent": {"result": {"text": big_json, "small": '{"ok": true}'}},
+            }
+        return {
+            "content": [{"type": "text", "text": "done"}],
+            "structuredContent": json.dumps({"result": json.dumps({"state": "{\"phase\": \"idle\"}"})}),
+        }
+
+    runner = AggregatedToolRunner(aggregation, fake_call)
+    contents, structured = asyncio.run(runner.dispatch({"operation": "read"}))
+    assert contents[0].text == big_json
+    assert structured["result"]["text"] == {"rows": list(range(50))}
+    assert structured["result"]["small"] == {"ok": True}
+
+    _, structured = asyncio.run(runner.dispatch({"operation": "status"}))
+    assert structured == {"result": {"state": {"phase": "idle"}}}
+
+
+def test_decode_limit_only_skips_large_content_text() -> None:
+    from stelae_lib.integrator.tool_aggregations import _decode_json_like
+
+    big_json = json.dumps({"rows": list(range(50))})
+    decoded = _decode_json_like(
+        {
+            "content": [{"type": "text", "text": big_json}, {"type": "text", "text": '{"ok": true}'}],
+            "structuredContent": {"result": big_json},
+            "selected": big_json,
+        },
+        max_chars=64,
+    )
+    assert decoded["content"][0]["text"] == big_json
+    assert decoded["content"][1]["text"] == {"ok": True}
+    assert decoded["structuredContent"]["result"] == {"rows": list(range(50))}
+    assert decoded["selected"] == {"rows": list(range(50))}
+
+
 def test_runner_passes_downstream_server() -> None:
     config_data = {
         "schemaVersion": 1,
@@ -428,6 +496,225 @@ def test_runner_passes_downstream_server() -> None:
     assert observed["server"] == "fs"
 
 
+def test_result_cache_serves_reads_and_invalidates_on_writes() -> None:
+    from stelae_lib.integrator.result_cache import ToolResultCache
+
+    def _aggregate(name: str, annotations: dict[str, Any], operations: list[dict[str, Any]], **extra: Any):
+        return {
+            "name": name,
+            "description": name,
+            "annotations": annotations,
+            "inputSchema": {"type": "object", "properties": {"operation": {"type": "string"}}},
+            "operations": operations,
+            **extra,
+        }
+
+    forward_path = [{"target": "path", "from": "path"}]
+    config = ToolAggregationConfig.from_data(
+        {
+            "schemaVersion": 1,
+            "defaults": {"resultCacheTtlSeconds": 60},
+            "aggregations": [
+                _aggregate(
+                    "fs_read",
+                    {"readOnlyHint": True, "idempotentHint": True},
+                    [
+                        {"value": "read", "downstreamTool": "read_file", "downstreamServer": "fs", "argumentMappings": forward_path},
+                        {"value": "tail", "downstreamTool": "tail_file", "downstreamServer": "fs", "cacheTtlSeconds": 0, "argumentMappings": forward_path},
+                    ],
+                ),
+                _aggregate(
+                    "fs_write",
+                    {"destructiveHint": True},
+                    [{"value": "write", "downstreamTool": "write_file", "downstreamServer": "fs", "argumentMappings": forward_path}],
+                ),
+                _aggregate(
+                    "shell",
+                    {"destructiveHint": True},
+                    [{"value": "run", "downstreamTool": "run_command", "downstreamServer": "sh"}],
+                    cache={"invalidates": ["fs"]},
+                ),
+                _aggregate(
+                    "read_only_not_idempotent",
+                    {"readOnlyHint": True},
+                    [{"value": "read", "downstreamTool": "read_file", "downstreamServer": "fs", "argumentMappings": forward_path}],
+                ),
+            ],
+        }
+    )
+    calls: list[tuple[str, Any]] = []
+
+    async def fake_call(name, arguments, timeout, server_name):
+        calls.append((name, arguments.get("path")))
+        return {"content": [{"type": "text", "text": f"{name}:{len(calls)}"}]}
+
+    cache = ToolResultCache(max_bytes=4096)
+    read, write, shell, uncached = (
+        AggregatedToolRunner(aggregation, fake_call, result_cache=cache) for aggregation in config.aggregations
+    )
+
+    async def _scenario() -> list[str]:
+        texts = []
+        for runner, arguments in [
+            (read, {"operation": "read", "path": "a"}),
+            (read, {"operation": "read", "path": "a"}),
+            (read, {"operation": "tail", "path": "a"}),
+            (read, {"operation": "tail", "path": "a"}),
+            (uncached, {"operation": "read", "path": "a"}),
+            (write, {"operation": "write", "path": "a"}),
+            (read, {"operation": "read", "path": "a"}),
+            (shell, {"operation": "run"}),
+            (read, {"operation": "read", "path": "a"}),
+        ]:
+            result = await runner.dispatch(arguments)
+            blocks = result[0] if isinstance(result, tuple) else result
+            texts.append(blocks[0].text)
+        return texts
+
+    texts = asyncio.run(_scenario())
+    assert texts[0] == texts[1] == "read_file:1"
+    assert [name for name, _ in calls] == [
+        "read_file",
+        "tail_file",
+        "tail_file",
+        "read_file",
+        "write_file",
+        "read_file",
+        "run_command",
+        "read_file",
+    ]
+    assert cache.hits == 1
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_result_cache_is_opt_in_per_aggregation() -> None:
+    annotations = {"readOnlyHint": True, "idempotentHint": True}
+    config = ToolAggregationConfig.from_data(
+        {
+            "schemaVersion": 1,
+            "aggregations": [
+                {
+                    "name": name,
+                    "description": name,
+                    "inputSchema": {"type": "object"},
+                    "annotations": annotations,
+                    **extra,
+                    "operations": [{"value": "read", "downstreamTool": "read_file", "downstreamServer": "fs"}],
+                }
+                for name, extra in (("plain", {}), ("cached", {"cache": {"ttlSeconds": 10}}))
+            ],
+        }
+    )
+    plain, cached = config.aggregations
+    assert plain.cache_ttl_for(plain.operations[0]) == 0
+    assert cached.cache_ttl_for(cached.operations[0]) == 10
+
+
+def test_result_cache_evicts_by_bytes_expires_and_fences_stale_reads() -> None:
+    from stelae_lib.integrator.result_cache import ToolResultCache, result_cache_key
+
+    now = [0.0]
+    cache = ToolResultCache(max_bytes=60, clock=lambda: now[0])
+    keys = [result_cache_key("fs", "read_file", {"path": str(index)}) for index in range(3)]
+    for key in keys:
+        assert cache.put(key, {"text": "x" * 10}, server="fs", ttl_seconds=5)
+    assert cache.get(keys[0]) is None and cache.evictions == 1
+    hit = cache.get(keys[2])
+    assert hit == {"text": "x" * 10}
+    hit["text"] = "mutated"
+    assert cache.get(keys[2]) == {"text": "x" * 10}
+    assert not cache.put("big", {"text": "x" * 100}, server="fs", ttl_seconds=5)
+
+    now[0] = 10.0
+    assert cache.get(keys[2]) is None
+
+    generation = cache.generation("fs")
+    cache.invalidate("fs")
+    assert not cache.put(keys[1], {"text": "stale"}, server="fs", ttl_seconds=5, generation=generation)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_concurrency_limits_never_pool_calls_without_a_server() -> None:
+    from stelae_lib.integrator.backpressure import ConcurrencyLimits
+
+    limits = ConcurrencyLimits(default_server_limit=1)
+    assert limits.server_slot(None) is None and limits.server_slot("") is None
+    assert limits.server_slot("mem") is not limits.server_slot("strata")
+
+
+def test_starter_bundle_operations_name_their_downstream_server() -> None:
+    catalog = json.loads((ROOT / "bundles" / "starter" / "catalog.json").read_text(encoding="utf-8"))
+    for aggregation in catalog["toolAggregations"]["aggregations"]:
+        for operation in aggregation["operations"]:
+            assert operation.get("downstreamServer"), (aggregation["name"], operation["value"])
+
+
+def test_runner_bounds_downstream_concurrency_and_fails_fast(caplog) -> None:
+    from stelae_lib.integrator.backpressure import ConcurrencyLimits
+    from stelae_lib.integrator.tool_aggregations import DownstreamBusyError
+
+    config = ToolAggregationConfig.from_data(
+        {
+            "schemaVersion": 1,
+            "defaults": {"serverConcurrency": {"sh": 2}, "queueTimeoutSeconds": 0.05},
+            "aggregations": [
+                {
+                    "name": "shell",
+                    "description": "shell",
+                    "inputSchema": {"type": "object"},
+                    "operations": [{"value": "run", "downstreamTool": "run_command", "downstreamServer": "sh"}],
+                },
+                {
+                    "name": "other",
+                    "description": "other",
+                    "inputSchema": {"type": "object"},
+                    "maxConcurrency": 1,
+                    "queueTimeoutSeconds": 5,
+                    "operations": [{"value": "run", "downstreamTool": "ping", "downstreamServer": "net"}],
+                },
+            ],
+        }
+    )
+    active = {"sh": 0, "net": 0}
+    peak = {"sh": 0, "net": 0}
+
+    async def fake_call(name, arguments, timeout, server_name):
+        active[server_name] += 1
+        peak[server_name] = max(peak[server_name], active[server_name])
+        await asyncio.sleep(0.1 if server_name == "sh" else 0.01)
+        active[server_name] -= 1
+        return {"content": [{"type": "text", "text": "ok"}]}
+
+    limits = ConcurrencyLimits(
+        default_server_limit=config.defaults.max_concurrency_per_server,
+        server_limits=config.defaults.server_concurrency,
+    )
+    shell, other = (AggregatedToolRunner(item, fake_call, limits=limits) for item in config.aggregations)
+
+    async def _scenario():
+        return await asyncio.gather(
+            *(shell.dispatch({"operation": "run"}) for _ in range(3)),
+            *(other.dispatch({"operation": "run"}) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    with caplog.at_level(logging.WARNING, logger="stelae.tool_aggregator"):
+        results = asyncio.run(_scenario())
+    busy = [item for item in results[:3] if isinstance(item, DownstreamBusyError)]
+    assert len(busy) == 1 and "Downstream server 'sh' is saturated" in str(busy[0])
+    assert not any(isinstance(item, Exception) for item in results[3:])
+    assert peak == {"sh": 2, "net": 1}
+    snapshot = limits.snapshot()
+    assert snapshot["server:sh"]["rejected"] == 1
+    assert snapshot["server:sh"]["maxQueued"] == 1
+    assert snapshot["aggregation:other"]["maxQueued"] == 2
+    assert snapshot["aggregation:other"]["acquired"] == 3
+    assert snapshot["server:sh"]["inFlight"] == 0
+    rejections = [record.getMessage() for record in caplog.records if "rejected a call" in record.getMessage()]
+    assert len(rejections) == 1 and rejections[0].startswith("Downstream server 'sh' rejected a call")
+    assert json.loads(rejections[0].split(": ", 1)[1])["rejected"] == 1
+
+
 def test_require_any_of_enforced() -> None:
     config_data = {
         "schemaVersion": 1,
@@ -467,6 +754,68 @@ def test_require_any_of_enforced() -> None:
         asyncio.run(runner.dispatch({"operation": "import"}))
 
 
+def test_operation_index_resolves_aliases_and_rejects_conflicts() -> None:
+    def _config(second_aliases: list[str]) -> dict[str, Any]:
+        return {
+            "schemaVersion": 1,
+            "aggregations": [
+                {
+                    "name": "demo_aggregate",
+                    "description": "Sample aggregate",
+                    "operations": [
+                        {"value": "read_file", "downstreamTool": "read", "aliases": ["Cat"]},
+                        {"value": "list_dir", "downstreamTool": "ls", "aliases": second_aliases},
+                    ],
+                }
+            ],
+        }
+
+    aggregation = ToolAggregationConfig.from_data(_config(["LS"])).aggregations[0]
+    assert set(aggregation.operation_index) == {"read_file", "cat", "list_dir", "ls"}
+    assert aggregation.resolve_operation({"operation": "CAT"}).downstream_tool == "read"
+    assert aggregation.resolve_operation({"operation": "ls"}).downstream_tool == "ls"
+    with pytest.raises(ToolAggregationError, match="Allowed: read_file, list_dir"):
+        aggregation.resolve_operation({"operation": "rm"})
+
+    with pytest.raises(ToolAggregationError, match="maps selector 'cat'"):
+        ToolAggregationConfig.from_data(_config(["cat"]))
+
+
+def test_mapping_rules_share_payload_values_and_copy_literals() -> None:
+    big_entries = [{"name": f"file_{idx}"} for idx in range(3)]
+    data = {"structuredContent": {"result": {"entries": big_entries}}}
+    rules = (
+        MappingRule.from_data({"target": "result.entries", "from": "structuredContent.result.entries"}),
+        MappingRule.from_data({"target": "result.meta", "value": {"source": "literal"}}),
+        MappingRule.from_data({"target": "result.missing", "from": "structuredContent.nope"}),
+    )
+
+    first = _evaluate_rules(rules, data, label="demo")
+    second = _evaluate_rules(rules, data, label="demo")
+    assert first == {"result": {"entries": big_entries, "meta": {"source": "literal"}}}
+    assert first["result"]["entries"] is big_entries
+    first["result"]["meta"]["source"] = "mutated"
+    assert second["result"]["meta"] == {"source": "literal"}
+    assert rules[1].literal == {"source": "literal"}
+
+    with pytest.raises(ToolAggregationError, match="target must not be empty"):
+        MappingRule.from_data({"target": ".", "from": "x"})
+
+
+def test_mapping_rules_never_write_into_shared_payload_mappings() -> None:
+    data = {"a": {"k": 1, "inner": {"z": 0}}}
+    rules = (
+        MappingRule.from_data({"target": "x", "from": "a"}),
+        MappingRule.from_data({"target": "x.y", "value": 2}),
+        MappingRule.from_data({"target": "x.inner.w", "value": 3}),
+    )
+
+    result = _evaluate_rules(rules, data, label="demo")
+
+    assert result == {"x": {"k": 1, "y": 2, "inner": {"z": 0, "w": 3}}}
+    assert data == {"a": {"k": 1, "inner": {"z": 0}}}
+
+
 def test_aggregation_runtime_dedupes_and_hides(tmp_path: Path) -> None:
     fixture = build_sample_runtime(tmp_path)
     servers = fixture.runtime_payload["servers"]
@@ -634,3 +983,287 @@ def test_starter_bundle_aggregations_roundtrip_structured_payloads(
     assert any(isinstance(block, types.TextContent) for block in contents), aggregation_name
     assert structured == structured_sample
     jsonschema.validate(structured, schema)
+
+
+def test_aggregator_shares_pooled_proxy_caller(monkeypatch, tmp_path: Path) -> None:
+    _configure_test_env(monkeypatch, tmp_path / "config")
+    spec = importlib.util.spec_from_file_location("tool_aggregator_server", ROOT / "scripts" / "tool_aggregator_server.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    monkeypatch.setitem(sys.modules, "tool_aggregator_server", module)
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+
+    requests: list[dict[str, Any]] = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        return module.httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"content": []}})
+
+    clients: list[Any] = []
+
+    def fake_client():
+        client = module.httpx.AsyncClient(transport=module.httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(module, "_build_http_client", fake_client)
+
+    first = module._proxy_caller_for("http://127.0.0.1:9090")
+    second = module._proxy_caller_for("http://127.0.0.1:9090/mcp")
+    assert first is second
+
+    async def _runner() -> None:
+        await first("read_file", {"path": "a"}, 5.0, "fs")
+        await first("read_file", {"path": "b"}, None, "fs")
+        await first("list_directory", {"path": "."}, None, None)
+        await module._close_proxy_callers()
+
+    asyncio.run(_runner())
+    assert len(clients) == 1 and clients[0].is_closed
+    assert [item["params"]["arguments"] for item in requests] == [{"path": "a"}, {"path": "b"}, {"path": "."}]
+    assert requests[0]["params"]["serverName"] == "fs"
+    snapshot = first.latency_snapshot()
+    assert snapshot["fs.read_file"]["calls"] == 2
+    assert snapshot["list_directory"]["errors"] == 0
+    assert module._PROXY_CALLERS == {}
+
+
+def _stateful_shell_config(
+    state_root: Path, *, flush_delay: float, storage: str = "inline"
+) -> ToolAggregationConfig:
+    return ToolAggregationConfig.from_data(
+        {
+            "schemaVersion": 1,
+            "aggregations": [
+                {
+                    "name": "shell_suite",
+                    "description": "Stateful shell",
+                    "operations": [
+                        {"value": "execute_command", "downstreamTool": "execute_command"},
+                        {"value": "history", "downstreamTool": "noop"},
+                    ],
+                    "state": {
+                        "path": f"{state_root}/shell.json",
+                        "flushDelaySeconds": flush_delay,
+                        "defaults": {"history": []},
+                        "fields": {"history": {"type": "list", "maxLength": 3, "storage": storage}},
+                        "operations": [
+                            {
+                                "value": "execute_command",
+                                "mutations": [
+                                    {
+                                        "action": "append",
+                                        "key": "history",
+                                        "value": {"command": {"type": "argument", "path": "command"}},
+                                        "maxLength": 3,
+                                    }
+                                ],
+                            },
+                            {
+                                "value": "history",
+                                "mode": "state_only",
+                                "response": {"type": "history", "key": "history"},
+                            },
+                        ],
+                    },
+                }
+            ],
+        }
+    )
+
+
+def test_stateful_runner_coalesces_state_writes(tmp_path: Path) -> None:
+    from stelae_lib.integrator.stateful_runner import StatefulAggregatedToolRunner
+
+    state_root = tmp_path / "state"
+    state_root.mkdir()
+    aggregation = _stateful_shell_config(state_root, flush_delay=30.0).aggregations[0]
+
+    async def fake_call(name: str, arguments: dict[str, Any], timeout: float | None, server_name: str | None):
+        return {"content": [{"type": "text", "text": "ok"}]}
+
+    runner = StatefulAggregatedToolRunner(
+        aggregation,
+        fake_call,
+        fallback_timeout=None,
+        context={"STELAE_DIR": str(tmp_path)},
+        workspace_root=tmp_path,
+        state_root=state_root,
+    )
+    state_file = state_root / "shell.json"
+
+    async def _runner() -> Any:
+        for idx in range(5):
+            await runner.dispatch({"operation": "execute_command", "command": f"cmd{idx}"})
+        assert not state_file.exists(), "writes should be deferred to the flush window"
+        history = await runner.dispatch({"operation": "history"})
+        await runner.aclose()
+        return history
+
+    (_, structured) = asyncio.run(_runner())
+    expected = [{"command": "cmd4"}, {"command": "cmd3"}, {"command": "cmd2"}]
+    assert structured["result"]["commands"] == expected
+    assert json.loads(state_file.read_text(encoding="utf-8")) == {"history": expected}
+
+
+def test_stateful_runner_journals_list_fields(tmp_path: Path) -> None:
+    from stelae_lib.integrator.stateful_runner import StatefulAggregatedToolRunner
+
+    state_root = tmp_path / "state"
+    state_root.mkdir()
+    # Pre-existing inline history is migrated into the journal on first load.
+    (state_root / "shell.json").write_text(json.dumps({"history": [{"command": "old"}]}), encoding="utf-8")
+    aggregation = _stateful_shell_config(state_root, flush_delay=0.0, storage="journal").aggregations[0]
+
+    async def fake_call(name: str, arguments: dict[str, Any], timeout: float | None, server_name: str | None):
+        return {"content": [{"type": "text", "text": "ok"}]}
+
+    def _make_runner() -> StatefulAggregatedToolRunner:
+        return StatefulAggregatedToolRunner(
+            aggregation,
+            fake_call,
+            fallback_timeout=None,
+            context={"STELAE_DIR": str(tmp_path)},
+            workspace_root=tmp_path,
+            state_root=state_root,
+        )
+
+    journal_file = state_root / "shell.history.jsonl"
+
+    async def _runner() -> Any:
+        runner = _make_runner()
+        for idx in range(7):
+            await runner.dispatch({"operation": "execute_command", "command": f"cmd{idx}"})
+            await runner.aclose()
+        return await runner.dispatch({"operation": "history"})
+
+    (_, structured) = asyncio.run(_runner())
+    expected = [{"command": "cmd6"}, {"command": "cmd5"}, {"command": "cmd4"}]
+    assert structured["result"]["commands"] == expected
+    assert "history" not in json.loads((state_root / "shell.json").read_text(encoding="utf-8"))
+    # Eight appends against maxLength 3 compact once the journal exceeds six lines.
+    lines = journal_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 6
+    assert json.loads(lines[-1]) == {"command": "cmd6"}
+
+    async def _reload() -> Any:
+        return await _make_runner().dispatch({"operation": "history"})
+
+    (_, reloaded) = asyncio.run(_reload())
+    assert reloaded["result"]["commands"] == expected
+
+
+def test_stateful_runner_merges_inline_history_into_existing_journal(tmp_path: Path) -> None:
+    from stelae_lib.integrator.stateful_runner import JsonStateStore
+
+    state_root = tmp_path / "state"
+    state_root.mkdir()
+    journal_file = state_root / "shell.history.jsonl"
+    journal_file.write_text(json.dumps({"command": "journaled"}) + "\n", encoding="utf-8")
+    (state_root / "shell.json").write_text(json.dumps({"history": [{"command": "inline"}]}), encoding="utf-8")
+    definition = _stateful_shell_config(state_root, flush_delay=0.0, storage="journal").aggregations[0].state
+    assert definition is not None
+
+    def _open() -> JsonStateStore:
+        return JsonStateStore(
+            definition,
+            context={"STELAE_DIR": str(tmp_path)},
+            workspace_root=tmp_path,
+            state_root=state_root,
+        )
+
+    store = _open()
+    assert store.history("history") == [{"command": "journaled"}, {"command": "inline"}]
+    store.flush()
+    assert "history" not in json.loads((state_root / "shell.json").read_text(encoding="utf-8"))
+
+    # History already present at the journal's tail (an interrupted migration) is not duplicated.
+    (state_root / "shell.json").write_text(json.dumps({"history": [{"command": "journaled"}]}), encoding="utf-8")
+    assert _open().history("history") == [{"command": "journaled"}, {"command": "inline"}]
+
+
+def test_state_snapshot_is_frozen_before_the_writer_thread_runs(tmp_path: Path) -> None:
+    from stelae_lib.integrator.stateful_runner import JsonStateStore
+
+    state_root = tmp_path / "state"
+    state_root.mkdir()
+    definition = _stateful_shell_config(state_root, flush_delay=0.0).aggregations[0].state
+    assert definition is not None
+    store = JsonStateStore(
+        definition, context={"STELAE_DIR": str(tmp_path)}, workspace_root=tmp_path, state_root=state_root
+    )
+    store.append_value("history", {"command": "first"})
+    snapshot = store._snapshot()
+    # Mutations made on the loop while the write is in flight must not leak into it.
+    store.append_value("history", {"command": "second"})
+    store._data["history"][1]["command"] = "mutated"
+    store._write(snapshot)
+    written = json.loads((state_root / "shell.json").read_text(encoding="utf-8"))
+    assert written == {"history": [{"command": "first"}]}
+
+
+def test_jsonl_journal_serves_recent_from_memory(tmp_path: Path) -> None:
+    from stelae_lib.integrator import state_journal
+    from stelae_lib.integrator.state_journal import JsonlJournal
+
+    path = tmp_path / "log.jsonl"
+    path.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(5)) + '{"torn', encoding="utf-8")
+    journal = JsonlJournal(path, max_length=4)
+    journal.append({"n": 5})
+    journal.flush()
+    journal.append({"n": 6})
+    path.unlink()  # only the in-memory tail can answer now
+    assert journal.recent() == [{"n": 6}, {"n": 5}, {"n": 4}, {"n": 3}]
+    assert journal.recent(2) == [{"n": 6}, {"n": 5}]
+
+    unbounded = JsonlJournal(tmp_path / "big.jsonl")
+    unbounded.extend({"n": n} for n in range(state_journal._TAIL_ENTRIES + 5))
+    unbounded.flush()
+    assert len(unbounded.recent()) == state_journal._TAIL_ENTRIES + 5
+    assert unbounded.recent()[-1] == {"n": 0}
+
+
+def test_failed_background_state_write_is_logged_and_retried(tmp_path: Path, caplog) -> None:
+    from stelae_lib.integrator.stateful_runner import JsonStateStore
+
+    state_root = tmp_path / "state"
+    state_root.mkdir()
+    definition = _stateful_shell_config(state_root, flush_delay=0.01).aggregations[0].state
+    assert definition is not None
+    store = JsonStateStore(
+        definition, context={"STELAE_DIR": str(tmp_path)}, workspace_root=tmp_path, state_root=state_root
+    )
+    original_write = store._write
+    attempts: list[str] = []
+
+    def _flaky_write(snapshot: str) -> None:
+        attempts.append(snapshot)
+        if len(attempts) == 1:
+            raise OSError("disk full")
+        original_write(snapshot)
+
+    store._write = _flaky_write  # type: ignore[method-assign]
+
+    async def _runner() -> None:
+        store.append_value("history", {"command": "first"})
+        await store.schedule_flush()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if store.flush_error is not None:
+                break
+        assert isinstance(store.flush_error, OSError)
+        assert store.needs_flush()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if store.flush_error is None:
+                break
+        assert store.flush_error is None and not store.needs_flush()
+        await store.aclose()
+
+    with caplog.at_level(logging.WARNING, logger="stelae.tool_aggregator"):
+        asyncio.run(_runner())
+    assert len(attempts) == 2
+    assert "disk full" in caplog.text
+    written = json.loads((state_root / "shell.json").read_text(encoding="utf-8"))
+    assert written == {"history": [{"command": "first"}]}